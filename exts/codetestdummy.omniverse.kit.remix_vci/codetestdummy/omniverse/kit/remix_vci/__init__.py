@@ -1 +1,19 @@
-from .extension import *
+import importlib
+
+
+def __getattr__(name: str):
+    # The public names of the headless engine are imported on first access, so enabling the extension does not pay
+    # for pxr and NumPy until the engine is used.
+    core = importlib.import_module(".core", __name__)
+    if name in core.__all__:
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+try:
+    import omni.ext  # noqa: F401
+except ImportError:
+    # Running outside Kit (e.g. the command line or plain usd-core), only the headless engine is available.
+    pass
+else:
+    from .extension import *
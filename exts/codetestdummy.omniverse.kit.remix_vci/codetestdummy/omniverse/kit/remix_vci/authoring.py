@@ -0,0 +1,242 @@
+"""Batched ``Sdf`` level authoring of the VCI overrides.
+
+The specs written here are the same the ``Usd`` API writes through an edit target (``AddReference``,
+``CreateVisibilityAttr``, ``SetActive`` and ``AddXformOp``), but a whole batch is authored under one
+``Sdf.ChangeBlock`` so the stage is only notified and recomposed once per batch.
+"""
+import os
+from collections import namedtuple
+
+from pxr import UsdGeom, Sdf
+
+from .references import REFERENCE_DELETE_ORIGINAL, REFERENCE_PREPEND, REFERENCE_REPLACE
+
+
+# Child of the override referencing the replacement asset when it is authored as an instance
+INSTANCE_NAME = "replacement"
+
+# asset_path is the reference to add, relative to the edit layer. has_mesh_child tells whether the composed prim has
+# the captured "mesh" child which gets deactivated and hidden. With instanceable, the reference is authored on an
+# instanceable INSTANCE_NAME child instead of the override itself: the override composes the prim's own captured mesh,
+# so only the child can share a prototype with the other overrides of the same asset. mode is one of the
+# references.REFERENCE_MODES and original_references the (asset_path, prim_path) of the captured references relative to
+# the edit layer, which REFERENCE_DELETE_ORIGINAL deletes.
+ReferenceOverride = namedtuple("ReferenceOverride", ["name", "asset_path", "has_mesh_child", "instanceable", "mode",
+                                                     "original_references"],
+                               defaults=[False, REFERENCE_PREPEND, ()])
+
+# op_order is the composed xformOpOrder of the prim before the op named op_name is appended.
+TransformOverride = namedtuple("TransformOverride", ["name", "op_name", "op_order", "matrix"])
+
+
+def _set_attribute(prim_spec: Sdf.PrimSpec, name: str, type_name: Sdf.ValueTypeName, value,
+                   variability=Sdf.VariabilityVarying):
+    attr_spec = prim_spec.attributes.get(name)
+    if not attr_spec:
+        attr_spec = Sdf.AttributeSpec(prim_spec, name, type_name, variability)
+    attr_spec.default = value
+
+
+def author_reference_overrides(edit_layer: Sdf.Layer, meshes_path: str, overrides):
+    """Author :class:`ReferenceOverride` entries below ``meshes_path`` in ``edit_layer`` in one change block."""
+    with Sdf.ChangeBlock():
+        for override in overrides:
+            prim_path = f"{meshes_path}/{override.name}"
+            prim_spec = Sdf.CreatePrimInLayer(edit_layer, prim_path)
+            reference_spec = prim_spec
+            if override.instanceable:
+                reference_spec = instance_spec = Sdf.CreatePrimInLayer(edit_layer, f"{prim_path}/{INSTANCE_NAME}")
+                instance_spec.specifier = Sdf.SpecifierDef
+                instance_spec.instanceable = True
+            if override.mode == REFERENCE_REPLACE:
+                # An explicit list is the whole composed list, the override keeps no captured reference
+                prim_spec.referenceList.ClearEditsAndMakeExplicit()
+                reference_spec.referenceList.explicitItems.append(Sdf.Reference(override.asset_path))
+            else:
+                reference_spec.referenceList.prependedItems.append(Sdf.Reference(override.asset_path))
+            if override.mode == REFERENCE_DELETE_ORIGINAL:
+                for asset_path, reference_prim_path in override.original_references:
+                    reference = Sdf.Reference(asset_path, reference_prim_path or Sdf.Path.emptyPath)
+                    prim_spec.referenceList.deletedItems.append(reference)
+            _set_attribute(prim_spec, UsdGeom.Tokens.visibility, Sdf.ValueTypeNames.Token, UsdGeom.Tokens.inherited)
+
+            # Without the captured references the captured mesh is gone with them
+            if override.has_mesh_child and override.mode == REFERENCE_PREPEND:
+                child_spec = Sdf.CreatePrimInLayer(edit_layer, prim_path + "/mesh")
+                child_spec.active = False
+                _set_attribute(child_spec, UsdGeom.Tokens.visibility, Sdf.ValueTypeNames.Token,
+                               UsdGeom.Tokens.invisible)
+
+
+def author_transform_overrides(edit_layer: Sdf.Layer, meshes_path: str, overrides):
+    """Author :class:`TransformOverride` entries below ``meshes_path`` in ``edit_layer`` in one change block."""
+    with Sdf.ChangeBlock():
+        for override in overrides:
+            prim_spec = Sdf.CreatePrimInLayer(edit_layer, f"{meshes_path}/{override.name}")
+            _set_attribute(prim_spec, override.op_name, Sdf.ValueTypeNames.Matrix4d, override.matrix)
+            _set_attribute(prim_spec, UsdGeom.Tokens.xformOpOrder, Sdf.ValueTypeNames.TokenArray,
+                           list(override.op_order) + [override.op_name], Sdf.VariabilityUniform)
+
+
+def retract_overrides(edit_layer: Sdf.Layer, meshes_path: str, names, prefix: str, op_name: str,
+                      keep_specs: bool = False) -> list:
+    """Remove what :func:`author_reference_overrides` and :func:`author_transform_overrides` authored for ``names``,
+    in one change block, and return the names which had an override.
+
+    Only references to a ``prefix + name`` asset, whatever its folder and extension, instanceable
+    :data:`INSTANCE_NAME` children, reference deletions and empty explicit reference lists and the ``op_name``
+    transform are removed, other opinions of the overrides are kept. Overrides left empty are removed, unless
+    ``keep_specs`` keeps them in their place among their siblings to be authored again.
+    """
+    retracted = []
+    with Sdf.ChangeBlock():
+        for name in names:
+            prim_spec = edit_layer.GetPrimAtPath(f"{meshes_path}/{name}")
+            if not prim_spec:
+                continue
+            reference_list = prim_spec.referenceList
+            references = reference_list.explicitItems if reference_list.isExplicit else reference_list.prependedItems
+            reference = next((reference for reference in references
+                              if os.path.splitext(os.path.basename(reference.assetPath))[0] == prefix + name), None)
+            instance_spec = prim_spec.nameChildren.get(INSTANCE_NAME)
+            if instance_spec and not instance_spec.instanceable:
+                instance_spec = None
+            if reference is None and instance_spec is None:
+                continue
+            if reference is not None:
+                references.remove(reference)
+            if instance_spec is not None:
+                del prim_spec.nameChildren[INSTANCE_NAME]
+            # The captured references the override deleted or replaced come back
+            if reference_list.isExplicit and not reference_list.explicitItems:
+                reference_list.ClearEdits()
+            reference_list.deletedItems.clear()
+            retracted.append(name)
+
+            _remove_attribute(prim_spec, UsdGeom.Tokens.visibility, UsdGeom.Tokens.inherited)
+            _remove_attribute(prim_spec, op_name)
+            # The op order was authored as the composed one plus the op, so it goes as a whole
+            op_order_spec = prim_spec.attributes.get(UsdGeom.Tokens.xformOpOrder)
+            if op_order_spec and list(op_order_spec.default or [])[-1:] == [op_name]:
+                prim_spec.RemoveProperty(op_order_spec)
+
+            child_spec = prim_spec.nameChildren.get("mesh")
+            if child_spec:
+                if not child_spec.active:
+                    child_spec.ClearActive()
+                _remove_attribute(child_spec, UsdGeom.Tokens.visibility, UsdGeom.Tokens.invisible)
+                if child_spec.IsInert():
+                    del prim_spec.nameChildren["mesh"]
+            if prim_spec.IsInert() and not keep_specs:
+                del prim_spec.nameParent.nameChildren[name]
+    return retracted
+
+
+def _remove_attribute(prim_spec: Sdf.PrimSpec, name: str, value=None):
+    """Remove the attribute spec ``name``, only if its default is ``value`` when given."""
+    attr_spec = prim_spec.attributes.get(name)
+    if attr_spec and (value is None or attr_spec.default == value):
+        prim_spec.RemoveProperty(attr_spec)
+
+
+class EditRecorder:
+    """Records the ``mesh_HASH`` prims a run edits, to undo and redo the whole run as one step.
+
+    The engine calls :meth:`record` before it authors prims into a layer, only the first call per prim copies its specs
+    so a run costs the size of the prims it touches rather than the size of the layer. The ``customLayerData`` (the
+    manifest) and sublayers of each recorded layer are kept along with them.
+
+    :param meshes_path: Path of the meshes parent prim in the recorded layers.
+    :param layers: Layers to record from the start, e.g. the edit layer whose manifest the run updates.
+    """
+
+    def __init__(self, meshes_path: str, layers=()):
+        self.meshes_path = Sdf.Path(meshes_path)
+        self.before: dict = {}
+        self._paths: dict = {}
+        for layer in layers:
+            self.record(layer, ())
+
+    def record(self, layer: Sdf.Layer, names):
+        """Copy the specs of the prims ``names`` of ``layer`` which were not recorded yet."""
+        snapshot = self.before.get(layer)
+        if snapshot is None:
+            snapshot = self.before[layer] = _create_snapshot(layer)
+            # In the order the prims were first edited, which restores new prims in the order they were added
+            self._paths[layer] = {}
+        paths = self._paths[layer]
+        for name in names:
+            path = self.meshes_path.AppendChild(name)
+            if path not in paths:
+                paths[path] = None
+                _copy_prim(layer, path, snapshot)
+
+    def has_edits(self) -> bool:
+        """Whether a recorded prim or layer may have changed since it was recorded."""
+        return any(self._paths.values()) or any(
+            layer.customLayerData != snapshot.customLayerData
+            or list(layer.subLayerPaths) != list(snapshot.subLayerPaths) for layer, snapshot in self.before.items())
+
+    def take_snapshots(self) -> dict:
+        """Return the current state of the recorded prims and layers, to :meth:`restore` later."""
+        snapshots = {}
+        for layer, paths in self._paths.items():
+            snapshot = snapshots[layer] = _create_snapshot(layer)
+            for path in paths:
+                _copy_prim(layer, path, snapshot)
+        return snapshots
+
+    def restore(self, snapshots: dict):
+        """Bring the recorded prims and layers back to ``snapshots``, :attr:`before` or :meth:`take_snapshots`."""
+        for layer, paths in self._paths.items():
+            snapshot = snapshots[layer]
+            with Sdf.ChangeBlock():
+                for path in paths:
+                    if snapshot.GetPrimAtPath(path):
+                        # Copied over in place, the prim keeps its place among its siblings
+                        Sdf.CreatePrimInLayer(layer, path.GetParentPath())
+                        Sdf.CopySpec(snapshot, path, layer, path)
+                    else:
+                        _remove_prim(layer, path)
+                # Parents the run created are removed again once empty
+                for path in sorted({path.GetParentPath() for path in paths}, key=lambda path: -path.pathElementCount):
+                    while path != Sdf.Path.absoluteRootPath and not snapshot.GetPrimAtPath(path):
+                        prim_spec = layer.GetPrimAtPath(path)
+                        if not prim_spec or not prim_spec.IsInert():
+                            break
+                        _remove_prim(layer, path)
+                        path = path.GetParentPath()
+                if layer.customLayerData != snapshot.customLayerData:
+                    if snapshot.HasCustomLayerData():
+                        layer.customLayerData = snapshot.customLayerData
+                    else:
+                        layer.ClearCustomLayerData()
+                if list(layer.subLayerPaths) != list(snapshot.subLayerPaths):
+                    layer.subLayerPaths = list(snapshot.subLayerPaths)
+
+
+def _remove_prim(layer: Sdf.Layer, path: Sdf.Path):
+    parent_spec = layer.GetPrimAtPath(path.GetParentPath())
+    if parent_spec and path.name in parent_spec.nameChildren:
+        del parent_spec.nameChildren[path.name]
+
+
+def _create_snapshot(layer: Sdf.Layer) -> Sdf.Layer:
+    snapshot = Sdf.Layer.CreateAnonymous("remix_vci_snapshot.usda")
+    if layer.HasCustomLayerData():
+        snapshot.customLayerData = layer.customLayerData
+    snapshot.subLayerPaths = list(layer.subLayerPaths)
+    return snapshot
+
+
+def _copy_prim(layer: Sdf.Layer, path: Sdf.Path, snapshot: Sdf.Layer):
+    """Copy the specs at and below ``path`` into ``snapshot``, and the existing parents of ``path`` as empty specs so a
+    restore can tell them from the parents created since."""
+    parent_path = path.GetParentPath()
+    while parent_path != Sdf.Path.absoluteRootPath and not layer.GetPrimAtPath(parent_path):
+        parent_path = parent_path.GetParentPath()
+    if parent_path != Sdf.Path.absoluteRootPath:
+        Sdf.CreatePrimInLayer(snapshot, parent_path)
+    if layer.GetPrimAtPath(path):
+        Sdf.CreatePrimInLayer(snapshot, path.GetParentPath())
+        Sdf.CopySpec(layer, path, snapshot, path)
@@ -0,0 +1,173 @@
+"""Benchmark the VCI pipeline on synthetic Remix projects.
+
+Only needs ``pxr`` and NumPy (e.g. ``pip install usd-core numpy``). Example::
+
+    python -m codetestdummy.omniverse.kit.remix_vci.benchmark --sizes 1000 10000 100000 --output bench.jsonl
+
+Each phase reports its wall time, the peak of Python allocations (``tracemalloc``, which does not see USD's own C++
+allocations) and the growth of the process' peak resident set size, which does.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pxr import Sdf
+
+from .core import TransformCache, VciEngine, open_stage
+from .layerstats import measure_output
+from .synthetic import generate_project
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, only the Python allocations are reported there
+    resource = None
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+PHASES = ["open", "verify", "overrides", "transforms", "save"]
+
+
+def _get_max_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _PhaseRecorder:
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, phase: str, fn):
+        tracemalloc.reset_peak()
+        rss_before = _get_max_rss_mb()
+        start = time.perf_counter()
+        result = fn()
+        self.results[phase] = {
+            "seconds": time.perf_counter() - start,
+            "py_peak_mb": tracemalloc.get_traced_memory()[1] / (1024 * 1024),
+            "rss_growth_mb": _get_max_rss_mb() - rss_before,
+        }
+        return result
+
+
+def run_benchmark(project, max_workers: int = None, use_processes: bool = False, cache_path: str = None,
+                  binary_output: bool = False, max_layer_prims: int = None) -> dict:
+    """Run verify, override and transform phases on a :func:`generate_project` project and return their measures,
+    with the size and load time of the saved output layers."""
+    recorder = _PhaseRecorder()
+    tracemalloc.start()
+    transform_cache = TransformCache(cache_path) if cache_path else None
+    try:
+        def open_layers():
+            capture_layer = Sdf.Layer.FindOrOpen(project.capture_layer_path)
+            edit_layer = Sdf.Layer.FindOrOpen(project.edit_layer_path)
+            # A previous run may still hold the layer, make sure it matches the file
+            edit_layer.Reload(force=True)
+            return VciEngine(open_stage(capture_layer, edit_layer), capture_layer, edit_layer, project.meshes_folder,
+                             max_workers=max_workers, use_processes=use_processes, transform_cache=transform_cache,
+                             chunk_size=None, binary_output=binary_output, max_layer_prims=max_layer_prims)
+
+        engine = recorder.measure("open", open_layers)
+        recorder.measure("verify", engine.verify)
+        overrides = recorder.measure("overrides", engine.add_overrides)
+        transforms = recorder.measure("transforms", engine.apply_vci)
+        recorder.measure("save", engine.save)
+    finally:
+        tracemalloc.stop()
+        if transform_cache:
+            transform_cache.close()
+
+    output_stats = measure_output(project.edit_layer_path)
+    return {
+        "meshes": len(project.hashes),
+        "overrides": overrides,
+        "transforms": transforms,
+        "phases": recorder.results,
+        "output": {
+            "files": len(output_stats),
+            "bytes": sum(layer_stats.size for layer_stats in output_stats),
+            "load_seconds": sum(layer_stats.load_seconds for layer_stats in output_stats),
+        },
+        "instrumentation": engine.instrumentation.to_dict(),
+    }
+
+
+def format_result(result: dict) -> str:
+    lines = [f"{result['meshes']} meshes ({result['overrides']} overrides, {result['transforms']} transforms)"]
+    for phase in PHASES:
+        measure = result["phases"][phase]
+        lines.append(f"  {phase:<11}{measure['seconds']:>9.3f}s {measure['py_peak_mb']:>9.1f}MB py peak "
+                     f"{measure['rss_growth_mb']:>9.1f}MB rss growth")
+    output = result["output"]
+    lines.append(f"  output {output['files']} files, {output['bytes'] / (1024 * 1024):.1f}MB, "
+                 f"loaded in {output['load_seconds']:.3f}s")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="remix_vci.benchmark", description="Benchmark the VCI pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of captured meshes.")
+    parser.add_argument("--replaced-ratio", type=float, default=1.0,
+                        help="Fraction of the meshes with a replacement asset (default: %(default)s).")
+    parser.add_argument("--existing-ratio", type=float, default=0.1,
+                        help="Fraction of the replaced meshes already overridden (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=None, help="Number of workers reading captured transforms.")
+    parser.add_argument("--processes", action="store_true", help="Read captured transforms in a process pool.")
+    parser.add_argument("--cache", action="store_true", help="Run with a transform cache, cold then warm.")
+    parser.add_argument("--binary-output", action="store_true",
+                        help="Author the overrides into binary .usdc sublayers of the edit layer.")
+    parser.add_argument("--max-layer-prims", type=int, default=None,
+                        help="Overrides per binary output sublayer (default: a single sublayer).")
+    parser.add_argument("--work-dir", default=None, help="Where to generate the projects (default: a temp folder).")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated projects.")
+    parser.add_argument("--output", default=None, help="Append the results as JSON lines to this file.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="remix_vci_bench_")
+
+    results = []
+    try:
+        for size in args.sizes:
+            project_dir = os.path.join(work_dir, f"project_{size}")
+            start = time.perf_counter()
+            project = generate_project(project_dir, size, args.replaced_ratio, args.existing_ratio)
+            print(f"Generated {size} meshes in {time.perf_counter() - start:.1f}s")
+            with open(project.edit_layer_path) as f:
+                edit_layer_text = f.read()
+
+            runs = [("cold", None)]
+            if args.cache:
+                cache_path = os.path.join(project_dir, "cache.sqlite")
+                runs = [("cold", cache_path), ("warm", cache_path)]
+            for run_name, cache_path in runs:
+                # Every run starts from the generated edit layer so they all author the same edits
+                with open(project.edit_layer_path, "w") as f:
+                    f.write(edit_layer_text)
+                result = run_benchmark(project, args.workers, args.processes, cache_path, args.binary_output,
+                                       args.max_layer_prims)
+                result["run"] = run_name
+                results.append(result)
+                print(f"[{run_name}] " + format_result(result))
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "a") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Persistent cache of captured visual correction transforms.
+
+Captured mesh assets do not change within a capture, so the transforms read by :mod:`.transforms` are stored in a
+small SQLite database next to the capture layer. Entries are keyed by the resolved asset path and invalidated when the
+asset's size or modification time change. The same database keeps the pre-flight validation results of the replacement
+assets, see :mod:`.preflight`.
+"""
+import os
+import sqlite3
+import struct
+import time
+
+from pxr import Sdf, Gf
+
+from .instrumentation import logger
+from .transforms import CapturedTransform
+
+
+CACHE_FILE_NAME = ".remix_vci_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 200000
+
+_MATRIX_FORMAT = "<16d"
+
+
+def get_default_cache_path(capture_layer: Sdf.Layer) -> str:
+    """Return the cache file next to ``capture_layer``, or None if the layer is not backed by a file."""
+    if not capture_layer.realPath:
+        return None
+    return os.path.join(os.path.dirname(capture_layer.realPath), CACHE_FILE_NAME)
+
+
+def open_transform_cache(path: str):
+    """Return a :class:`TransformCache` at ``path``, or None with a warning if the database cannot be opened, e.g. in a
+    read-only folder: the cache is only an optimisation."""
+    try:
+        return TransformCache(path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Not caching captured transforms, could not open %s: %s", path, e)
+        return None
+
+
+def get_file_signature(path: str):
+    """Return the ``(size, mtime_ns)`` of ``path``, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class TransformCache:
+    """SQLite backed map of captured asset path to :class:`CapturedTransform`.
+
+    :param path: Database file, created if needed. ``":memory:"`` keeps the cache for the lifetime of the object.
+    :param max_entries: Least recently used entries are evicted beyond this many entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS transforms ("
+            "asset_path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, op_type TEXT, precision TEXT, suffix TEXT,"
+            "matrix BLOB, last_used REAL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS validations (asset_path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "error TEXT)")
+        self._connection.commit()
+
+    def close(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM transforms").fetchone()[0]
+
+    def get_many(self, asset_paths) -> dict:
+        """Return the cached transforms of ``asset_paths`` whose files did not change since they were stored."""
+        found = {}
+        now = time.time()
+        for asset_path in asset_paths:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, op_type, precision, suffix, matrix FROM transforms WHERE asset_path = ?",
+                (asset_path,)).fetchone()
+            if row and get_file_signature(asset_path) == (row[0], row[1]):
+                matrix = Gf.Matrix4d(*struct.unpack(_MATRIX_FORMAT, row[5]))
+                found[asset_path] = CapturedTransform(row[2], row[3], row[4], matrix)
+                self._connection.execute("UPDATE transforms SET last_used = ? WHERE asset_path = ?", (now, asset_path))
+        self._connection.commit()
+
+        self.hits += len(found)
+        self.misses += len(asset_paths) - len(found)
+        return found
+
+    def put_many(self, transforms: dict):
+        """Store transforms keyed by asset path, then evict the least recently used entries beyond the size bound."""
+        now = time.time()
+        rows = []
+        for asset_path, transform in transforms.items():
+            signature = get_file_signature(asset_path)
+            if signature is None:
+                continue
+            matrix = struct.pack(_MATRIX_FORMAT, *(value for row in transform.matrix for value in row))
+            rows.append((asset_path, *signature, transform.op_type, transform.precision, transform.suffix, matrix, now))
+
+        self._connection.executemany("INSERT OR REPLACE INTO transforms VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        if len(self) > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM transforms WHERE asset_path NOT IN "
+                "(SELECT asset_path FROM transforms ORDER BY last_used DESC LIMIT ?)", (self.max_entries,))
+        self._connection.commit()
+
+    def get_validations(self, asset_paths) -> dict:
+        """Return the stored validation errors of ``asset_paths`` whose files did not change since they were stored,
+        None for valid assets."""
+        found = {}
+        for asset_path in asset_paths:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, error FROM validations WHERE asset_path = ?", (asset_path,)).fetchone()
+            if row and get_file_signature(asset_path) == (row[0], row[1]):
+                found[asset_path] = row[2]
+        return found
+
+    def put_validations(self, errors: dict):
+        """Store validation errors keyed by asset path, None for valid assets. Entries are replaced as their files
+        change, so the table is bounded by the replacement folders rather than evicted."""
+        rows = []
+        for asset_path, error in errors.items():
+            signature = get_file_signature(asset_path)
+            if signature is not None:
+                rows.append((asset_path, *signature, error))
+        self._connection.executemany("INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?)", rows)
+        self._connection.commit()
+
+    def clear(self):
+        self._connection.execute("DELETE FROM transforms")
+        self._connection.execute("DELETE FROM validations")
+        self._connection.commit()
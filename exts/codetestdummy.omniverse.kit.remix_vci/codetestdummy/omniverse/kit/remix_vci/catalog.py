@@ -0,0 +1,154 @@
+"""In-memory index of replacement assets, keyed by the ``mesh_HASH`` name they replace."""
+import os
+from pathlib import Path
+
+from pxr import Sdf
+
+
+class AssetCatalog:
+    """Replacement ``E_mesh_HASH`` files of a folder, indexed by the name of the capture prim they replace.
+
+    The folder is only read by :meth:`scan`, so a catalog can be shared by Verify, Override References and
+    Add Transforms instead of listing the folder on every step.
+    """
+
+    def __init__(self, meshes_folder, prefix: str):
+        self.meshes_folder = meshes_folder
+        self.prefix = prefix
+        self._files: dict = {}
+        self._scanned = False
+
+    @property
+    def scanned(self) -> bool:
+        return self._scanned
+
+    def scan(self) -> set:
+        """(Re)read the folder, replacing the current index, and return the names added, removed or moved since the
+        previous scan."""
+        files = {}
+        pattern = self.prefix + "mesh"
+        with os.scandir(self.meshes_folder) as entries:
+            for entry in entries:
+                if entry.name.startswith(pattern) and entry.is_file():
+                    path = Path(entry.path)
+                    files[path.stem[len(self.prefix):]] = path
+        changed = files.keys() ^ self._files.keys()
+        changed.update(name for name, path in files.items() if name in self._files and self._files[name] != path)
+        self._files = files
+        self._scanned = True
+        return changed
+
+    def update(self, file_names) -> set:
+        """Update the index for the ``file_names`` of the folder which were added, removed or modified, and return the
+        names of the ``mesh_HASH`` prims they replace."""
+        changed = set()
+        pattern = self.prefix + "mesh"
+        for file_name in file_names:
+            if not file_name.startswith(pattern):
+                continue
+            path = Path(self.meshes_folder, file_name)
+            name = path.stem[len(self.prefix):]
+            if path.is_file():
+                self._files[name] = path
+                changed.add(name)
+            elif self._files.get(name) == path:
+                del self._files[name]
+                changed.add(name)
+        return changed
+
+    def ensure_scanned(self):
+        if not self._scanned:
+            self.scan()
+
+    def get(self, name: str):
+        """Return the replacement file for the ``mesh_HASH`` prim ``name``, or None."""
+        return self._files.get(name)
+
+    def names(self) -> set:
+        return set(self._files)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __iter__(self):
+        return iter(self._files.items())
+
+
+def get_child_names(layer: Sdf.Layer, path: str) -> set:
+    """Return the names of the prim specs below ``path`` in ``layer``, or an empty set if there is no such spec."""
+    prim_spec = layer.GetPrimAtPath(path)
+    return set(prim_spec.nameChildren.keys()) if prim_spec else set()
+
+
+class CaptureIndex:
+    """``mesh_HASH`` names captured by one or more capture layers, merged into a single index.
+
+    Layers are given in priority order: a mesh captured by several layers is owned by the first layer capturing it,
+    and its duplicates in later layers are ignored.
+    """
+
+    def __init__(self, capture_layers, path: str):
+        self.capture_layers = list(capture_layers)
+        self.path = path
+        self._owners: dict = {}
+        # Number of ignored duplicates per name, only for the names captured more than once
+        self._duplicates: dict = {}
+        self._built = False
+
+    @property
+    def duplicates(self) -> int:
+        return sum(self._duplicates.values())
+
+    def build(self):
+        owners = {}
+        duplicates = {}
+        for layer in self.capture_layers:
+            for name in get_child_names(layer, self.path):
+                if name in owners:
+                    duplicates[name] = duplicates.get(name, 0) + 1
+                else:
+                    owners[name] = layer
+        self._owners = owners
+        self._duplicates = duplicates
+        self._built = True
+
+    def update(self, names):
+        """Look up the owner of ``names`` again, e.g. after they were added to or removed from capture layers."""
+        if not self._built:
+            self.build()
+            return
+        for name in names:
+            layers = [layer for layer in self.capture_layers if layer.GetPrimAtPath(f"{self.path}/{name}")]
+            if layers:
+                self._owners[name] = layers[0]
+            else:
+                self._owners.pop(name, None)
+            if len(layers) > 1:
+                self._duplicates[name] = len(layers) - 1
+            else:
+                self._duplicates.pop(name, None)
+
+    def ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def get_layer(self, name: str) -> Sdf.Layer:
+        """Return the capture layer owning the ``mesh_HASH`` prim ``name``, or None."""
+        return self._owners.get(name)
+
+    def get_prim_spec(self, name: str) -> Sdf.PrimSpec:
+        """Return the owning capture layer's prim spec of ``name``, or None."""
+        layer = self._owners.get(name)
+        return layer.GetPrimAtPath(f"{self.path}/{name}") if layer else None
+
+    def names(self) -> set:
+        return set(self._owners)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._owners
+
+    def __len__(self) -> int:
+        return len(self._owners)
@@ -0,0 +1,175 @@
+"""Command line entry point for running the VCI pipeline without Kit.
+
+Example::
+
+    python -m codetestdummy.omniverse.kit.remix_vci capture.usda mod.usda path/to/replacements
+"""
+import argparse
+import logging
+import sys
+
+from pxr import Sdf
+
+from .core import (MESHES_PATH, REFERENCE_MODES, REFERENCE_PREPEND, SHARD_MERGE, SHARD_OUTPUTS, VciEngine, VciError,
+                   build_axis_correction, get_default_cache_path, open_stage, open_transform_cache)
+from .instrumentation import SAVE
+from .inverse import UP_AXIS_ROTATIONS
+from .layerstats import format_stats, measure_output
+from .watch import DEFAULT_DEBOUNCE, AssetWatcher
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="remix_vci",
+        description="Override Remix capture meshes with replacement assets and add their visual correction transforms.")
+    parser.add_argument("capture_layer", help="Path of the Remix capture layer.")
+    parser.add_argument("edit_layer", help="Path of the layer to author overrides into (e.g. mod.usda).")
+    parser.add_argument("meshes_folder", help="Folder holding the replacement E_mesh_HASH assets.")
+    parser.add_argument("--add-capture", action="append", default=[], metavar="CAPTURE_LAYER",
+                        help="Also process this capture layer, with a lower priority than the previous ones. "
+                             "Can be repeated.")
+    parser.add_argument("--meshes-path", default=MESHES_PATH,
+                        help="Path of the meshes parent prim (default: %(default)s).")
+    parser.add_argument("--verify-only", action="store_true", help="Only verify the inputs, do not author anything.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the planned actions, do not author anything.")
+    parser.add_argument("--plan-json", default=None, metavar="PATH", help="Write the execution plan as JSON.")
+    parser.add_argument("--skip-overrides", action="store_true", help="Do not author reference overrides.")
+    parser.add_argument("--skip-transforms", action="store_true", help="Do not author visual correction transforms.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of workers reading captured transforms and validating replacement assets.")
+    parser.add_argument("--processes", action="store_true",
+                        help="Use a process pool instead of threads for the workers.")
+    parser.add_argument("--cache", default=None,
+                        help="Transform and validation cache file (default: next to the capture layer).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not cache captured transforms and replacement validations.")
+    parser.add_argument("--no-preflight", action="store_true",
+                        help="Do not validate the replacement assets on verify.")
+    parser.add_argument("--deduplicate", action="store_true",
+                        help="Reference byte-identical replacement assets through one canonical asset, as instances.")
+    parser.add_argument("--reference-mode", default=REFERENCE_PREPEND, choices=REFERENCE_MODES,
+                        help="Prepend the replacement and hide the captured mesh, replace all the references of the "
+                             "captured prim, or delete only its captured references (default: %(default)s).")
+    parser.add_argument("--shards", type=int, default=None, metavar="N",
+                        help="Author the overrides and transforms in N shards processed in parallel by --workers "
+                             "processes.")
+    parser.add_argument("--shard-output", default=SHARD_MERGE, choices=SHARD_OUTPUTS,
+                        help="Merge the shards into the edit layer, or keep them as .usdc sublayers of it next to the "
+                             "edit layer (default: %(default)s).")
+    parser.add_argument("--binary-output", action="store_true",
+                        help="Author new overrides into binary .usdc sublayers next to the edit layer instead of "
+                             "inline in it.")
+    parser.add_argument("--max-layer-prims", type=int, default=None, metavar="N",
+                        help="Start a new binary output sublayer every N overrides (default: a single sublayer).")
+    parser.add_argument("--layer-report", action="store_true",
+                        help="Report the file size and load time of the edit layer and its output sublayers before and "
+                             "after the run, and their save time.")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="Write the phase timings as a Chrome trace JSON file.")
+    parser.add_argument("--flip-axes", default="", metavar="AXES",
+                        help="Axes to mirror before the inverse visual correction, e.g. 'z' or 'xz'.")
+    parser.add_argument("--up-axis-rotation", default=None, choices=UP_AXIS_ROTATIONS,
+                        help="Rotate the up axis before the inverse visual correction.")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the run, keep watching the replacement folder and sync the edit layer with new or "
+                             "removed assets until interrupted.")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Seconds without folder changes before a watched batch is processed "
+                             "(default: %(default)s).")
+    parser.add_argument("--poll", action="store_true", help="Watch the folder by polling instead of inotify.")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Level of the log messages printed to stderr (default: %(default)s).")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(levelname)s: %(message)s")
+    # Measured before anything opens the layers
+    layer_stats = measure_output(args.edit_layer) if args.layer_report else None
+    try:
+        axis_correction = build_axis_correction(args.flip_axes, args.up_axis_rotation)
+    except ValueError as e:
+        parser.error(str(e))
+
+    capture_layers = []
+    for capture_layer_path in [args.capture_layer] + args.add_capture:
+        capture_layer = Sdf.Layer.FindOrOpen(capture_layer_path)
+        if not capture_layer:
+            print(f"Error: Could not open capture layer {capture_layer_path}", file=sys.stderr)
+            return 1
+        capture_layers.append(capture_layer)
+    edit_layer = Sdf.Layer.FindOrOpen(args.edit_layer)
+    if not edit_layer:
+        print(f"Error: Could not open edit layer {args.edit_layer}", file=sys.stderr)
+        return 1
+
+    transform_cache = None
+    if not args.no_cache:
+        transform_cache = open_transform_cache(args.cache or get_default_cache_path(capture_layers[0]))
+
+    engine = VciEngine(open_stage(capture_layers, edit_layer), capture_layers, edit_layer, args.meshes_folder,
+                       stage_path=args.meshes_path, capture_layer_path=args.meshes_path,
+                       edit_layer_path=args.meshes_path,
+                       max_workers=args.workers, use_processes=args.processes, transform_cache=transform_cache,
+                       chunk_size=None, axis_correction=axis_correction, preflight=not args.no_preflight,
+                       deduplicate=args.deduplicate, binary_output=args.binary_output,
+                       max_layer_prims=args.max_layer_prims, reference_mode=args.reference_mode)
+    try:
+        print(engine.verify(), end="")
+        if args.plan_json:
+            engine.plan.write_json(args.plan_json)
+        if args.dry_run:
+            print(engine.plan.format_diff())
+        if args.verify_only or args.dry_run:
+            return 0
+        if args.shards:
+            overrides, transforms = engine.apply_sharded(args.shards, args.shard_output,
+                                                         references=not args.skip_overrides,
+                                                         transforms=not args.skip_transforms)
+            print(f"Created {overrides} overrides in {engine.stage_path}")
+            print(f"Applied {transforms} inverse transforms in {args.shards} shards.")
+        else:
+            if not args.skip_overrides:
+                print(f"Created {engine.add_overrides()} overrides in {engine.stage_path}")
+            if not args.skip_transforms:
+                print(f"Applied {engine.apply_vci()} inverse transforms.")
+        engine.save()
+        if args.layer_report:
+            print(format_stats("Output before", layer_stats))
+            print(format_stats("Output after", measure_output(edit_layer.realPath),
+                               engine.instrumentation.span_seconds.get(SAVE)))
+        if args.watch:
+            watch(engine, args.debounce, args.poll)
+    except VciError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if transform_cache:
+            transform_cache.close()
+        if args.trace:
+            engine.instrumentation.write_trace(args.trace)
+
+    print(engine.instrumentation.summary())
+    return 0
+
+
+def watch(engine: VciEngine, debounce: float, polling: bool):
+    """Sync and save the edit layer after each batch of replacement folder changes, until interrupted."""
+    def on_batch(report):
+        engine.save()
+        print(report, end="", flush=True)
+
+    watcher = AssetWatcher(engine, debounce, polling)
+    print(f"Watching {engine.meshes_folder}, press Ctrl+C to stop.", flush=True)
+    try:
+        watcher.run(on_batch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
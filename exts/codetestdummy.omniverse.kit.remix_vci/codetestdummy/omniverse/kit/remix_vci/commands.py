@@ -0,0 +1,24 @@
+import omni.kit.commands
+
+from .authoring import EditRecorder
+
+
+class RecordVciEditsCommand(omni.kit.commands.Command):
+    """Make the edits of a whole Override References, Add Transforms or watch run one undoable step.
+
+    The run authors its edits in batches before this command is executed, so the first ``do`` only records the
+    result. ``recorder`` is the :class:`EditRecorder` the engine recorded the prims it touched into during the run.
+    """
+
+    def __init__(self, recorder: EditRecorder):
+        self._recorder = recorder
+        self._after = None
+
+    def do(self):
+        if self._after is None:
+            self._after = self._recorder.take_snapshots()
+        else:
+            self._recorder.restore(self._after)
+
+    def undo(self):
+        self._recorder.restore(self._recorder.before)
@@ -0,0 +1,985 @@
+"""Headless engine for the VCI override/transform pipeline.
+
+This module only depends on ``pxr`` so that it can be driven from Kit (see ``extension.py``), from the command line
+(see ``cli.py``) or from plain ``usd-core`` for testing and benchmarking.
+"""
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pxr import Usd, UsdGeom, Sdf
+
+from .authoring import (INSTANCE_NAME, EditRecorder, ReferenceOverride, TransformOverride, author_reference_overrides,
+                        author_transform_overrides, retract_overrides)
+from .cache import TransformCache, get_default_cache_path, open_transform_cache
+from .catalog import AssetCatalog, CaptureIndex, get_child_names
+from .dedupe import ContentIndex
+from .instrumentation import (SCAN_FOLDER, VALIDATE_ASSETS, HASH_ASSETS, RESOLVE_REFERENCES, INDEX_CAPTURE,
+                              OPEN_ASSETS, INVERT_TRANSFORMS, AUTHOR_SPECS, SAVE, PROCESSED, SKIPPED, FAILED,
+                              Instrumentation, logger)
+from .inverse import build_axis_correction, compute_inverse_transforms, to_array, to_matrices
+from .manifest import VciManifest, get_fingerprint, get_transform_digest
+from .plan import (ADD_REFERENCE, ADD_TRANSFORM, SKIP_EXISTING, MISSING_CAPTURE, MISSING_STAGE_PRIM, INVALID_ASSET,
+                   ExecutionPlan, PlanEntry)
+from .preflight import validate_replacements
+from .references import (REFERENCE_PREPEND, REFERENCE_REPLACE, REFERENCE_DELETE_ORIGINAL, REFERENCE_MODES,
+                         CaptureReferenceResolver, PathRelativizer)
+from .shards import (SHARD_MERGE, SHARD_SUBLAYERS, SHARD_OUTPUTS, ShardItem, add_shard_sublayer, create_shard_layer,
+                     find_shard_layers, get_shard_index, get_shard_path, merge_shard, remove_overrides,
+                     _write_shard_task)
+from .transforms import VISUAL_CORRECTION_PATH, extract_transforms, get_capture_asset_path
+
+
+__all__ = ["FILE_NAME_PREFIX", "CUSTOM_PROP_NAME", "MESHES_PATH", "VISUAL_CORRECTION_PATH", "VCI_NAME",
+           "ADD_REFERENCE", "ADD_TRANSFORM", "SKIP_EXISTING", "MISSING_CAPTURE", "MISSING_STAGE_PRIM", "INVALID_ASSET",
+           "SHARD_MERGE", "SHARD_SUBLAYERS", "SHARD_OUTPUTS",
+           "REFERENCE_PREPEND", "REFERENCE_REPLACE", "REFERENCE_DELETE_ORIGINAL", "REFERENCE_MODES",
+           "AssetCatalog", "CaptureIndex", "ContentIndex", "ExecutionPlan", "Instrumentation", "PlanEntry", "Progress",
+           "EditRecorder", "TransformCache", "VciError", "VciEngine", "VciManifest", "find_capture_layers",
+           "get_default_cache_path", "open_transform_cache", "build_axis_correction", "open_stage", "run_steps"]
+
+FILE_NAME_PREFIX = "E_"
+CUSTOM_PROP_NAME = "CTD_VCI"
+MESHES_PATH = "/RootNode/meshes"
+VCI_NAME = "_visualCorrectionInverse"
+DEFAULT_CHUNK_SIZE = 256
+# Number of pre-flight validation errors listed in the Verify report, the plan has all of them
+MAX_REPORTED_ERRORS = 5
+
+# Reported by the VciEngine.iter_* generators: done out of total items of the named phase.
+Progress = namedtuple("Progress", ["phase", "done", "total"])
+
+
+class VciError(Exception):
+    """Raised when the pipeline cannot run with the given layers and folder."""
+
+
+def run_steps(steps):
+    """Exhaust a ``VciEngine.iter_*`` generator and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def open_stage(capture_layers, edit_layer: Sdf.Layer) -> Usd.Stage:
+    """Compose a stage with the edit layer stronger than the capture layers, as Composer would for a mod.
+
+    :param capture_layers: A capture layer or a list of them, strongest first. Capture layers the edit layer already
+        sublayers are not added a second time.
+    """
+    if isinstance(capture_layers, Sdf.Layer):
+        capture_layers = [capture_layers]
+    root_layer = Sdf.Layer.CreateAnonymous("remix_vci.usda")
+    root_layer.subLayerPaths.append(edit_layer.identifier)
+    stage = Usd.Stage.Open(root_layer, Usd.Stage.LoadNone)
+    layer_stack = stage.GetLayerStack()
+    for layer in capture_layers:
+        if layer not in layer_stack:
+            root_layer.subLayerPaths.append(layer.identifier)
+    return stage
+
+
+def find_capture_layers(stage: Usd.Stage, edit_layer: Sdf.Layer, path: str = MESHES_PATH) -> list:
+    """Return the layers of the stage's layer stack, strongest first, with specs at ``path``, other than
+    ``edit_layer`` and the shard and binary output layers it sublayers."""
+    output_layers = [edit_layer] + find_shard_layers(edit_layer) if edit_layer else []
+    return [layer for layer in stage.GetLayerStack() if layer not in output_layers and layer.GetPrimAtPath(path)]
+
+
+class VciEngine:
+    """Authors replacement references and visual correction transforms into an edit layer.
+
+    :param stage: Composed stage which has both the capture layers and ``edit_layer`` in its layer stack.
+    :param capture_layers: Layer from the Remix capture holding the ``mesh_HASH`` prims, or a list of such layers
+        in priority order which are then processed in one pass, see :class:`CaptureIndex`.
+    :param edit_layer: Layer the overrides are authored into (e.g. mod.usd).
+    :param meshes_folder: Folder holding the replacement ``E_mesh_HASH`` assets.
+    :param catalog: Catalog of ``meshes_folder`` to reuse between runs. A new one is created if not given.
+    :param max_workers: Number of workers reading captured transforms, see :func:`extract_transforms`.
+    :param use_processes: Read captured transforms in a process pool instead of threads.
+    :param transform_cache: Optional :class:`TransformCache` of captured transforms and replacement asset validations
+        shared between runs.
+    :param chunk_size: Number of prims authored in one ``Sdf.ChangeBlock``, and processed between two
+        :class:`Progress` reports of the ``iter_*`` methods. None processes all prims in one chunk.
+    :param instrumentation: :class:`Instrumentation` recording the phase timings and prim counters. A new one is
+        created if not given.
+    :param axis_correction: Optional ``(4, 4)`` NumPy matrix applied before the inverse visual correction, see
+        :func:`build_axis_correction`.
+    :param preflight: Validate the replacement assets on Verify, see :func:`validate_replacements`. Invalid assets are
+        planned as :data:`INVALID_ASSET` and not referenced.
+    :param deduplicate: Reference byte-identical replacement assets through one canonical asset and author the
+        references as instances, see :class:`ContentIndex`.
+    :param binary_output: Author new overrides into ``.usdc`` sublayers next to the edit layer instead of inline.
+        Overrides already authored are updated in the layer holding them.
+    :param max_layer_prims: Number of overrides after which the binary output starts a new sublayer, None for a
+        single sublayer.
+    :param reference_mode: What the overrides do with the references of the captured prims, one of
+        :data:`REFERENCE_MODES`. Without the captured references the visual correction is gone too, so no inverse
+        transform is planned for overrides which replace or delete them.
+    """
+
+    def __init__(self, stage: Usd.Stage, capture_layers, edit_layer: Sdf.Layer, meshes_folder,
+                 stage_path: str = MESHES_PATH, capture_layer_path: str = MESHES_PATH,
+                 edit_layer_path: str = MESHES_PATH, prefix: str = FILE_NAME_PREFIX, vci_name: str = VCI_NAME,
+                 catalog: AssetCatalog = None, max_workers: int = None, use_processes: bool = False,
+                 transform_cache: TransformCache = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 instrumentation: Instrumentation = None, axis_correction=None, preflight: bool = True,
+                 deduplicate: bool = False, binary_output: bool = False, max_layer_prims: int = None,
+                 reference_mode: str = REFERENCE_PREPEND):
+        self.stage = stage
+        self.capture_layers = [capture_layers] if isinstance(capture_layers, Sdf.Layer) else list(capture_layers)
+        self.edit_layer = edit_layer
+        self.meshes_folder = meshes_folder
+        self.stage_path = stage_path
+        self.capture_layer_path = capture_layer_path
+        self.edit_layer_path = edit_layer_path
+        self.prefix = prefix
+        self.vci_name = vci_name
+        self.catalog = catalog if catalog is not None else AssetCatalog(meshes_folder, prefix)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.transform_cache = transform_cache
+        self.chunk_size = chunk_size
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.axis_correction = axis_correction
+        self.preflight = preflight
+        # Pre-flight validation errors per mesh_HASH name, and the results per asset path and fingerprint
+        self.asset_errors: dict = {}
+        self._validations: dict = {}
+        self.deduplicate = deduplicate
+        self.content_index = ContentIndex(max_workers)
+        self.binary_output = binary_output
+        self.max_layer_prims = max_layer_prims
+        # Binary output layer new overrides are added to, and its number of overrides
+        self._binary_layer: Sdf.Layer = None
+        self._binary_layer_prims = 0
+        if reference_mode not in REFERENCE_MODES:
+            raise VciError(f"Unknown reference mode {reference_mode}, expected one of: {', '.join(REFERENCE_MODES)}")
+        self.reference_mode = reference_mode
+        # Made for the folder of the edit layer, see _get_relativizer
+        self._relativizer: PathRelativizer = None
+        self._reference_resolver: CaptureReferenceResolver = None
+        self.capture_index = CaptureIndex(self.capture_layers, capture_layer_path)
+        self.plan: ExecutionPlan = None
+        # Read from the edit layer by verify, see VciManifest
+        self.manifest: VciManifest = None
+        # Set by the caller to make a run undoable, see EditRecorder
+        self.edit_recorder: EditRecorder = None
+        self._correction_digest = get_transform_digest(axis_correction)
+
+    @property
+    def capture_layer(self) -> Sdf.Layer:
+        """The capture layer with the highest priority."""
+        return self.capture_layers[0]
+
+    @property
+    def xformop_name(self) -> str:
+        return f"xformOp:transform:{self.vci_name}"
+
+    def verify(self) -> str:
+        """Check the layers and folder can be processed, build the :attr:`plan` and return a report of what was found.
+
+        :raises VciError: If the options cannot be processed.
+        """
+        return run_steps(self.iter_verify())
+
+    def iter_verify(self):
+        """Generator version of :meth:`verify`, yielding a :class:`Progress` after each check."""
+        report: str = ""
+        total = 6
+
+        self._check_capture_layers(self.capture_layers)
+
+        if not self.edit_layer:
+            raise VciError("Select an edit target layer.")
+
+        if not self.meshes_folder:
+            raise VciError("Select replacement meshes folder.")
+
+        if not os.path.isdir(self.meshes_folder):
+            raise VciError(f"Replacement meshes folder does not exist: {self.meshes_folder}")
+
+        # Get mesh_HASH PrimSpecs from the capture layers
+        with self.instrumentation.span(INDEX_CAPTURE, layers=len(self.capture_layers)):
+            self.capture_index.build()
+        capture_names = self.capture_index.names()
+        if len(self.capture_layers) == 1:
+            report += f"Found {len(capture_names)} meshes in capture layer.\n"
+        else:
+            report += (f"Found {len(capture_names)} meshes in {len(self.capture_layers)} capture layers "
+                       f"({self.capture_index.duplicates} duplicates ignored).\n")
+        yield Progress("verify", 1, total)
+
+        # Index all files in the directory, later steps reuse the catalog instead of listing the folder again
+        with self.instrumentation.span(SCAN_FOLDER):
+            self.catalog.scan()
+        report += f"Found {len(self.catalog)} replacement assets.\n"
+        yield Progress("verify", 2, total)
+
+        # Open the replacement assets before anything references them
+        self.asset_errors = {}
+        yield from self._iter_validate_assets(self.catalog.names())
+        if self.deduplicate:
+            yield from self._iter_index_contents()
+            if self.content_index.canonical_paths:
+                report += (f"Found {len(self.content_index.canonical_paths)} duplicate replacement assets, referenced "
+                           f"as instances of {self.content_index.count_canonical()} assets.\n")
+        yield Progress("verify", 3, total)
+
+        # Get mesh_HASH PrimSpecs from edit target layer
+        if not any(layer.GetPrimAtPath(self.edit_layer_path) for layer in self.get_output_layers()):
+            report += f"Warning: Could not get edit target layer meshes parent at: {self.edit_layer_path}\n"
+        else:
+            report += f"Found {len(self.get_override_primspecs())} pre-existing overrides in edit layer.\n"
+        self.manifest = VciManifest(self.edit_layer, CUSTOM_PROP_NAME)
+        yield Progress("verify", 4, total)
+
+        # Get prims from stage
+        stage_prim = self.stage.GetPrimAtPath(self.stage_path)
+        if not stage_prim:
+            raise VciError(f"Could not meshes prim from stage at: {self.stage_path}")
+
+        stage_mesh_prims = stage_prim.GetChildren()
+        report += f"Found {len(stage_mesh_prims)} meshes on the stage.\n"
+        yield Progress("verify", 5, total)
+
+        self.plan = yield from self._iter_build_plan(stage_mesh_prims)
+        report += self._format_plan_report()
+        yield Progress("verify", 6, total)
+
+        return report
+
+    def _check_capture_layers(self, capture_layers):
+        if not capture_layers:
+            raise VciError("Select at least one capture layer.")
+
+        if self.edit_layer in capture_layers:
+            raise VciError("Edit target layer cannot be capture layer.")
+
+        for capture_layer in capture_layers:
+            if not capture_layer.GetPrimAtPath(self.capture_layer_path):
+                raise VciError(f"Could not get capture layer meshes parent at: {self.capture_layer_path} "
+                               f"in {capture_layer.GetDisplayName()}")
+
+    def set_capture_layers(self, capture_layers) -> set:
+        """Switch to ``capture_layers``, strongest first, and return the ``mesh_HASH`` names to :meth:`reverify`: those
+        of the capture layers added or removed, or of all of them if the order of the kept layers changed.
+
+        :raises VciError: If the capture layers cannot be processed.
+        """
+        capture_layers = list(capture_layers)
+        self._check_capture_layers(capture_layers)
+        kept = [layer for layer in self.capture_layers if layer in capture_layers]
+        if kept == [layer for layer in capture_layers if layer in self.capture_layers]:
+            changed_layers = set(self.capture_layers) ^ set(capture_layers)
+        else:
+            changed_layers = set(self.capture_layers) | set(capture_layers)
+        self.capture_layers = capture_layers
+        self.capture_index.capture_layers = list(capture_layers)
+        names = set()
+        for layer in changed_layers:
+            names |= get_child_names(layer, self.capture_layer_path)
+        return names
+
+    def reverify(self, names, rescan: bool = True) -> str:
+        """Update the :attr:`plan` of the last :meth:`verify` for the changed ``mesh_HASH`` ``names`` only, and return
+        a report of the updated plan. Verifies everything if there is no plan yet."""
+        return run_steps(self.iter_reverify(names, rescan))
+
+    def iter_reverify(self, names, rescan: bool = True):
+        """Generator version of :meth:`reverify`, yielding a :class:`Progress` after each step.
+
+        With ``rescan``, the replacement folder is listed again and the assets added or removed since the last scan
+        are planned again too. Capture layers, the edit layer and the stage are only looked up for those names.
+        """
+        if self.plan is None:
+            return (yield from self.iter_verify())
+
+        names = yield from self._iter_replan(names, rescan)
+        return f"Re-verified {len(names)} changed meshes.\n" + self._format_plan_report()
+
+    def _iter_replan(self, names, rescan: bool):
+        """Plan ``names`` again for :meth:`iter_reverify`, and return the names planned again: with
+        :attr:`deduplicate`, also those whose canonical asset changed with them."""
+        names = set(names)
+        # The manifest is saved after every run, reading it again picks up edits undone since
+        self.manifest = VciManifest(self.edit_layer, CUSTOM_PROP_NAME)
+        if rescan:
+            with self.instrumentation.span(SCAN_FOLDER):
+                names |= self.catalog.scan()
+        with self.instrumentation.span(INDEX_CAPTURE, names=len(names)):
+            self.capture_index.update(names)
+        yield from self._iter_validate_assets(names)
+        if self.deduplicate:
+            # A changed file can change the canonical asset of its duplicates too
+            names |= yield from self._iter_index_contents()
+        yield Progress("verify", 1, 2)
+
+        override_primspecs = self.get_override_primspecs()
+        for name in names:
+            stage_prim = self.stage.GetPrimAtPath(f"{self.stage_path}/{name}")
+            # Same prims as the stage's GetChildren() used by a full verify
+            if stage_prim and not (stage_prim.IsActive() and stage_prim.IsLoaded() and stage_prim.IsDefined()
+                                   and not stage_prim.IsAbstract()):
+                stage_prim = None
+            self.plan.remove(name)
+            self._plan_mesh(self.plan, name, stage_prim, override_primspecs.get(name))
+        yield Progress("verify", 2, 2)
+        return names
+
+    def _format_plan_report(self) -> str:
+        counts = self.plan.counts()
+        report = f"{counts[ADD_REFERENCE]} meshes can be overridden.\n"
+        report += f"{counts[ADD_TRANSFORM]} transforms can be added.\n"
+        stale = self.plan.count_stale()
+        if stale:
+            report += f"{stale} overrides are out of date and will be applied again.\n"
+        if counts[MISSING_CAPTURE]:
+            report += f"Warning: {counts[MISSING_CAPTURE]} meshes have no captured mesh.\n"
+        if counts[MISSING_STAGE_PRIM]:
+            report += f"Warning: {counts[MISSING_STAGE_PRIM]} replacement assets have no mesh on the stage.\n"
+        if counts[INVALID_ASSET]:
+            report += f"Warning: {counts[INVALID_ASSET]} replacement assets are invalid and will not be referenced:\n"
+            for entry in self.plan.get_entries(INVALID_ASSET)[:MAX_REPORTED_ERRORS]:
+                report += f"  {entry.error}\n"
+        logger.info("Verified %s: %s", self.edit_layer.GetDisplayName(), counts)
+        return report
+
+    def validate_assets(self, names):
+        """Run the pre-flight validation of the replacement assets of ``names`` and update :attr:`asset_errors`.
+
+        Results are kept per asset path and fingerprint, so only assets added or changed since they were last
+        validated are opened.
+        """
+        run_steps(self._iter_validate_assets(names))
+
+    def _iter_validate_assets(self, names):
+        """Generator version of :meth:`validate_assets`, yielding a :class:`Progress` between chunks of names. One
+        worker pool validates all the chunks."""
+        if not self.preflight:
+            return
+        names = list(names)
+        executor_type = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_type(max_workers=self.max_workers) as executor:
+            for chunk_start, chunk in self._iter_chunks(names):
+                if chunk_start:
+                    yield Progress("verify", chunk_start, len(names))
+                self._validate_chunk(chunk, executor)
+
+    def _validate_chunk(self, names, executor):
+        pending = {}
+        for name in names:
+            self.asset_errors.pop(name, None)
+            asset_file_path = self.catalog.get(name)
+            if asset_file_path is None:
+                continue
+            asset_path = str(asset_file_path)
+            validation = self._validations.get(asset_path)
+            if validation and validation[0] == get_fingerprint(asset_path):
+                if validation[1]:
+                    self.asset_errors[name] = validation[1]
+            else:
+                pending[name] = asset_path
+
+        with self.instrumentation.span(VALIDATE_ASSETS, assets=len(pending)):
+            errors = validate_replacements(pending, cache=self.transform_cache, executor=executor)
+        for name, asset_path in pending.items():
+            self._validations[asset_path] = (get_fingerprint(asset_path), errors.get(name))
+        for name, error in errors.items():
+            logger.debug(error)
+        self.asset_errors.update(errors)
+        self.instrumentation.count(FAILED, len(errors))
+
+    def get_output_layers(self) -> list:
+        """Return the layers holding the overrides: the edit layer, then the shard layers added to it as sublayers by
+        :meth:`apply_sharded`."""
+        return [self.edit_layer] + find_shard_layers(self.edit_layer)
+
+    def get_override_primspecs(self) -> dict:
+        """Return the override prim spec per ``mesh_HASH`` name across the :meth:`get_output_layers`, the edit layer's
+        winning over the shards'."""
+        override_primspecs = {}
+        for layer in reversed(self.get_output_layers()):
+            meshes_prim = layer.GetPrimAtPath(self.edit_layer_path)
+            if meshes_prim:
+                override_primspecs.update((prim_spec.name, prim_spec) for prim_spec in meshes_prim.nameChildren)
+        return override_primspecs
+
+    def _retract_overrides(self, names, keep_specs: bool = False) -> list:
+        """Retract the overrides of ``names`` from every output layer and return the names which had one. With
+        ``keep_specs`` the overrides are about to be authored again, see :func:`retract_overrides`."""
+        retracted = set()
+        for layer in self.get_output_layers():
+            self._record_edits(layer, [name for name in names
+                                       if layer.GetPrimAtPath(f"{self.edit_layer_path}/{name}")])
+            retracted.update(retract_overrides(layer, self.edit_layer_path, names, self.prefix, self.xformop_name,
+                                               keep_specs))
+        return sorted(retracted)
+
+    def _record_edits(self, layer: Sdf.Layer, names):
+        if self.edit_recorder is not None:
+            self.edit_recorder.record(layer, names)
+
+    def _group_by_layer(self, overrides) -> dict:
+        """Return ``overrides`` grouped by the output layer they are authored into: the layer already holding their
+        override, otherwise the edit layer, or a binary output layer with :attr:`binary_output`."""
+        output_layers = self.get_output_layers()
+        groups = {}
+        for override in overrides:
+            path = f"{self.edit_layer_path}/{override.name}"
+            layer = next((layer for layer in output_layers if layer.GetPrimAtPath(path)), None)
+            if layer is None:
+                layer = self._allocate_binary_layer(output_layers) if self.binary_output else self.edit_layer
+            groups.setdefault(layer, []).append(override)
+        return groups
+
+    def _allocate_binary_layer(self, output_layers: list) -> Sdf.Layer:
+        if not self.edit_layer.realPath:
+            raise VciError("Save the edit target layer before authoring binary output layers next to it.")
+        if self._binary_layer not in output_layers[1:]:
+            self._binary_layer = output_layers[-1] if len(output_layers) > 1 else None
+            meshes_spec = self._binary_layer.GetPrimAtPath(self.edit_layer_path) if self._binary_layer else None
+            self._binary_layer_prims = len(meshes_spec.nameChildren) if meshes_spec else 0
+        if self._binary_layer is None or (self.max_layer_prims and self._binary_layer_prims >= self.max_layer_prims):
+            self._binary_layer = create_shard_layer(self.edit_layer)
+            self._binary_layer_prims = 0
+            output_layers.append(self._binary_layer)
+        self._binary_layer_prims += 1
+        return self._binary_layer
+
+    def index_contents(self) -> set:
+        """Group the valid replacement assets by content, and return the names whose canonical asset changed."""
+        return run_steps(self._iter_index_contents())
+
+    def _iter_index_contents(self):
+        """Generator version of :meth:`index_contents`, yielding a :class:`Progress` between chunks of files."""
+        asset_paths = {name: str(asset_file_path) for name, asset_file_path in self.catalog
+                       if name not in self.asset_errors}
+        steps = self.content_index.iter_build(asset_paths, self.chunk_size)
+        while True:
+            # Only the chunks are timed, not the frames in between
+            with self.instrumentation.span(HASH_ASSETS, assets=len(asset_paths)):
+                try:
+                    done, total = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+            yield Progress("verify", done, total)
+
+    def build_plan(self, stage_mesh_prims) -> ExecutionPlan:
+        """Work out the action of every ``mesh_HASH`` from the composed ``stage_mesh_prims``, the replacement
+        catalog, the edit layer and the capture layers."""
+        return run_steps(self._iter_build_plan(stage_mesh_prims))
+
+    def _iter_build_plan(self, stage_mesh_prims):
+        """Generator version of :meth:`build_plan`, yielding a :class:`Progress` between chunks of names."""
+        plan = ExecutionPlan()
+        override_primspecs = self.get_override_primspecs()
+
+        # Prims on stage first, then the overrides and replacement assets without a prim on stage
+        stage_prims = {prim.GetName(): prim for prim in stage_mesh_prims}
+        names = dict.fromkeys(stage_prims)
+        names.update(dict.fromkeys(override_primspecs.keys()))
+        names.update(dict.fromkeys(self.catalog.names()))
+        names = list(names)
+        for chunk_start, chunk in self._iter_chunks(names):
+            if chunk_start:
+                yield Progress("verify", chunk_start, len(names))
+            for name in chunk:
+                self._plan_mesh(plan, name, stage_prims.get(name), override_primspecs.get(name))
+        return plan
+
+    def _plan_mesh(self, plan: ExecutionPlan, name: str, stage_prim: Usd.Prim, override_primspec: Sdf.PrimSpec):
+        asset_file_path = self.catalog.get(name)
+        asset_error = self.asset_errors.get(name)
+        if asset_error:
+            # Planned as if the asset was missing, so it is neither referenced nor reported as unused
+            plan.add(name, INVALID_ASSET, error=asset_error)
+            asset_file_path = None
+
+        capture_primspec = self.capture_index.get_prim_spec(name)
+        capture_asset_path = None
+        if capture_primspec:
+            capture_asset_path = get_capture_asset_path(capture_primspec.layer, capture_primspec)
+
+        # If there is a similarly named asset file, and not a similary named override, override the asset location
+        # (in the edit target layer). Overrides which do not have a transform property yet need one too.
+        needs_transform = False
+        stale = False
+        reference_mode = self._get_reference_mode(override_primspec) if override_primspec else self.reference_mode
+        manifest_entry = self.manifest.get(name) if override_primspec and self.manifest else None
+        if manifest_entry:
+            # Compare what the manifest recorded to the files on disk, fields which were not recorded are not checked
+            if (manifest_entry.asset_path and stage_prim and asset_file_path is not None
+                    and (manifest_entry.asset_path != self._get_reference_path(name, asset_file_path)
+                         or manifest_entry.fingerprint != get_fingerprint(str(asset_file_path))
+                         or self._is_instanced(override_primspec) != self.deduplicate
+                         or reference_mode != self.reference_mode)):
+                plan.add(name, ADD_REFERENCE, asset_path=self._get_reference_path(name, asset_file_path),
+                         has_mesh_child=bool(stage_prim.GetChild("mesh")), stale=True)
+                reference_mode = self.reference_mode
+                needs_transform = True
+            elif not override_primspec.attributes.get(self.xformop_name):
+                needs_transform = True
+            elif manifest_entry.digest and (manifest_entry.capture_fingerprint != get_fingerprint(capture_asset_path)
+                                            or self.manifest.correction != self._correction_digest):
+                needs_transform = stale = True
+            else:
+                plan.add(name, SKIP_EXISTING)
+        elif override_primspec:
+            if override_primspec.attributes.get(self.xformop_name):
+                plan.add(name, SKIP_EXISTING)
+            else:
+                needs_transform = True
+        elif stage_prim and asset_file_path is not None:
+            plan.add(name, ADD_REFERENCE, asset_path=self._get_reference_path(name, asset_file_path),
+                     has_mesh_child=bool(stage_prim.GetChild("mesh")))
+            needs_transform = True
+
+        if needs_transform and reference_mode != REFERENCE_PREPEND:
+            # The visual correction comes with the captured references the override removes
+            needs_transform = False
+            entry = plan.entries.get(name)
+            if not entry or ADD_REFERENCE not in entry.actions:
+                plan.add(name, SKIP_EXISTING)
+        if needs_transform:
+            if capture_asset_path:
+                entry = plan.add(name, ADD_TRANSFORM, capture_asset_path=capture_asset_path)
+                entry.stale = entry.stale or stale
+            else:
+                plan.add(name, MISSING_CAPTURE)
+
+        # Replacement assets which cannot be used
+        if asset_file_path is not None and not stage_prim:
+            plan.add(name, MISSING_STAGE_PRIM if name in self.capture_index else MISSING_CAPTURE)
+
+        entry = plan.entries.get(name)
+        if entry and SKIP_EXISTING in entry.actions:
+            self.instrumentation.count(SKIPPED)
+
+    def _get_reference_path(self, name: str, asset_file_path) -> str:
+        """Return the path of the asset to reference for ``name``, relative to the edit layer."""
+        if self.deduplicate:
+            asset_file_path = self.content_index.get(name) or asset_file_path
+        return self._get_relativizer().relativize(asset_file_path)
+
+    def _get_relativizer(self) -> PathRelativizer:
+        if self._relativizer is None or self._relativizer.start != os.path.dirname(self.edit_layer.realPath):
+            self._relativizer = PathRelativizer(self.edit_layer)
+            self._reference_resolver = CaptureReferenceResolver(self._relativizer)
+        return self._relativizer
+
+    def resolve_original_references(self, names) -> dict:
+        """Return the references of the captured prims of ``names`` relative to the edit layer, as
+        :data:`REFERENCE_DELETE_ORIGINAL` deletes them, in one pass timed as the :data:`RESOLVE_REFERENCES` span."""
+        self._get_relativizer()
+        original_references = {}
+        with self.instrumentation.span(RESOLVE_REFERENCES, prims=len(names)):
+            for name in names:
+                capture_primspec = self.capture_index.get_prim_spec(name)
+                if capture_primspec:
+                    original_references[name] = self._reference_resolver.get_original_references(capture_primspec)
+        return original_references
+
+    def _get_reference_overrides(self, entries: list) -> list:
+        original_references = {}
+        if self.reference_mode == REFERENCE_DELETE_ORIGINAL:
+            original_references = self.resolve_original_references([entry.name for entry in entries])
+        return [ReferenceOverride(entry.name, entry.asset_path, entry.has_mesh_child, self.deduplicate,
+                                  self.reference_mode, original_references.get(entry.name, ())) for entry in entries]
+
+    @staticmethod
+    def _get_reference_mode(override_primspec: Sdf.PrimSpec) -> str:
+        reference_list = override_primspec.referenceList
+        if reference_list.isExplicit:
+            return REFERENCE_REPLACE
+        if reference_list.deletedItems:
+            return REFERENCE_DELETE_ORIGINAL
+        return REFERENCE_PREPEND
+
+    @staticmethod
+    def _is_instanced(override_primspec: Sdf.PrimSpec) -> bool:
+        instance_spec = override_primspec.nameChildren.get(INSTANCE_NAME)
+        return bool(instance_spec and instance_spec.instanceable)
+
+    def get_plan(self) -> ExecutionPlan:
+        """Return the plan of the last :meth:`verify`, verifying first if needed."""
+        if self.plan is None:
+            self.verify()
+        return self.plan
+
+    def add_overrides(self, names=None) -> int:
+        """Reference the replacement assets from the edit layer and return the number of overrides created.
+
+        :param names: Only override these ``mesh_HASH`` prims instead of all the planned ones.
+        """
+        return run_steps(self.iter_add_overrides(names))
+
+    def iter_add_overrides(self, names=None):
+        """Generator version of :meth:`add_overrides`, yielding a :class:`Progress` after each chunk of prims.
+
+        Executes the pending :data:`ADD_REFERENCE` actions of the :attr:`plan`. Stale overrides are retracted and
+        authored again. Every prim of a chunk is fully authored before yielding, so closing the generator leaves the
+        edit layer consistent and a later run picks up the remaining prims.
+        """
+        plan = self.get_plan()
+        entries = plan.get_entries(ADD_REFERENCE)
+        if names is not None:
+            entries = [entry for entry in entries if entry.name in names]
+
+        # Rewrite the references of the whole capture in one pass, then author them in chunks of one change block
+        reference_overrides = self._get_reference_overrides(entries)
+        total = len(entries)
+        count = 0
+        try:
+            for chunk_start, chunk in self._iter_chunks(entries):
+                overrides = reference_overrides[chunk_start:chunk_start + len(chunk)]
+                with self.instrumentation.span(AUTHOR_SPECS, phase="overrides", prims=len(overrides)):
+                    self._retract_overrides([entry.name for entry in chunk if entry.stale], keep_specs=True)
+                    for layer, layer_overrides in self._group_by_layer(overrides).items():
+                        self._record_edits(layer, [override.name for override in layer_overrides])
+                        author_reference_overrides(layer, self.edit_layer_path, layer_overrides)
+                for entry in chunk:
+                    plan.complete(entry.name, ADD_REFERENCE)
+                    self.manifest.record_reference(entry.name, entry.asset_path,
+                                                   get_fingerprint(str(self.catalog.get(entry.name) or "")))
+
+                count += len(overrides)
+                self.instrumentation.count(PROCESSED, len(overrides))
+                yield Progress("overrides", chunk_start + len(chunk), total)
+        finally:
+            self.manifest.save()
+
+        logger.info("Created %d overrides in %s", count, self.edit_layer.GetDisplayName())
+        return count
+
+    def apply_vci(self, names=None) -> int:
+        """Author the inverse of the captured visual correction onto each override and return the number of
+        transforms applied.
+
+        :param names: Only apply the transforms of these ``mesh_HASH`` prims instead of all the planned ones.
+        :raises VciError: If the edit layer has no overrides yet.
+        """
+        return run_steps(self.iter_apply_vci(names))
+
+    def iter_apply_vci(self, names=None):
+        """Generator version of :meth:`apply_vci`, yielding a :class:`Progress` after each chunk of overrides.
+
+        Executes the pending :data:`ADD_TRANSFORM` actions of the :attr:`plan` for the overrides present in the edit
+        layer. Captured transforms are read, inverted as one array and authored chunk by chunk, so closing the
+        generator leaves the edit layer consistent and a later run picks up the remaining overrides. Captured matrices
+        which cannot be inverted are counted as failed and left out. Stale transforms are replaced, unless the new
+        inverse has the digest recorded in the :attr:`manifest`.
+        """
+        plan = self.get_plan()
+
+        # Get overriding mesh_HASH PrimSpecs from edit target layer
+        override_primspecs = self.get_override_primspecs()
+        if not override_primspecs:
+            raise VciError("No overrides found. Please first override meshes.")
+        entries = [entry for entry in plan.get_entries(ADD_TRANSFORM)
+                   if entry.name in override_primspecs and (names is None or entry.name in names)]
+
+        self.manifest.set_correction(self._correction_digest)
+        try:
+            count = yield from self._iter_apply_entries(entries)
+        finally:
+            self.manifest.save()
+
+        failed = self.instrumentation.counters[FAILED]
+        if failed:
+            logger.warning("%d meshes failed, see the debug log for details", failed)
+        logger.info("Applied %d inverse transforms in %s", count, self.edit_layer.GetDisplayName())
+        return count
+
+    def _iter_apply_entries(self, entries: list):
+        plan = self.plan
+        total = len(entries)
+        count = 0
+        for chunk_start, chunk in self._iter_chunks(entries):
+            with self.instrumentation.span(OPEN_ASSETS, prims=len(chunk)):
+                transforms, errors = extract_transforms({entry.name: entry.capture_asset_path for entry in chunk},
+                                                        self.max_workers, self.use_processes, self.transform_cache)
+            for name, error in errors.items():
+                logger.debug("%s for mesh %s", error, name)
+            self.instrumentation.count(FAILED, len(errors))
+
+            candidates = []
+            stale_names = set()
+            for entry in chunk:
+                transform = transforms.get(entry.name)
+                if not transform:
+                    continue
+                target = self._get_op_order(entry)
+                if target is None:
+                    continue
+                op_order, replaced = target
+                if replaced:
+                    stale_names.add(entry.name)
+                candidates.append((entry.name, op_order, transform.matrix, entry.capture_asset_path))
+
+            with self.instrumentation.span(INVERT_TRANSFORMS, prims=len(candidates)):
+                inverses, degenerate = compute_inverse_transforms(
+                    to_array([candidate[2] for candidate in candidates]), self.axis_correction)
+                digests = [get_transform_digest(inverse) for inverse in inverses]
+                inverses = to_matrices(inverses)
+            overrides = []
+            for (name, op_order, _, capture_asset_path), inverse, digest, is_degenerate in zip(
+                    candidates, inverses, digests, degenerate):
+                if is_degenerate:
+                    logger.debug("Captured visual correction of mesh %s is singular or degenerate", name)
+                    self.instrumentation.count(FAILED)
+                    continue
+                manifest_entry = self.manifest.get(name)
+                self.manifest.record_transform(name, get_fingerprint(capture_asset_path), digest)
+                if name in stale_names and manifest_entry and manifest_entry.digest == digest:
+                    # The captured file changed but not its visual correction
+                    plan.complete(name, ADD_TRANSFORM)
+                    self.instrumentation.count(SKIPPED)
+                    continue
+                overrides.append(TransformOverride(name, self.xformop_name, op_order, inverse))
+
+            with self.instrumentation.span(AUTHOR_SPECS, phase="transforms", prims=len(overrides)):
+                for layer, layer_overrides in self._group_by_layer(overrides).items():
+                    self._record_edits(layer, [override.name for override in layer_overrides])
+                    author_transform_overrides(layer, self.edit_layer_path, layer_overrides)
+            for override in overrides:
+                plan.complete(override.name, ADD_TRANSFORM)
+
+            count += len(overrides)
+            self.instrumentation.count(PROCESSED, len(overrides))
+            yield Progress("transforms", chunk_start + len(chunk), total)
+        return count
+
+    def _get_op_order(self, entry: PlanEntry):
+        """Return the composed op order of the prim of ``entry`` without the VCI op, and whether the op was already
+        there, or None if its transform is skipped or cannot be applied."""
+        # get target stage prim
+        target_prim = self.stage.GetPrimAtPath(self.stage_path + "/" + entry.name)
+        if not target_prim:
+            logger.debug("Could not get stage prim for mesh %s", entry.name)
+            self.instrumentation.count(FAILED)
+            return None
+
+        # The transform is appended to the composed op order, named so it is skipped on re-runs
+        op_order = list(UsdGeom.Xformable(target_prim).GetXformOpOrderAttr().Get() or [])
+        if self.xformop_name not in op_order:
+            return op_order, False
+        if not entry.stale:
+            logger.debug("%s already exists in xformOpOrder of mesh %s", self.xformop_name, entry.name)
+            self.instrumentation.count(SKIPPED)
+            return None
+        # Replaced in place, keeping the position of the op
+        return [op for op in op_order if op != self.xformop_name], True
+
+    def apply_sharded(self, shard_count: int, output: str = SHARD_MERGE, names=None, references: bool = True,
+                      transforms: bool = True):
+        """Execute the pending :data:`ADD_REFERENCE` and :data:`ADD_TRANSFORM` actions in a process pool and return
+        the number of ``(overrides, transforms)`` authored.
+
+        :param shard_count: Number of shards the ``mesh_HASH`` names are partitioned into by hash prefix.
+        :param output: :data:`SHARD_MERGE` to merge the shard layers into the edit layer, or :data:`SHARD_SUBLAYERS`
+            to keep them as ``.usdc`` sublayers of the edit layer.
+        :param names: Only process these ``mesh_HASH`` prims instead of all the planned ones.
+        :param references: Author the reference overrides.
+        :param transforms: Author the inverse transforms.
+        :raises VciError: If the edit layer is not saved on disk or ``output`` is unknown.
+        """
+        return run_steps(self.iter_apply_sharded(shard_count, output, names, references, transforms))
+
+    def iter_apply_sharded(self, shard_count: int, output: str = SHARD_MERGE, names=None, references: bool = True,
+                           transforms: bool = True):
+        """Generator version of :meth:`apply_sharded`, yielding a :class:`Progress` after each shard.
+
+        Op orders depend on the composed stage and are resolved here, then each worker reads, inverts and authors the
+        overrides of its shard into its own ``.usdc`` layer (see :func:`.shards.write_shard`). Shards are assembled in
+        index order, so the result does not depend on which worker finishes first. Overrides which already have a
+        spec in an output layer are updated in that layer.
+        """
+        if not self.edit_layer.realPath:
+            raise VciError("Save the edit target layer before authoring it in shards.")
+        if output not in SHARD_OUTPUTS:
+            raise VciError(f"Unknown shard output {output}, expected one of: {', '.join(SHARD_OUTPUTS)}")
+        plan = self.get_plan()
+
+        reference_entries = plan.get_entries(ADD_REFERENCE) if references else []
+        if names is not None:
+            reference_entries = [entry for entry in reference_entries if entry.name in names]
+        self._retract_overrides([entry.name for entry in reference_entries if entry.stale], keep_specs=True)
+        for layer in self.get_output_layers()[1:]:
+            # Workers open the shard layers from disk
+            if layer.dirty:
+                layer.Save()
+
+        override_primspecs = self.get_override_primspecs()
+        new_names = {entry.name for entry in reference_entries}
+        transform_entries = []
+        if transforms:
+            transform_entries = [entry for entry in plan.get_entries(ADD_TRANSFORM)
+                                 if (entry.name in override_primspecs or entry.name in new_names)
+                                 and (names is None or entry.name in names)]
+            self.manifest.set_correction(self._correction_digest)
+        cached = {}
+        if self.transform_cache is not None:
+            cached = self.transform_cache.get_many(sorted({entry.capture_asset_path for entry in transform_entries}))
+
+        # Gather the work of each shard
+        items = {}
+        for entry, reference in zip(reference_entries, self._get_reference_overrides(reference_entries)):
+            items[entry.name] = ShardItem(entry.name, reference, None, None, None, None, None)
+        for entry in transform_entries:
+            target = self._get_op_order(entry)
+            if target is None:
+                continue
+            op_order, replaced = target
+            replacement_path = None
+            if entry.name in new_names and not self.deduplicate and not self._has_local_op_order(entry.name):
+                # The referenced replacement's op order will take over the captured one
+                replacement_path = str(self.catalog.get(entry.name) or "") or None
+            manifest_entry = self.manifest.get(entry.name)
+            transform = cached.get(entry.capture_asset_path)
+            item = items.get(entry.name, ShardItem(entry.name, None, None, None, None, None, None))
+            items[entry.name] = item._replace(
+                capture_asset_path=entry.capture_asset_path, op_order=op_order, replacement_path=replacement_path,
+                matrix=tuple(value for row in transform.matrix for value in row) if transform else None,
+                digest=manifest_entry.digest if replaced and manifest_entry else None)
+        shards = {}
+        for item in items.values():
+            shards.setdefault(get_shard_index(item.name, shard_count), []).append(item)
+
+        if output == SHARD_SUBLAYERS:
+            folder = os.path.dirname(self.edit_layer.realPath)
+        else:
+            folder = tempfile.mkdtemp(prefix="remix_vci_shards_")
+            # New overrides keep the plan order, as if they had been authored in process
+            self._record_edits(self.edit_layer, items)
+            with Sdf.ChangeBlock():
+                for name in items:
+                    Sdf.CreatePrimInLayer(self.edit_layer, f"{self.edit_layer_path}/{name}")
+        tasks = [(index, get_shard_path(folder, self.edit_layer, index), self.edit_layer_path, shards[index],
+                  self.xformop_name, self.axis_correction) for index in sorted(shards)]
+        reference_count = 0
+        transform_count = 0
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            for done, result in enumerate(executor.map(_write_shard_task, tasks), 1):
+                with self.instrumentation.span(AUTHOR_SPECS, phase="shards", prims=len(shards[result.index])):
+                    shard_layer = Sdf.Layer.Find(result.path)
+                    if shard_layer:
+                        shard_layer.Reload()
+                    else:
+                        shard_layer = Sdf.Layer.FindOrOpen(result.path)
+                    self._assemble_shard(shard_layer, output, override_primspecs)
+                reference_count += self._record_shard(result)
+                transform_count += sum(authored for _, authored in result.transforms.values())
+                yield Progress("shards", done, len(tasks))
+        finally:
+            executor.shutdown(cancel_futures=True)
+            self.manifest.save()
+            if output == SHARD_MERGE:
+                shutil.rmtree(folder, ignore_errors=True)
+                remove_overrides(self.edit_layer, self.edit_layer_path,
+                                 [name for name in items if self.edit_layer.GetPrimAtPath(
+                                     f"{self.edit_layer_path}/{name}").IsInert()])
+
+        logger.info("Created %d overrides and applied %d inverse transforms in %d shards of %s", reference_count,
+                    transform_count, len(tasks), self.edit_layer.GetDisplayName())
+        return reference_count, transform_count
+
+    def _has_local_op_order(self, name: str) -> bool:
+        """Whether the composed op order of ``name`` comes from the layer stack rather than a referenced asset."""
+        prim = self.stage.GetPrimAtPath(f"{self.stage_path}/{name}")
+        property_stack = UsdGeom.Xformable(prim).GetXformOpOrderAttr().GetPropertyStack() if prim else []
+        return bool(property_stack) and property_stack[0].layer in self.stage.GetLayerStack()
+
+    def _assemble_shard(self, shard_layer: Sdf.Layer, output: str, override_primspecs: dict):
+        if output == SHARD_MERGE:
+            merge_shard(self.edit_layer, shard_layer, self.edit_layer_path)
+            return
+        add_shard_sublayer(self.edit_layer, shard_layer.realPath)
+        meshes_spec = shard_layer.GetPrimAtPath(self.edit_layer_path)
+        # Overrides authored before, in the edit layer or another shard layer, are updated where they are
+        owners = {}
+        for prim_spec in (meshes_spec.nameChildren if meshes_spec else []):
+            owner = override_primspecs.get(prim_spec.name)
+            if owner and owner.layer != shard_layer:
+                owners.setdefault(owner.layer, []).append(prim_spec.name)
+        for layer, layer_names in owners.items():
+            merge_shard(layer, shard_layer, self.edit_layer_path, set(layer_names))
+            remove_overrides(shard_layer, self.edit_layer_path, layer_names)
+            if layer != self.edit_layer:
+                layer.Save()
+        if owners:
+            shard_layer.Save()
+
+    def _record_shard(self, result) -> int:
+        """Update the :attr:`plan`, :attr:`manifest`, cache and counters from a shard result, and return its number of
+        reference overrides."""
+        plan = self.plan
+        for name, error in result.errors.items():
+            logger.debug("%s for mesh %s", error, name)
+        self.instrumentation.count(FAILED, len(result.errors))
+        if self.transform_cache is not None and result.captured:
+            self.transform_cache.put_many(result.captured)
+
+        for name in result.references:
+            plan.complete(name, ADD_REFERENCE)
+            self.manifest.record_reference(name, plan.entries[name].asset_path,
+                                           get_fingerprint(str(self.catalog.get(name) or "")))
+        self.instrumentation.count(PROCESSED, len(result.references))
+        for name, (digest, authored) in result.transforms.items():
+            plan.complete(name, ADD_TRANSFORM)
+            self.manifest.record_transform(name, get_fingerprint(plan.entries[name].capture_asset_path), digest)
+            self.instrumentation.count(PROCESSED if authored else SKIPPED)
+        return len(result.references)
+
+    def sync_assets(self, file_names) -> str:
+        """Bring the edit layer up to date with replacement files added, modified or removed since the last
+        :meth:`verify` (e.g. as reported by :class:`AssetWatcher`), and return a report.
+
+        Overrides and transforms of new assets are authored, those of removed assets retracted, and the :attr:`plan`
+        is updated for the affected ``mesh_HASH`` prims only.
+        """
+        return run_steps(self.iter_sync_assets(file_names))
+
+    def iter_sync_assets(self, file_names):
+        """Generator version of :meth:`sync_assets`, yielding the :class:`Progress` of the re-verify, override and
+        transform steps it runs."""
+        plan = self.get_plan()
+        with self.instrumentation.span(SCAN_FOLDER, files=len(file_names)):
+            names = self.catalog.update(file_names)
+        if not names:
+            return ""
+
+        removed = sorted(name for name in names if name not in self.catalog)
+        with self.instrumentation.span(AUTHOR_SPECS, phase="retract", prims=len(removed)):
+            retracted = self._retract_overrides(removed)
+        self.manifest.remove(retracted)
+        self.manifest.save()
+        # Duplicates of a changed canonical asset are re-pointed along with it
+        planned_names = yield from self._iter_replan(names, rescan=False)
+
+        overrides = yield from self.iter_add_overrides(planned_names)
+        transforms = 0
+        if any(entry.name in planned_names for entry in plan.get_entries(ADD_TRANSFORM)):
+            transforms = yield from self.iter_apply_vci(planned_names)
+        logger.info("Synced %d replacement assets: %d overrides, %d transforms, %d retracted", len(names), overrides,
+                    transforms, len(retracted))
+        return (f"{len(names)} replacement assets changed: created {overrides} overrides, applied {transforms} "
+                f"inverse transforms, retracted {len(retracted)} overrides.\n")
+
+    def save(self) -> bool:
+        """Save the edit layer and the modified shard layers, timed as the :data:`SAVE` span."""
+        with self.instrumentation.span(SAVE):
+            for layer in self.get_output_layers()[1:]:
+                if layer.dirty:
+                    layer.Save()
+            return self.edit_layer.Save()
+
+    def _iter_chunks(self, items: list):
+        chunk_size = self.chunk_size or max(len(items), 1)
+        for chunk_start in range(0, len(items), chunk_size):
+            yield chunk_start, items[chunk_start:chunk_start + chunk_size]
@@ -0,0 +1,111 @@
+"""Content deduplication of the replacement ``E_mesh_HASH`` assets.
+
+Remix captures often have several ``mesh_HASH`` prims replaced by the same asset exported under each hash. Files are
+grouped by size first and only files sharing their size with another one are hashed, so a folder without duplicates
+costs one ``stat`` per file. Byte-identical files are then referenced through a single canonical asset, which the
+overrides author as an instanceable child so the stage shares one prototype per canonical asset.
+"""
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import get_file_signature
+
+
+_READ_SIZE = 1024 * 1024
+
+
+def get_content_digest(path: str) -> str:
+    """Return the SHA-256 of the bytes of the file at ``path``, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for data in iter(lambda: f.read(_READ_SIZE), b""):
+                digest.update(data)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ContentIndex:
+    """Groups the replacement assets of an :class:`.catalog.AssetCatalog` by content.
+
+    Digests are kept per path and file signature, so re-indexing only hashes the files added or changed since.
+
+    :param max_workers: Number of threads hashing files, ``hashlib`` releases the GIL on large reads.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        # Canonical asset path per mesh_HASH name, only for the names whose asset duplicates another one
+        self.canonical_paths: dict = {}
+        self._digests: dict = {}
+
+    def build(self, asset_paths: dict) -> set:
+        """Index ``asset_paths``, the replacement asset path per ``mesh_HASH`` name, and return the names whose
+        canonical asset changed since the previous build.
+
+        The canonical asset of a group of byte-identical files is the smallest path, so the choice does not depend on
+        the order files are listed in.
+        """
+        steps = self.iter_build(asset_paths)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def iter_build(self, asset_paths: dict, chunk_size: int = None):
+        """Generator version of :meth:`build`, yielding ``(done, total)`` between chunks of ``chunk_size`` files read
+        for their signature, then hashed."""
+        items = list(asset_paths.items())
+        chunk_size = chunk_size or max(len(items), 1)
+        signatures = {}
+        by_size = {}
+        for chunk_start in range(0, len(items), chunk_size):
+            if chunk_start:
+                yield chunk_start, len(items)
+            for name, asset_path in items[chunk_start:chunk_start + chunk_size]:
+                signature = get_file_signature(asset_path)
+                if signature is not None:
+                    signatures[asset_path] = signature
+                    by_size.setdefault(signature[0], []).append(name)
+
+        candidates = [name for names in by_size.values() if len(names) > 1 for name in names]
+        pending = sorted({asset_paths[name] for name in candidates
+                          if self._digests.get(asset_paths[name], (None,))[0] != signatures[asset_paths[name]]})
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for chunk_start in range(0, len(pending), chunk_size):
+                    yield chunk_start, len(pending)
+                    chunk = pending[chunk_start:chunk_start + chunk_size]
+                    for asset_path, digest in zip(chunk, executor.map(get_content_digest, chunk)):
+                        self._digests[asset_path] = (signatures[asset_path], digest)
+        # Forget the files which are gone or changed without being hashed again
+        self._digests = {asset_path: value for asset_path, value in self._digests.items()
+                         if value[0] == signatures.get(asset_path)}
+
+        by_digest = {}
+        for name in candidates:
+            digest = self._digests[asset_paths[name]][1]
+            if digest is not None:
+                by_digest.setdefault(digest, []).append(name)
+
+        canonical_paths = {}
+        for names in by_digest.values():
+            if len(names) > 1:
+                canonical_path = min(asset_paths[name] for name in names)
+                canonical_paths.update((name, canonical_path) for name in names if asset_paths[name] != canonical_path)
+
+        changed = {name for name in canonical_paths.keys() | self.canonical_paths.keys()
+                   if canonical_paths.get(name) != self.canonical_paths.get(name)}
+        self.canonical_paths = canonical_paths
+        return changed
+
+    def get(self, name: str) -> str:
+        """Return the canonical asset path replacing the asset of ``name``, or None if it has no duplicate elsewhere or
+        is canonical itself."""
+        return self.canonical_paths.get(name)
+
+    def count_canonical(self) -> int:
+        """Return the number of canonical assets standing in for duplicates."""
+        return len(set(self.canonical_paths.values()))
@@ -0,0 +1,86 @@
+"""Phase timing and prim counters of the VCI pipeline.
+
+The engine reports through the ``codetestdummy.omniverse.kit.remix_vci`` :mod:`logging` logger, which Kit forwards to
+the ``carb`` log with the matching level. Per prim messages are logged at debug level only, a run summary is built from
+the :class:`Instrumentation` of the engine instead.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("codetestdummy.omniverse.kit.remix_vci")
+
+# Spans recorded by the engine
+SCAN_FOLDER = "scan_folder"
+VALIDATE_ASSETS = "validate_assets"
+HASH_ASSETS = "hash_assets"
+RESOLVE_REFERENCES = "resolve_references"
+INDEX_CAPTURE = "index_capture"
+OPEN_ASSETS = "open_assets"
+INVERT_TRANSFORMS = "invert_transforms"
+AUTHOR_SPECS = "author_specs"
+SAVE = "save"
+
+# Counters recorded by the engine
+PROCESSED = "processed"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+COUNTERS = (PROCESSED, SKIPPED, FAILED)
+
+
+class Instrumentation:
+    """Accumulates the time spent in named spans and prim counters across the steps of a run.
+
+    Every span is also kept as a complete event so the run can be written as a Chrome trace (``chrome://tracing`` or
+    Perfetto) with :meth:`write_trace`. Spans are recorded per phase or per chunk, never per prim.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.span_seconds: dict = {}
+        self.span_calls: dict = {}
+        self.counters: dict = dict.fromkeys(COUNTERS, 0)
+        self.events: list = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Time the body of the ``with`` statement as span ``name``. ``args`` are stored with the trace event."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.span_seconds[name] = self.span_seconds.get(name, 0.0) + end - start
+            self.span_calls[name] = self.span_calls.get(name, 0) + 1
+            self.events.append({"name": name, "ph": "X", "ts": (start - self._origin) * 1e6,
+                                "dur": (end - start) * 1e6, "pid": os.getpid(), "tid": threading.get_ident(),
+                                "args": args})
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> str:
+        """Return the counters and the time of each span on two lines."""
+        counters = ", ".join(f"{value} {name}" for name, value in self.counters.items())
+        spans = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.span_seconds.items())
+        return f"Prims: {counters}\nTime: {spans or 'none'}"
+
+    def to_dict(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "spans": {name: {"seconds": seconds, "calls": self.span_calls[name]}
+                      for name, seconds in self.span_seconds.items()},
+        }
+
+    def write_trace(self, path: str):
+        """Write the recorded spans as a Chrome trace JSON file, with the totals in its metadata."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": self.to_dict()}, f, indent=1)
@@ -0,0 +1,95 @@
+"""Vectorized inversion of captured visual correction matrices.
+
+All matrices of a batch are stacked into one ``(N, 4, 4)`` NumPy array, so validating, inverting and correcting them is
+a handful of array operations whatever the number of meshes. Matrices use the USD row-vector convention: a point ``p``
+is transformed as ``p @ M`` and the translation is the last row.
+"""
+import numpy as np
+
+from pxr import Gf
+
+
+DEFAULT_TOLERANCE = 1e-9
+
+_AXES = "xyz"
+
+# Rotations of the up axis, as row-vector matrices
+_UP_AXIS_ROTATIONS = {
+    # +Y becomes +Z, i.e. a +90 degrees rotation around X
+    "y_to_z": np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, -1, 0, 0], [0, 0, 0, 1]], dtype=np.float64),
+    # +Z becomes +Y, i.e. a -90 degrees rotation around X
+    "z_to_y": np.array([[1, 0, 0, 0], [0, 0, -1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=np.float64),
+}
+UP_AXIS_ROTATIONS = tuple(_UP_AXIS_ROTATIONS)
+
+
+def build_axis_correction(flip_axes: str = "", up_axis_rotation: str = None) -> np.ndarray:
+    """Return the ``(4, 4)`` correction applied to the replacement's points before the inverse visual correction, or
+    None if there is nothing to correct.
+
+    :param flip_axes: Axes to mirror, any of ``"x"``, ``"y"`` and ``"z"``. Mirroring an odd number of axes switches the
+        handedness of the mesh.
+    :param up_axis_rotation: One of :data:`UP_AXIS_ROTATIONS` to rotate the up axis, applied after the mirroring.
+    :raises ValueError: If an axis or rotation is unknown.
+    """
+    flip_axes = flip_axes.lower()
+    unknown = set(flip_axes) - set(_AXES)
+    if unknown:
+        raise ValueError(f"Unknown axes to flip: {''.join(sorted(unknown))}")
+    if up_axis_rotation and up_axis_rotation not in _UP_AXIS_ROTATIONS:
+        raise ValueError(f"Unknown up axis rotation {up_axis_rotation}, expected one of {', '.join(UP_AXIS_ROTATIONS)}")
+    if not flip_axes and not up_axis_rotation:
+        return None
+
+    correction = np.diag([-1.0 if axis in flip_axes else 1.0 for axis in _AXES] + [1.0])
+    if up_axis_rotation:
+        correction = correction @ _UP_AXIS_ROTATIONS[up_axis_rotation]
+    return correction
+
+
+def to_array(matrices) -> np.ndarray:
+    """Stack ``Gf.Matrix4d`` values into an ``(N, 4, 4)`` float64 array."""
+    if not matrices:
+        return np.empty((0, 4, 4))
+    return np.array([np.asarray(matrix) for matrix in matrices], dtype=np.float64).reshape(-1, 4, 4)
+
+
+def to_matrices(array: np.ndarray) -> list:
+    """Convert an ``(N, 4, 4)`` array back into ``Gf.Matrix4d`` values."""
+    return [Gf.Matrix4d(*row) for row in array.reshape(-1, 16).tolist()]
+
+
+def find_degenerate(matrices: np.ndarray, tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """Return a boolean mask of the matrices which cannot be inverted as affine transforms: non finite values, a
+    projective last column or a (nearly) singular linear part."""
+    finite = np.isfinite(matrices).all(axis=(1, 2))
+    affine = np.abs(matrices[:, :3, 3]).max(axis=1, initial=0.0) <= tolerance
+    affine &= np.abs(matrices[:, 3, 3] - 1.0) <= tolerance
+    # Replace non finite matrices so the determinants do not warn, they are flagged anyway
+    linear = np.where(finite[:, None, None], matrices, 0.0)[:, :3, :3]
+    determinants = np.linalg.det(linear)
+    # Relative to the scale of the matrix so that small but valid scales (e.g. centimeters to meters) pass
+    scales = np.abs(linear).max(axis=(1, 2), initial=0.0)
+    regular = np.abs(determinants) > tolerance * np.maximum(scales, tolerance) ** 3
+    return ~(finite & affine & regular)
+
+
+def compute_inverse_transforms(matrices: np.ndarray, correction: np.ndarray = None,
+                               tolerance: float = DEFAULT_TOLERANCE):
+    """Invert a batch of visual correction matrices and apply an optional axis ``correction`` first.
+
+    :param matrices: ``(N, 4, 4)`` captured matrices.
+    :param correction: Optional ``(4, 4)`` matrix from :func:`build_axis_correction`.
+    :return: A ``(inverses, degenerate)`` tuple: the ``(N, 4, 4)`` results, ``correction @ inverse(matrix)``, and the
+        mask of :func:`find_degenerate`. Degenerate matrices are left as identity in the results.
+    """
+    degenerate = find_degenerate(matrices, tolerance)
+    inverses = np.broadcast_to(np.identity(4), matrices.shape).copy()
+    valid = ~degenerate
+    if valid.any():
+        inverses[valid] = np.linalg.inv(matrices[valid])
+        if correction is not None:
+            inverses[valid] = correction @ inverses[valid]
+    # Turn the -0.0 produced by the inversion into 0.0, which USD would otherwise write as "-0"
+    inverses += 0.0
+    return inverses, degenerate
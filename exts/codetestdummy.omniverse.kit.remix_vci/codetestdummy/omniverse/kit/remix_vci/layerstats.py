@@ -0,0 +1,52 @@
+"""File size and load time of the layers holding the VCI overrides.
+
+Measured before and after a run, so inline text output and binary ``.usdc`` output (see ``VciEngine.binary_output``)
+can be compared on a given project. Layers are loaded as new anonymous layers, so the time does not depend on layers
+already open in the process.
+"""
+import os
+import time
+from collections import namedtuple
+
+from pxr import Sdf
+
+from .shards import SHARD_SUFFIX
+
+
+# size in bytes, load_seconds the time to open and parse the file
+LayerStats = namedtuple("LayerStats", ["path", "size", "load_seconds"])
+
+
+def get_output_paths(edit_layer_path: str) -> list:
+    """Return the edit layer file and the shard sublayer files it lists, which exist on disk."""
+    if not os.path.isfile(edit_layer_path):
+        return []
+    paths = [edit_layer_path]
+    layer = Sdf.Layer.OpenAsAnonymous(edit_layer_path, metadataOnly=True)
+    for sublayer_path in layer.subLayerPaths if layer else []:
+        if SHARD_SUFFIX in os.path.basename(sublayer_path):
+            path = os.path.join(os.path.dirname(edit_layer_path), sublayer_path)
+            if os.path.isfile(path):
+                paths.append(os.path.normpath(path))
+    return paths
+
+
+def measure_layer(path: str) -> LayerStats:
+    start = time.perf_counter()
+    Sdf.Layer.OpenAsAnonymous(path)
+    return LayerStats(path, os.path.getsize(path), time.perf_counter() - start)
+
+
+def measure_output(edit_layer_path: str) -> list:
+    """Return the :class:`LayerStats` of the :func:`get_output_paths` of ``edit_layer_path``."""
+    return [measure_layer(path) for path in get_output_paths(edit_layer_path)]
+
+
+def format_stats(label: str, stats: list, save_seconds: float = None) -> str:
+    """Return one line with the number of files, total size and load time of ``stats``."""
+    size = sum(layer_stats.size for layer_stats in stats)
+    load_seconds = sum(layer_stats.load_seconds for layer_stats in stats)
+    line = f"{label}: {len(stats)} files, {size / 1024:.1f} KB, loaded in {load_seconds:.3f}s"
+    if save_seconds is not None:
+        line += f", saved in {save_seconds:.3f}s"
+    return line
@@ -0,0 +1,105 @@
+"""Manifest of the overrides authored by the VCI pipeline, stored in the edit layer's ``customLayerData``.
+
+Per ``mesh_HASH`` it records the referenced replacement asset, the fingerprint of the replacement file, the fingerprint
+of the captured mesh the transform was read from and a digest of the authored transform. Verify compares them to the
+files on disk with a dictionary lookup and two ``stat`` calls per prim, so unchanged prims are skipped without opening
+any asset and only the entries whose files changed are applied again.
+
+The manifest is only trusted together with the specs it describes: an entry without an override (e.g. after an undo)
+is ignored, and overrides without an entry are handled as before the manifest existed.
+"""
+import hashlib
+import struct
+from collections import namedtuple
+
+from pxr import Sdf, Vt
+
+from .cache import get_file_signature
+
+
+MANIFEST_VERSION = 1
+
+# asset_path is the reference authored in the edit layer, fingerprint the replacement file's, capture_fingerprint the
+# captured mesh's and digest the one of the authored inverse transform. Values not recorded yet are empty strings.
+ManifestEntry = namedtuple("ManifestEntry", ["asset_path", "fingerprint", "capture_fingerprint", "digest"])
+
+_EMPTY_ENTRY = ManifestEntry("", "", "", "")
+
+
+def get_fingerprint(path: str) -> str:
+    """Return a fingerprint of the file at ``path`` from its size and modification time, or an empty string if it
+    cannot be read."""
+    signature = get_file_signature(path) if path else None
+    return f"{signature[0]}:{signature[1]}" if signature else ""
+
+
+def get_transform_digest(matrix) -> str:
+    """Return a short digest of a 4x4 ``matrix`` (a ``Gf.Matrix4d`` or an array)."""
+    if matrix is None:
+        return ""
+    data = struct.pack("<16d", *(float(value) for row in matrix for value in row))
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+class VciManifest:
+    """Read and update the manifest stored under ``key`` in the ``customLayerData`` of ``layer``.
+
+    Updates are kept in memory until :meth:`save`, which writes the whole manifest at once.
+    """
+
+    def __init__(self, layer: Sdf.Layer, key: str):
+        self.layer = layer
+        self.key = key
+        self._dirty = False
+        data = layer.customLayerData.get(key) or {}
+        if data.get("version") != MANIFEST_VERSION:
+            data = {}
+        self.correction = data.get("correction", "")
+        self._entries = {name: ManifestEntry(*values) for name, values in (data.get("meshes") or {}).items()
+                         if len(values) == len(ManifestEntry._fields)}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str) -> ManifestEntry:
+        """Return the :class:`ManifestEntry` of ``name``, or None."""
+        return self._entries.get(name)
+
+    def set_correction(self, correction: str):
+        """Record the digest of the axis correction the transforms are authored with."""
+        if correction != self.correction:
+            self.correction = correction
+            self._dirty = True
+
+    def record_reference(self, name: str, asset_path: str, fingerprint: str):
+        """Record the reference authored for ``name``. The transform fields are kept."""
+        entry = self._entries.get(name, _EMPTY_ENTRY)
+        self._entries[name] = entry._replace(asset_path=asset_path, fingerprint=fingerprint)
+        self._dirty = True
+
+    def record_transform(self, name: str, capture_fingerprint: str, digest: str):
+        """Record the transform authored for ``name``. The reference fields are kept."""
+        entry = self._entries.get(name, _EMPTY_ENTRY)
+        self._entries[name] = entry._replace(capture_fingerprint=capture_fingerprint, digest=digest)
+        self._dirty = True
+
+    def remove(self, names):
+        for name in names:
+            if self._entries.pop(name, None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Write the manifest to the layer if it changed since it was read or last saved."""
+        if not self._dirty:
+            return
+        custom_layer_data = dict(self.layer.customLayerData)
+        custom_layer_data[self.key] = {
+            "version": MANIFEST_VERSION,
+            "correction": self.correction,
+            "meshes": {name: Vt.StringArray(list(entry)) for name, entry in self._entries.items()},
+        }
+        self.layer.customLayerData = custom_layer_data
+        self._dirty = False
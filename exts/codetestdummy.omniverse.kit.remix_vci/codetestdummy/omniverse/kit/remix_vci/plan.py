@@ -0,0 +1,126 @@
+"""Execution plan built by Verify and executed by Override References and Add Transforms."""
+import json
+
+
+ADD_REFERENCE = "add_reference"
+ADD_TRANSFORM = "add_transform"
+SKIP_EXISTING = "skip_existing"
+MISSING_CAPTURE = "missing_capture"
+MISSING_STAGE_PRIM = "missing_stage_prim"
+INVALID_ASSET = "invalid_asset"
+
+ACTIONS = (ADD_REFERENCE, ADD_TRANSFORM, SKIP_EXISTING, MISSING_CAPTURE, MISSING_STAGE_PRIM, INVALID_ASSET)
+
+_DIFF_FORMATS = {
+    ADD_REFERENCE: "+ref   {name} -> {asset_path}",
+    ADD_TRANSFORM: "+xform {name} <- {capture_asset_path}",
+    SKIP_EXISTING: "=      {name}",
+    MISSING_CAPTURE: "!cap   {name} has no captured mesh",
+    MISSING_STAGE_PRIM: "!prim  {name} is not on the stage",
+    INVALID_ASSET: "!asset {name}: {error}",
+}
+
+
+class PlanEntry:
+    """Pending actions of one ``mesh_HASH`` and the data needed to execute them.
+
+    :param asset_path: Replacement asset to reference, relative to the edit layer.
+    :param capture_asset_path: Absolute path of the captured mesh holding the visual correction.
+    :param has_mesh_child: Whether the composed prim has the captured ``mesh`` child to deactivate.
+    :param error: Why the replacement asset failed the pre-flight validation, see :mod:`.preflight`.
+    :param stale: Whether the actions replace an existing override or transform whose files changed since they were
+        authored, see :class:`.manifest.VciManifest`.
+    """
+
+    __slots__ = ("name", "actions", "asset_path", "capture_asset_path", "has_mesh_child", "error", "stale")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.actions = []
+        self.asset_path = None
+        self.capture_asset_path = None
+        self.has_mesh_child = False
+        self.error = None
+        self.stale = False
+
+    def to_dict(self) -> dict:
+        return {
+            "actions": list(self.actions),
+            "asset_path": self.asset_path,
+            "capture_asset_path": self.capture_asset_path,
+            "has_mesh_child": self.has_mesh_child,
+            "error": self.error,
+            "stale": self.stale,
+        }
+
+
+class ExecutionPlan:
+    """Per ``mesh_HASH`` actions discovered by Verify.
+
+    The apply steps execute the pending :data:`ADD_REFERENCE` and :data:`ADD_TRANSFORM` actions and mark them as
+    completed, so the expensive discovery only happens once per run.
+    """
+
+    def __init__(self):
+        self.entries: dict = {}
+
+    def add(self, name: str, action: str, **data) -> PlanEntry:
+        entry = self.entries.get(name)
+        if entry is None:
+            entry = self.entries[name] = PlanEntry(name)
+        if action not in entry.actions:
+            entry.actions.append(action)
+        for key, value in data.items():
+            setattr(entry, key, value)
+        return entry
+
+    def remove(self, name: str):
+        """Forget the actions of ``name``, e.g. before planning it again."""
+        self.entries.pop(name, None)
+
+    def get_entries(self, action: str) -> list:
+        """Return the entries with a pending ``action``, in discovery order."""
+        return [entry for entry in self.entries.values() if action in entry.actions]
+
+    def count_stale(self) -> int:
+        """Return the number of entries with pending actions replacing stale overrides or transforms."""
+        return sum(1 for entry in self.entries.values()
+                   if entry.stale and (ADD_REFERENCE in entry.actions or ADD_TRANSFORM in entry.actions))
+
+    def complete(self, name: str, action: str):
+        """Mark ``action`` of ``name`` as executed."""
+        entry = self.entries.get(name)
+        if entry and action in entry.actions:
+            entry.actions.remove(action)
+            if not entry.actions:
+                entry.actions.append(SKIP_EXISTING)
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys(ACTIONS, 0)
+        for entry in self.entries.values():
+            for action in entry.actions:
+                counts[action] += 1
+        return counts
+
+    def format_diff(self, limit: int = None) -> str:
+        """Return a line per pending action, showing at most ``limit`` lines."""
+        lines = []
+        for action in ACTIONS:
+            for entry in self.get_entries(action):
+                lines.append(_DIFF_FORMATS[action].format(name=entry.name, asset_path=entry.asset_path,
+                                                          capture_asset_path=entry.capture_asset_path,
+                                                          error=entry.error))
+        if limit is not None and len(lines) > limit:
+            lines = lines[:limit] + [f"... {len(lines) - limit} more"]
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "counts": self.counts(),
+            "entries": {name: entry.to_dict() for name, entry in self.entries.items()},
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
@@ -0,0 +1,122 @@
+"""Pre-flight validation of the replacement ``E_mesh_HASH`` assets.
+
+Verify opens every replacement asset in a worker pool before anything is authored, so broken files are reported in the
+plan instead of being referenced and only failing when Hydra loads them. Assets are read as plain ``Sdf`` layers; a
+stage is only composed for assets which reference or payload their geometry from other files.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pxr import Usd, UsdGeom, Sdf
+
+
+def _is_non_empty_extent(extent) -> bool:
+    if extent is None or len(extent) != 2:
+        return False
+    minimum, maximum = extent
+    return all(minimum[axis] <= maximum[axis] for axis in range(3)) and any(
+        minimum[axis] < maximum[axis] for axis in range(3))
+
+
+def _get_extent_value(attr_spec: Sdf.AttributeSpec):
+    if attr_spec.default is not None:
+        return attr_spec.default
+    time_samples = attr_spec.layer.ListTimeSamplesForPath(attr_spec.path)
+    return attr_spec.layer.QueryTimeSample(attr_spec.path, time_samples[0]) if time_samples else None
+
+
+def _find_local_extent(prim_spec: Sdf.PrimSpec):
+    """Return ``(found, composed)``: whether a prim spec at or below ``prim_spec`` has a non-empty extent, and whether
+    the subtree brings in other files which need composing to know."""
+    composed = False
+    prim_specs = [prim_spec]
+    while prim_specs:
+        prim_spec = prim_specs.pop()
+        attr_spec = prim_spec.attributes.get(UsdGeom.Tokens.extent)
+        if attr_spec and _is_non_empty_extent(_get_extent_value(attr_spec)):
+            return True, composed
+        composed = composed or prim_spec.hasReferences or prim_spec.hasPayloads
+        prim_specs.extend(prim_spec.nameChildren)
+    return False, composed
+
+
+def _find_composed_extent(asset_path: str, prim_path: Sdf.Path) -> bool:
+    stage = Usd.Stage.Open(asset_path, Usd.Stage.LoadAll)
+    prim = stage.GetPrimAtPath(prim_path) if stage else None
+    if not prim:
+        return False
+    for descendant in Usd.PrimRange(prim):
+        extent_attr = UsdGeom.Boundable(descendant).GetExtentAttr()
+        if extent_attr and _is_non_empty_extent(extent_attr.Get()):
+            return True
+    return False
+
+
+def validate_replacement(asset_path: str) -> str:
+    """Check the replacement asset at ``asset_path`` can be referenced.
+
+    :return: None if the asset parses, has a defined default prim and a non-empty extent at or below it, otherwise a
+        message describing the first problem found.
+    """
+    try:
+        layer = Sdf.Layer.FindOrOpen(asset_path)
+    except Exception as e:
+        return f"Could not open replacement {asset_path}: {e}"
+    if not layer:
+        return f"Could not open replacement {asset_path}"
+
+    if not layer.defaultPrim:
+        return f"Replacement {asset_path} has no default prim"
+    prim_spec = layer.GetPrimAtPath(Sdf.Path.absoluteRootPath.AppendChild(layer.defaultPrim))
+    if not prim_spec:
+        return f"Default prim {layer.defaultPrim} of replacement {asset_path} does not exist"
+    if prim_spec.specifier != Sdf.SpecifierDef:
+        return f"Default prim {layer.defaultPrim} of replacement {asset_path} is not defined"
+
+    found, composed = _find_local_extent(prim_spec)
+    if not found and composed:
+        found = _find_composed_extent(asset_path, prim_spec.path)
+    if not found:
+        return f"Replacement {asset_path} has no non-empty extent"
+    return None
+
+
+def _validate_replacement_or_error(asset_path: str) -> str:
+    try:
+        return validate_replacement(asset_path)
+    except Exception as e:
+        return f"Could not validate replacement {asset_path}: {e}"
+
+
+def validate_replacements(asset_paths: dict, max_workers: int = None, use_processes: bool = False,
+                          cache=None, executor=None) -> dict:
+    """Validate many replacement assets in parallel with :func:`validate_replacement`.
+
+    :param asset_paths: Replacement asset path per ``mesh_HASH`` name.
+    :param max_workers: Size of the worker pool, defaults to the executor's default.
+    :param use_processes: Use a process pool instead of threads. Avoid inside Kit.
+    :param cache: Optional :class:`.cache.TransformCache`, only assets changed since they were stored in it are opened.
+    :param executor: Optional executor to validate with instead of a new pool, e.g. one shared by several calls.
+        ``max_workers`` and ``use_processes`` are then ignored.
+    :return: The validation error per ``mesh_HASH`` name of the invalid assets.
+    """
+    unique_paths = sorted(set(asset_paths.values()))
+    if not unique_paths:
+        return {}
+
+    results = {}
+    if cache is not None:
+        results = cache.get_validations(unique_paths)
+        unique_paths = [asset_path for asset_path in unique_paths if asset_path not in results]
+
+    if unique_paths:
+        if executor is not None:
+            validated = dict(zip(unique_paths, executor.map(_validate_replacement_or_error, unique_paths)))
+        else:
+            executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_type(max_workers=max_workers) as executor:
+                validated = dict(zip(unique_paths, executor.map(_validate_replacement_or_error, unique_paths)))
+        if cache is not None:
+            cache.put_validations(validated)
+        results.update(validated)
+
+    return {name: results[asset_path] for name, asset_path in asset_paths.items() if results[asset_path]}
@@ -0,0 +1,69 @@
+"""Rewrite of the captured references of the overridden ``mesh_HASH`` prims.
+
+A capture prim references its captured mesh file, relative to the capture layer. The overrides are authored in the edit
+layer, so removing that reference from there needs its path anchored through ``Ar`` and made relative to the edit
+layer again. Captures keep all their mesh files in a few folders, so the relative path of each folder is computed once
+and shared by all the files in it.
+"""
+import os
+import posixpath
+
+from pxr import Ar, Sdf
+
+
+# What the override does with the references of the captured prim, see author_reference_overrides:
+# - prepend: the replacement is prepended, the captured mesh stays but is hidden and deactivated
+# - replace: the replacement is authored as an explicit list, dropping every weaker reference
+# - delete-original: the captured references are deleted and the replacement prepended, other references are kept
+REFERENCE_PREPEND = "prepend"
+REFERENCE_REPLACE = "replace"
+REFERENCE_DELETE_ORIGINAL = "delete-original"
+REFERENCE_MODES = (REFERENCE_PREPEND, REFERENCE_REPLACE, REFERENCE_DELETE_ORIGINAL)
+
+
+class PathRelativizer:
+    """Makes absolute paths relative to the folder of a layer, with ``/`` separators.
+
+    :param layer: Layer the paths are made relative to, it must be saved on disk.
+    """
+
+    def __init__(self, layer: Sdf.Layer):
+        self.start = os.path.dirname(layer.realPath)
+        self._folders: dict = {}
+
+    def relativize(self, path: str) -> str:
+        folder, file_name = os.path.split(str(path))
+        relative_folder = self._folders.get(folder)
+        if relative_folder is None:
+            relative_folder = self._folders[folder] = os.path.relpath(folder, start=self.start).replace("\\", "/")
+        return posixpath.join(relative_folder, file_name) if relative_folder != "." else file_name
+
+
+class CaptureReferenceResolver:
+    """Returns the references of captured prims as :data:`REFERENCE_DELETE_ORIGINAL` needs them in the edit layer.
+
+    Asset paths are resolved through ``Ar`` relative to the layer authoring them, once per layer and folder.
+
+    :param relativizer: :class:`PathRelativizer` of the edit layer.
+    """
+
+    def __init__(self, relativizer: PathRelativizer):
+        self.relativizer = relativizer
+        self._folders: dict = {}
+
+    def resolve(self, layer: Sdf.Layer, asset_path: str) -> str:
+        """Return ``asset_path``, authored in ``layer``, relative to the edit layer."""
+        folder, file_name = posixpath.split(asset_path)
+        key = (layer.identifier, folder)
+        relative_folder = self._folders.get(key)
+        if relative_folder is None:
+            identifier = layer.ComputeAbsolutePath(asset_path)
+            resolved_path = str(Ar.GetResolver().Resolve(identifier)) or identifier
+            relative_folder = self._folders[key] = posixpath.dirname(self.relativizer.relativize(resolved_path))
+        return posixpath.join(relative_folder, file_name) if relative_folder else file_name
+
+    def get_original_references(self, prim_spec: Sdf.PrimSpec) -> tuple:
+        """Return the ``(asset_path, prim_path)`` of the references added by the captured ``prim_spec``, relative to
+        the edit layer. Internal references are left out."""
+        return tuple((self.resolve(prim_spec.layer, reference.assetPath), str(reference.primPath))
+                     for reference in prim_spec.referenceList.GetAddedOrExplicitItems() if reference.assetPath)
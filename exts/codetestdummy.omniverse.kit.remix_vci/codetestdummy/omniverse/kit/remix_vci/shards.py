@@ -0,0 +1,210 @@
+"""Sharded, multi-process authoring of the VCI overrides.
+
+The ``mesh_HASH`` names are partitioned by the prefix of their hash. Each shard is processed by a worker process which
+reads the captured visual corrections, inverts them and authors the reference and transform overrides of its names into
+its own ``.usdc`` layer, so the expensive part of a run scales with the number of cores. The shards are then either
+merged into the edit layer or added to it as sublayers, in shard order and with the names of a shard sorted, so the
+result does not depend on which worker finished first.
+
+Workers only see plain values (see :class:`ShardItem`): everything which needs the composed stage is resolved by the
+engine before the shards are dispatched.
+
+The in-process steps use the same sublayers for their binary output, filled up to a number of prims each instead of by
+hash prefix (see :func:`create_shard_layer`).
+"""
+import os
+import zlib
+from collections import namedtuple
+
+from pxr import UsdGeom, Sdf, Gf
+
+from .authoring import TransformOverride, author_reference_overrides, author_transform_overrides
+from .inverse import compute_inverse_transforms, to_array, to_matrices
+from .manifest import get_transform_digest
+from .transforms import read_visual_correction
+
+
+SHARD_MERGE = "merge"
+SHARD_SUBLAYERS = "sublayers"
+SHARD_OUTPUTS = (SHARD_MERGE, SHARD_SUBLAYERS)
+
+SHARD_SUFFIX = "_vci_shard_"
+
+# Work of one mesh_HASH in a shard:
+# - reference: the ReferenceOverride to author, or None
+# - capture_asset_path: the captured mesh to read the visual correction from, or None for no transform
+# - op_order: the composed xformOpOrder before the run, without the VCI op
+# - replacement_path: replacement asset whose default prim xformOpOrder takes over op_order once referenced, or None
+# - matrix: the captured matrix as 16 floats if it was cached, otherwise None
+# - digest: the recorded digest of the authored transform, an equal new one is not authored again
+ShardItem = namedtuple("ShardItem", ["name", "reference", "capture_asset_path", "op_order", "replacement_path",
+                                     "matrix", "digest"])
+
+# Outcome of a shard: the names whose reference was authored, the (digest, authored) tuple per name whose transform was
+# computed, the transforms read from captured meshes per asset path (for the transform cache) and the error per name.
+ShardResult = namedtuple("ShardResult", ["index", "path", "references", "transforms", "captured", "errors"])
+
+
+def get_shard_index(name: str, shard_count: int) -> int:
+    """Return the shard of ``name`` from the prefix of its hash, e.g. ``mesh_0123ABCD...``."""
+    mesh_hash = name.rsplit("_", 1)[-1]
+    try:
+        value = int(mesh_hash[:8], 16)
+    except ValueError:
+        value = zlib.crc32(name.encode())
+    return value % shard_count
+
+
+def get_shard_path(folder: str, edit_layer: Sdf.Layer, index: int) -> str:
+    """Return the path of shard ``index`` of ``edit_layer`` in ``folder``."""
+    stem = os.path.splitext(os.path.basename(edit_layer.realPath))[0]
+    return os.path.join(folder, f"{stem}{SHARD_SUFFIX}{index:03d}.usdc")
+
+
+def find_shard_layers(edit_layer: Sdf.Layer) -> list:
+    """Return the shard layers :func:`add_shard_sublayer` added to ``edit_layer``, in sublayer order."""
+    layers = []
+    for sublayer_path in edit_layer.subLayerPaths:
+        if SHARD_SUFFIX in os.path.basename(sublayer_path):
+            layer = Sdf.Layer.FindOrOpenRelativeToLayer(edit_layer, sublayer_path)
+            if layer:
+                layers.append(layer)
+    return layers
+
+
+def create_shard_layer(edit_layer: Sdf.Layer) -> Sdf.Layer:
+    """Create the shard layer following the last one of ``edit_layer`` next to it, and add it as a sublayer."""
+    indices = [int(os.path.splitext(os.path.basename(layer.realPath))[0].rsplit(SHARD_SUFFIX, 1)[-1])
+               for layer in find_shard_layers(edit_layer)]
+    path = get_shard_path(os.path.dirname(edit_layer.realPath), edit_layer, max(indices, default=-1) + 1)
+    # The file of a shard removed from the sublayers is reused
+    layer = Sdf.Layer.FindOrOpen(path) if os.path.exists(path) else None
+    if layer:
+        layer.Clear()
+    else:
+        layer = Sdf.Layer.CreateNew(path)
+    add_shard_sublayer(edit_layer, path)
+    return layer
+
+
+def _get_default_op_order(asset_path: str):
+    layer = Sdf.Layer.FindOrOpen(asset_path)
+    if not layer or not layer.defaultPrim:
+        return None
+    attr_spec = layer.GetAttributeAtPath(
+        Sdf.Path.absoluteRootPath.AppendChild(layer.defaultPrim).AppendProperty(UsdGeom.Tokens.xformOpOrder))
+    return list(attr_spec.default) if attr_spec and attr_spec.default is not None else None
+
+
+def write_shard(index: int, path: str, meshes_path: str, items: list, op_name: str, correction=None) -> ShardResult:
+    """Author the overrides of ``items`` into the shard layer at ``path``, created if needed, and save it.
+
+    Runs in a worker process. Captured transforms are inverted as one batch with :func:`compute_inverse_transforms`.
+    """
+    items = sorted(items, key=lambda item: item.name)
+    errors = {}
+    captured = {}
+    candidates = []
+    for item in items:
+        if item.capture_asset_path is None:
+            continue
+        matrix = Gf.Matrix4d(*item.matrix) if item.matrix is not None else None
+        if matrix is None:
+            try:
+                transform = read_visual_correction(item.capture_asset_path)
+            except Exception as e:
+                errors[item.name] = str(e)
+                continue
+            captured[item.capture_asset_path] = transform
+            matrix = transform.matrix
+        op_order = item.op_order
+        if item.replacement_path:
+            op_order = _get_default_op_order(item.replacement_path) or op_order
+        candidates.append((item, [op for op in op_order if op != op_name], matrix))
+
+    inverses, degenerate = compute_inverse_transforms(to_array([matrix for _, _, matrix in candidates]), correction)
+    transforms = {}
+    transform_overrides = []
+    for (item, op_order, _), array, inverse, is_degenerate in zip(candidates, inverses, to_matrices(inverses),
+                                                                  degenerate):
+        if is_degenerate:
+            errors[item.name] = f"Captured visual correction of mesh {item.name} is singular or degenerate"
+            continue
+        digest = get_transform_digest(array)
+        authored = digest != item.digest
+        transforms[item.name] = (digest, authored)
+        if authored:
+            transform_overrides.append(TransformOverride(item.name, op_name, op_order, inverse))
+
+    layer = Sdf.Layer.FindOrOpen(path) if os.path.exists(path) else Sdf.Layer.CreateNew(path)
+    references = [item.reference for item in items if item.reference is not None]
+    author_reference_overrides(layer, meshes_path, references)
+    author_transform_overrides(layer, meshes_path, transform_overrides)
+    layer.Save()
+    return ShardResult(index, path, [reference.name for reference in references], transforms, captured, errors)
+
+
+def _write_shard_task(args) -> ShardResult:
+    return write_shard(*args)
+
+
+def merge_prim_spec(src_spec: Sdf.PrimSpec, layer: Sdf.Layer):
+    """Merge the opinions of ``src_spec`` and its descendants into ``layer``, property by property.
+
+    Unlike ``Sdf.CopySpec``, the other opinions of an existing spec in ``layer`` (e.g. the reference of an override
+    whose transform is merged) are kept.
+    """
+    dst_spec = Sdf.CreatePrimInLayer(layer, src_spec.path)
+    if src_spec.specifier == Sdf.SpecifierDef:
+        dst_spec.specifier = Sdf.SpecifierDef
+    for key in ("active", "instanceable"):
+        if src_spec.HasInfo(key):
+            dst_spec.SetInfo(key, src_spec.GetInfo(key))
+    src_references = src_spec.referenceList
+    if src_references.isExplicit:
+        dst_spec.referenceList.explicitItems = list(src_references.explicitItems)
+    # Each proxy writes back the whole list op, so it is taken after the previous edits
+    for items_name in ("prependedItems", "deletedItems"):
+        dst_items = getattr(dst_spec.referenceList, items_name)
+        for reference in getattr(src_references, items_name):
+            if reference not in dst_items:
+                dst_items.append(reference)
+    for property_spec in src_spec.properties:
+        Sdf.CopySpec(src_spec.layer, property_spec.path, layer, property_spec.path)
+    for child_spec in src_spec.nameChildren:
+        merge_prim_spec(child_spec, layer)
+
+
+def merge_shard(edit_layer: Sdf.Layer, shard_layer: Sdf.Layer, meshes_path: str, names=None):
+    """Merge the overrides of ``shard_layer`` below ``meshes_path``, or only those of ``names``, into ``edit_layer``
+    in one change block."""
+    meshes_spec = shard_layer.GetPrimAtPath(meshes_path)
+    if not meshes_spec:
+        return
+    with Sdf.ChangeBlock():
+        for prim_spec in meshes_spec.nameChildren:
+            if names is None or prim_spec.name in names:
+                merge_prim_spec(prim_spec, edit_layer)
+
+
+def remove_overrides(layer: Sdf.Layer, meshes_path: str, names):
+    """Remove the override specs of ``names`` below ``meshes_path`` from ``layer``."""
+    meshes_spec = layer.GetPrimAtPath(meshes_path)
+    if not meshes_spec:
+        return
+    with Sdf.ChangeBlock():
+        for name in names:
+            if name in meshes_spec.nameChildren:
+                del meshes_spec.nameChildren[name]
+
+
+def add_shard_sublayer(edit_layer: Sdf.Layer, shard_path: str):
+    """Add ``shard_path`` to the sublayers of ``edit_layer``, relative to it, keeping the shards in index order."""
+    relative_path = os.path.relpath(shard_path, os.path.dirname(edit_layer.realPath)).replace("\\", "/")
+    sublayer_paths = list(edit_layer.subLayerPaths)
+    if relative_path in sublayer_paths:
+        return
+    # Shards go after the existing sublayers, sorted among themselves
+    shard_paths = sorted([path for path in sublayer_paths if SHARD_SUFFIX in os.path.basename(path)] + [relative_path])
+    other_paths = [path for path in sublayer_paths if SHARD_SUFFIX not in os.path.basename(path)]
+    edit_layer.subLayerPaths = other_paths + shard_paths
@@ -0,0 +1,128 @@
+"""Generate synthetic Remix-style projects for benchmarks.
+
+The layout mimics a Remix capture: a capture layer with ``/RootNode/meshes/mesh_HASH`` prims referencing one file per
+mesh holding a ``/visual_correction`` transform, a folder of ``E_mesh_HASH`` replacements and an edit layer which may
+already hold some overrides. Files are written as plain text so that 100k meshes can be generated in reasonable time.
+"""
+import os
+import random
+from collections import namedtuple
+
+
+SyntheticProject = namedtuple("SyntheticProject", ["root", "capture_layer_path", "edit_layer_path", "meshes_folder",
+                                                   "hashes"])
+
+# Typical visual corrections found in captures: identity, mirrored Z, Z-up to Y-up and a scaled variant
+_CORRECTIONS = [
+    "( (1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1) )",
+    "( (1, 0, 0, 0), (0, 1, 0, 0), (0, 0, -1, 0), (0, 0, 0, 1) )",
+    "( (1, 0, 0, 0), (0, 0, 1, 0), (0, -1, 0, 0), (0, 0, 0, 1) )",
+    "( (0.01, 0, 0, 0), (0, 0.01, 0, 0), (0, 0, 0.01, 0), (0, 0, 0, 1) )",
+]
+
+_CAPTURED_MESH = """#usda 1.0
+(
+    defaultPrim = "visual_correction"
+)
+
+def Xform "visual_correction"
+{{
+    matrix4d xformOp:transform = {matrix}
+    uniform token[] xformOpOrder = ["xformOp:transform"]
+
+    def Mesh "mesh"
+    {{
+        float3[] extent = [(-1, -1, -1), (1, 1, 1)]
+    }}
+}}
+"""
+
+_REPLACEMENT_MESH = """#usda 1.0
+(
+    defaultPrim = "E_mesh_{hash}"
+)
+
+def Mesh "E_mesh_{hash}"
+{{
+    float3[] extent = [(-1, -1, -1), (1, 1, 1)]
+    int[] faceVertexCounts = [3]
+    int[] faceVertexIndices = [0, 1, 2]
+    point3f[] points = [(-1, -1, -1), (1, -1, 1), (-1, 1, 1)]
+}}
+"""
+
+_CAPTURE_PRIM = """        def Xform "mesh_{hash}" (
+            prepend references = @./meshes/mesh_{hash}.usda@
+        )
+        {{
+        }}
+"""
+
+_OVERRIDE_PRIM = """        over "mesh_{hash}" (
+            prepend references = @{asset_path}@
+        )
+        {{
+            token visibility = "inherited"
+
+            over "mesh" (
+                active = false
+            )
+            {{
+                token visibility = "invisible"
+            }}
+        }}
+"""
+
+_MESHES_LAYER = """#usda 1.0
+
+{specifier} "RootNode"
+{{
+    {specifier} "meshes"
+    {{
+{prims}    }}
+}}
+"""
+
+
+def generate_project(root: str, mesh_count: int, replaced_ratio: float = 1.0, existing_ratio: float = 0.0,
+                     seed: int = 0) -> SyntheticProject:
+    """Write a synthetic project below ``root``.
+
+    :param mesh_count: Number of captured ``mesh_HASH`` prims.
+    :param replaced_ratio: Fraction of the captured meshes which have an ``E_mesh_HASH`` replacement.
+    :param existing_ratio: Fraction of the replaced meshes already overridden in the edit layer.
+    """
+    rng = random.Random(seed)
+    hashes = set()
+    while len(hashes) < mesh_count:
+        hashes.add(f"{rng.getrandbits(64):016X}")
+    hashes = sorted(hashes)
+
+    capture_dir = os.path.join(root, "capture")
+    captured_meshes_dir = os.path.join(capture_dir, "meshes")
+    meshes_folder = os.path.join(root, "replacements")
+    os.makedirs(captured_meshes_dir, exist_ok=True)
+    os.makedirs(meshes_folder, exist_ok=True)
+
+    for mesh_hash in hashes:
+        with open(os.path.join(captured_meshes_dir, f"mesh_{mesh_hash}.usda"), "w") as f:
+            f.write(_CAPTURED_MESH.format(matrix=rng.choice(_CORRECTIONS)))
+
+    replaced = hashes[:int(len(hashes) * replaced_ratio)]
+    for mesh_hash in replaced:
+        with open(os.path.join(meshes_folder, f"E_mesh_{mesh_hash}.usda"), "w") as f:
+            f.write(_REPLACEMENT_MESH.format(hash=mesh_hash))
+
+    capture_layer_path = os.path.join(capture_dir, "capture.usda")
+    with open(capture_layer_path, "w") as f:
+        prims = "".join(_CAPTURE_PRIM.format(hash=mesh_hash) for mesh_hash in hashes)
+        f.write(_MESHES_LAYER.format(specifier="def", prims=prims))
+
+    edit_layer_path = os.path.join(root, "mod.usda")
+    with open(edit_layer_path, "w") as f:
+        existing = replaced[:int(len(replaced) * existing_ratio)]
+        prims = "".join(_OVERRIDE_PRIM.format(hash=mesh_hash, asset_path=f"./replacements/E_mesh_{mesh_hash}.usda")
+                        for mesh_hash in existing)
+        f.write(_MESHES_LAYER.format(specifier="over", prims=prims) if existing else "#usda 1.0\n")
+
+    return SyntheticProject(root, capture_layer_path, edit_layer_path, meshes_folder, hashes)
@@ -1 +1,25 @@
-from .test_hello_world import *
\ No newline at end of file
+from .test_authoring import *
+from .test_benchmark import *
+from .test_cache import *
+from .test_catalog import *
+from .test_core import *
+from .test_dedupe import *
+from .test_instrumentation import *
+from .test_inverse import *
+from .test_manifest import *
+from .test_plan import *
+from .test_preflight import *
+from .test_references import *
+from .test_shards import *
+from .test_startup import *
+from .test_tracking import *
+from .test_transforms import *
+from .test_watch import *
+
+try:
+    import omni.kit.test  # noqa: F401
+except ImportError:
+    # Outside Kit only the headless engine tests can run (e.g. with pytest and usd-core).
+    pass
+else:
+    from .test_hello_world import *
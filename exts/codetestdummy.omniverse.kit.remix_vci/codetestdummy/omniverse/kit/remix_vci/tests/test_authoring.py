@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf
+
+from ..authoring import EditRecorder, ReferenceOverride, author_reference_overrides
+from ..core import CUSTOM_PROP_NAME, VciEngine, open_stage
+from .test_core import create_remix_project
+
+
+class TestAuthoring(unittest.TestCase):
+    def test_restore_undoes_and_redoes_overrides(self):
+        layer = Sdf.Layer.CreateAnonymous()
+        author_reference_overrides(layer, "/RootNode/meshes", [ReferenceOverride("mesh_A", "E_mesh_A.usda", True)])
+        before = layer.ExportToString()
+
+        recorder = EditRecorder("/RootNode/meshes", [layer])
+        recorder.record(layer, ["mesh_A", "mesh_B"])
+        author_reference_overrides(layer, "/RootNode/meshes", [ReferenceOverride("mesh_A", "E_mesh_A2.usda", False),
+                                                               ReferenceOverride("mesh_B", "E_mesh_B.usda", False)])
+        after = layer.ExportToString()
+        snapshots = recorder.take_snapshots()
+
+        recorder.restore(recorder.before)
+        self.assertEqual(layer.ExportToString(), before)
+        recorder.restore(snapshots)
+        self.assertEqual(layer.ExportToString(), after)
+
+    def test_restore_removes_created_parents(self):
+        layer = Sdf.Layer.CreateAnonymous()
+        recorder = EditRecorder("/RootNode/meshes", [layer])
+        recorder.record(layer, ["mesh_A"])
+        author_reference_overrides(layer, "/RootNode/meshes", [ReferenceOverride("mesh_A", "E_mesh_A.usda", False)])
+        self.assertTrue(recorder.has_edits())
+
+        recorder.restore(recorder.before)
+        self.assertFalse(layer.GetPrimAtPath("/RootNode"))
+
+    def test_only_touched_prims_are_copied(self):
+        layer = Sdf.Layer.CreateAnonymous()
+        author_reference_overrides(layer, "/RootNode/meshes", [ReferenceOverride(f"mesh_{index}", "E.usda", False)
+                                                               for index in range(10)])
+        recorder = EditRecorder("/RootNode/meshes", [layer])
+        recorder.record(layer, ["mesh_3"])
+        self.assertEqual(list(recorder.before[layer].GetPrimAtPath("/RootNode/meshes").nameChildren.keys()),
+                         ["mesh_3"])
+
+
+class TestEditRecorder(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "B"])
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_undo_restores_manifest_and_binary_sublayers(self):
+        engine = VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                           self.meshes_folder, binary_output=True)
+        engine.verify()
+        before = self.edit_layer.ExportToString()
+        engine.edit_recorder = recorder = EditRecorder(engine.edit_layer_path, [self.edit_layer])
+        engine.add_overrides()
+        engine.apply_vci()
+        engine.edit_recorder = None
+        shard_layer = engine.get_output_layers()[1]
+        after = self.edit_layer.ExportToString(), shard_layer.ExportToString()
+        snapshots = recorder.take_snapshots()
+
+        recorder.restore(recorder.before)
+        self.assertEqual(self.edit_layer.ExportToString(), before)
+        self.assertNotIn(CUSTOM_PROP_NAME, self.edit_layer.customLayerData)
+        self.assertFalse(shard_layer.GetPrimAtPath("/RootNode/meshes/mesh_A"))
+        # The manifest is read again, undone overrides are planned again
+        engine.reverify(["mesh_A", "mesh_B"])
+        self.assertEqual(len(engine.manifest), 0)
+
+        recorder.restore(snapshots)
+        self.assertEqual((self.edit_layer.ExportToString(), shard_layer.ExportToString()), after)
+
+
+if __name__ == "__main__":
+    unittest.main()
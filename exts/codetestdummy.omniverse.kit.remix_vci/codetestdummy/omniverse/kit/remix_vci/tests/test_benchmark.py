@@ -0,0 +1,29 @@
+import shutil
+import tempfile
+import unittest
+
+from ..benchmark import PHASES, format_result, run_benchmark
+from ..synthetic import generate_project
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_generate_project(self):
+        project = generate_project(self._tmp_dir, 10, replaced_ratio=0.5)
+        self.assertEqual(len(project.hashes), 10)
+        self.assertEqual(project, generate_project(self._tmp_dir, 10, replaced_ratio=0.5))
+
+    def test_run_benchmark(self):
+        project = generate_project(self._tmp_dir, 20, replaced_ratio=0.5, existing_ratio=0.2)
+        result = run_benchmark(project)
+
+        self.assertEqual(result["meshes"], 20)
+        self.assertEqual(result["overrides"], 8)
+        self.assertEqual(result["transforms"], 10)
+        self.assertEqual(set(result["phases"]), set(PHASES))
+        self.assertIn("20 meshes", format_result(result))
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Gf
+
+from ..cache import TransformCache, open_transform_cache
+from ..transforms import CapturedTransform, extract_transforms
+
+
+class TestTransformCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.asset_path = os.path.join(self._tmp_dir, "mesh_A.usda")
+        with open(self.asset_path, "w") as f:
+            f.write("#usda 1.0\n")
+        self.transform = CapturedTransform("transform", "double", "", Gf.Matrix4d(1.0).SetTranslate(Gf.Vec3d(1, 2, 3)))
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_round_trip_is_persistent(self):
+        cache_path = os.path.join(self._tmp_dir, "cache.sqlite")
+        with TransformCache(cache_path) as cache:
+            cache.put_many({self.asset_path: self.transform})
+
+        with TransformCache(cache_path) as cache:
+            self.assertEqual(cache.get_many([self.asset_path]), {self.asset_path: self.transform})
+            self.assertEqual(cache.hits, 1)
+
+    def test_unwritable_cache_is_skipped(self):
+        with self.assertLogs("codetestdummy.omniverse.kit.remix_vci", "WARNING"):
+            self.assertIsNone(open_transform_cache(os.path.join(self._tmp_dir, "missing", "cache.sqlite")))
+
+    def test_changed_asset_is_invalidated(self):
+        with TransformCache(":memory:") as cache:
+            cache.put_many({self.asset_path: self.transform})
+            with open(self.asset_path, "a") as f:
+                f.write("# changed\n")
+
+            self.assertEqual(cache.get_many([self.asset_path]), {})
+            self.assertEqual(cache.misses, 1)
+
+    def test_size_bound(self):
+        with TransformCache(":memory:", max_entries=2) as cache:
+            for name in ["a", "b", "c"]:
+                path = os.path.join(self._tmp_dir, name)
+                open(path, "w").close()
+                cache.put_many({path: self.transform})
+            self.assertEqual(len(cache), 2)
+
+    def test_extract_transforms_uses_cache(self):
+        with TransformCache(":memory:") as cache:
+            cache.put_many({self.asset_path: self.transform})
+            # The asset is not valid USD, so it can only come from the cache
+            transforms, errors = extract_transforms({"mesh_A": self.asset_path}, cache=cache)
+
+        self.assertEqual(transforms, {"mesh_A": self.transform})
+        self.assertEqual(errors, {})
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf
+
+from ..catalog import AssetCatalog, get_child_names
+
+
+class TestAssetCatalog(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        for name in ["E_mesh_A.usda", "E_mesh_B.usd", "mesh_C.usda", "E_notamesh.usda"]:
+            open(os.path.join(self._tmp_dir, name), "w").close()
+        os.makedirs(os.path.join(self._tmp_dir, "E_mesh_D.usda"))
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_scan_indexes_replacements_by_mesh_name(self):
+        catalog = AssetCatalog(self._tmp_dir, "E_")
+        self.assertFalse(catalog.scanned)
+        catalog.ensure_scanned()
+
+        self.assertEqual(catalog.names(), {"mesh_A", "mesh_B"})
+        self.assertEqual(catalog.get("mesh_B").name, "E_mesh_B.usd")
+        self.assertIsNone(catalog.get("mesh_C"))
+        self.assertIn("mesh_A", catalog)
+
+    def test_ensure_scanned_does_not_rescan(self):
+        catalog = AssetCatalog(self._tmp_dir, "E_")
+        catalog.scan()
+        open(os.path.join(self._tmp_dir, "E_mesh_E.usda"), "w").close()
+
+        catalog.ensure_scanned()
+        self.assertNotIn("mesh_E", catalog)
+        catalog.scan()
+        self.assertIn("mesh_E", catalog)
+
+    def test_get_child_names(self):
+        layer = Sdf.Layer.CreateAnonymous()
+        Sdf.CreatePrimInLayer(layer, "/RootNode/meshes/mesh_A")
+        self.assertEqual(get_child_names(layer, "/RootNode/meshes"), {"mesh_A"})
+        self.assertEqual(get_child_names(layer, "/RootNode/missing"), set())
@@ -0,0 +1,173 @@
+# NOTE:
+#   These tests only need ``pxr`` so they run both under omni.kit.test and with pytest and plain usd-core.
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Usd, UsdGeom, Sdf, Gf
+
+from ..core import CUSTOM_PROP_NAME, VCI_NAME, Progress, VciEngine, VciError, find_capture_layers, open_stage
+
+
+def create_remix_project(root: str, hashes, replaced_hashes):
+    """Write a minimal Remix-style capture, edit layer and replacement folder under ``root``."""
+    os.makedirs(os.path.join(root, "meshes"))
+    os.makedirs(os.path.join(root, "replacements"))
+
+    capture_layer = Sdf.Layer.CreateNew(os.path.join(root, "capture.usda"))
+    capture_stage = Usd.Stage.Open(capture_layer)
+    for mesh_hash in hashes:
+        mesh_layer = Sdf.Layer.CreateNew(os.path.join(root, "meshes", f"mesh_{mesh_hash}.usda"))
+        mesh_stage = Usd.Stage.Open(mesh_layer)
+        correction = UsdGeom.Xform.Define(mesh_stage, "/visual_correction")
+        correction.AddTransformOp().Set(Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1.0, 1.0, -1.0)))
+        UsdGeom.Mesh.Define(mesh_stage, "/visual_correction/mesh")
+        mesh_stage.SetDefaultPrim(correction.GetPrim())
+        mesh_layer.Save()
+
+        prim = capture_stage.DefinePrim(f"/RootNode/meshes/mesh_{mesh_hash}", "Xform")
+        prim.GetReferences().AddReference(f"./meshes/mesh_{mesh_hash}.usda")
+    capture_layer.Save()
+
+    for mesh_hash in replaced_hashes:
+        replacement_layer = Sdf.Layer.CreateNew(os.path.join(root, "replacements", f"E_mesh_{mesh_hash}.usda"))
+        replacement_stage = Usd.Stage.Open(replacement_layer)
+        mesh = UsdGeom.Mesh.Define(replacement_stage, f"/E_mesh_{mesh_hash}")
+        mesh.CreateExtentAttr([(-1, -1, -1), (1, 1, 1)])
+        replacement_stage.SetDefaultPrim(mesh.GetPrim())
+        replacement_layer.Save()
+
+    edit_layer = Sdf.Layer.CreateNew(os.path.join(root, "mod.usda"))
+    edit_layer.Save()
+
+    return capture_layer, edit_layer, os.path.join(root, "replacements")
+
+
+class TestVciEngine(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "B"])
+        self.engine = VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                                self.meshes_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_verify_reports_counts(self):
+        report = self.engine.verify()
+        self.assertIn("Found 3 meshes in capture layer.", report)
+        self.assertIn("Found 2 replacement assets.", report)
+        self.assertIn("Found 3 meshes on the stage.", report)
+        self.assertIn("2 meshes can be overridden.", report)
+
+    def test_verify_rejects_capture_as_edit_layer(self):
+        self.engine.edit_layer = self.capture_layer
+        with self.assertRaises(VciError):
+            self.engine.verify()
+
+    def test_verify_rejects_missing_meshes_folder(self):
+        self.engine.meshes_folder = self.engine.catalog.meshes_folder = os.path.join(self._tmp_dir, "missing")
+        with self.assertRaises(VciError):
+            self.engine.verify()
+
+    def test_add_overrides(self):
+        self.assertEqual(self.engine.add_overrides(), 2)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertEqual(prim_spec.referenceList.prependedItems[0].assetPath, "replacements/E_mesh_A.usda")
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A/mesh").active)
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_C"))
+
+        # Existing overrides are left alone
+        self.assertEqual(self.engine.add_overrides(), 0)
+
+    def test_apply_vci_requires_overrides(self):
+        with self.assertRaises(VciError):
+            self.engine.apply_vci()
+
+    def test_apply_vci(self):
+        self.engine.add_overrides()
+        self.assertEqual(self.engine.apply_vci(), 2)
+
+        attr_spec = self.edit_layer.GetAttributeAtPath(f"/RootNode/meshes/mesh_A.xformOp:transform:{VCI_NAME}")
+        self.assertEqual(attr_spec.default, Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1.0, 1.0, -1.0)).GetInverse())
+
+        # Transforms are only applied once
+        self.assertEqual(self.engine.apply_vci(), 0)
+
+    def test_iter_add_overrides_can_be_cancelled(self):
+        self.engine.chunk_size = 1
+        steps = self.engine.iter_add_overrides()
+        self.assertEqual(next(steps), Progress("overrides", 1, 2))
+        steps.close()
+
+        # The first override is complete and the next run only authors the remaining one
+        self.assertEqual(len(self.edit_layer.GetPrimAtPath("/RootNode/meshes").nameChildren), 1)
+        self.assertEqual(self.engine.add_overrides(), 1)
+
+    def test_iter_apply_vci_reports_progress(self):
+        self.engine.add_overrides()
+        self.engine.chunk_size = 1
+        steps = self.engine.iter_apply_vci()
+        self.assertEqual([progress.done for progress in steps], [1, 2])
+
+    def test_sdf_authoring_matches_usd_api(self):
+        self.engine.add_overrides()
+        self.engine.apply_vci()
+
+        # Author the same edits one prim at a time through the Usd API on a second copy of the project
+        expected_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, expected_dir)
+        capture_layer, edit_layer, _ = create_remix_project(expected_dir, ["A", "B", "C"], ["A", "B"])
+        stage = open_stage(capture_layer, edit_layer)
+        stage.SetEditTarget(edit_layer)
+        for name in ["mesh_A", "mesh_B"]:
+            prim = stage.GetPrimAtPath(f"/RootNode/meshes/{name}")
+            prim.GetReferences().AddReference(Sdf.Reference(f"replacements/E_{name}.usda"))
+            UsdGeom.Imageable(prim).CreateVisibilityAttr().Set("inherited")
+            child_prim = prim.GetChild("mesh")
+            child_prim.SetActive(False)
+            UsdGeom.Imageable(child_prim).CreateVisibilityAttr().Set("invisible")
+        for name in ["mesh_A", "mesh_B"]:
+            xformable = UsdGeom.Xformable(stage.GetPrimAtPath(f"/RootNode/meshes/{name}"))
+            # The captured mirror is its own inverse
+            xformable.AddXformOp(UsdGeom.XformOp.TypeTransform, opSuffix=VCI_NAME).Set(
+                Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1.0, 1.0, -1.0)))
+        # The manifest is the only layer metadata the engine authors
+        self.assertIn(CUSTOM_PROP_NAME, self.edit_layer.customLayerData)
+        edit_layer.customLayerData = self.edit_layer.customLayerData
+
+        self.assertEqual(self.edit_layer.ExportToString(), edit_layer.ExportToString())
+
+
+class TestVciEngineMultiCapture(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        first_capture, self.edit_layer, self.meshes_folder = create_remix_project(
+            os.path.join(self._tmp_dir, "first"), ["A", "B"], ["A", "B", "C"])
+        second_capture, _, _ = create_remix_project(os.path.join(self._tmp_dir, "second"), ["B", "C"], [])
+        self.capture_layers = [first_capture, second_capture]
+        self.engine = VciEngine(open_stage(self.capture_layers, self.edit_layer), self.capture_layers,
+                                self.edit_layer, self.meshes_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_verify_merges_captures(self):
+        report = self.engine.verify()
+        self.assertIn("Found 3 meshes in 2 capture layers (1 duplicates ignored).", report)
+        self.assertIn("3 meshes can be overridden.", report)
+
+    def test_single_pass_over_all_captures(self):
+        self.assertEqual(self.engine.add_overrides(), 3)
+        self.assertEqual(self.engine.apply_vci(), 3)
+
+        # mesh_B is captured by both layers, the first one wins
+        self.assertIs(self.engine.capture_index.get_layer("mesh_B"), self.capture_layers[0])
+        self.assertIs(self.engine.capture_index.get_layer("mesh_C"), self.capture_layers[1])
+
+    def test_find_capture_layers(self):
+        stage = open_stage(self.capture_layers, self.edit_layer)
+        self.assertEqual(find_capture_layers(stage, self.edit_layer), self.capture_layers)
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..authoring import INSTANCE_NAME
+from ..core import VciEngine, open_stage
+from ..dedupe import ContentIndex
+from ..plan import ADD_REFERENCE
+from .test_core import create_remix_project
+
+
+class TestContentIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self._tmp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_duplicates_share_smallest_path(self):
+        asset_paths = {
+            "mesh_A": self._write("E_mesh_A.usda", "same"),
+            "mesh_B": self._write("E_mesh_B.usda", "same"),
+            "mesh_C": self._write("E_mesh_C.usda", "diff"),
+            "mesh_D": self._write("E_mesh_D.usda", "other size"),
+        }
+        index = ContentIndex()
+        self.assertEqual(index.build(asset_paths), {"mesh_B"})
+        self.assertEqual(index.get("mesh_B"), asset_paths["mesh_A"])
+        self.assertIsNone(index.get("mesh_A"))
+        self.assertIsNone(index.get("mesh_C"))
+        self.assertEqual(index.count_canonical(), 1)
+
+        # The canonical asset changed, its duplicate now stands alone
+        self._write("E_mesh_A.usda", "changed")
+        self.assertEqual(index.build(asset_paths), {"mesh_B"})
+        self.assertEqual(index.canonical_paths, {})
+
+
+class TestEngineDedupe(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "C"])
+        shutil.copy(os.path.join(self.meshes_folder, "E_mesh_A.usda"),
+                    os.path.join(self.meshes_folder, "E_mesh_B.usda"))
+        self.stage = open_stage(self.capture_layer, self.edit_layer)
+        self.engine = VciEngine(self.stage, self.capture_layer, self.edit_layer, self.meshes_folder,
+                                deduplicate=True)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_duplicates_are_instances_of_one_asset(self):
+        report = self.engine.verify()
+        self.assertIn("Found 1 duplicate replacement assets, referenced as instances of 1 assets.", report)
+        self.assertEqual(self.engine.plan.entries["mesh_B"].asset_path, "replacements/E_mesh_A.usda")
+        self.assertEqual(self.engine.add_overrides(), 3)
+        self.assertEqual(self.engine.apply_vci(), 3)
+
+        instance_spec = self.edit_layer.GetPrimAtPath(f"/RootNode/meshes/mesh_B/{INSTANCE_NAME}")
+        self.assertTrue(instance_spec.instanceable)
+        self.assertEqual(instance_spec.referenceList.prependedItems[0].assetPath, "replacements/E_mesh_A.usda")
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_B").referenceList.prependedItems)
+
+        # mesh_A and mesh_B share a prototype, mesh_C has its own
+        self.assertEqual(len(self.stage.GetPrototypes()), 2)
+        self.assertEqual(self.stage.GetPrimAtPath(f"/RootNode/meshes/mesh_A/{INSTANCE_NAME}").GetPrototype(),
+                         self.stage.GetPrimAtPath(f"/RootNode/meshes/mesh_B/{INSTANCE_NAME}").GetPrototype())
+
+    def test_deleting_canonical_repoints_duplicates(self):
+        self.engine.verify()
+        self.engine.add_overrides()
+        self.engine.apply_vci()
+
+        os.remove(os.path.join(self.meshes_folder, "E_mesh_A.usda"))
+        self.engine.sync_assets(["E_mesh_A.usda"])
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A"))
+        instance_spec = self.edit_layer.GetPrimAtPath(f"/RootNode/meshes/mesh_B/{INSTANCE_NAME}")
+        self.assertEqual([reference.assetPath for reference in instance_spec.referenceList.prependedItems],
+                         ["replacements/E_mesh_B.usda"])
+        self.assertFalse(self.engine.plan.get_entries(ADD_REFERENCE))
+
+    def test_switching_mode_applies_again(self):
+        self.engine.add_overrides()
+        self.engine.apply_vci()
+
+        engine = VciEngine(self.stage, self.capture_layer, self.edit_layer, self.meshes_folder)
+        engine.verify()
+        self.assertEqual(len(engine.plan.get_entries(ADD_REFERENCE)), 3)
+        self.assertEqual(engine.add_overrides(), 3)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_B")
+        self.assertNotIn(INSTANCE_NAME, prim_spec.nameChildren)
+        self.assertEqual([reference.assetPath for reference in prim_spec.referenceList.prependedItems],
+                         ["replacements/E_mesh_B.usda"])
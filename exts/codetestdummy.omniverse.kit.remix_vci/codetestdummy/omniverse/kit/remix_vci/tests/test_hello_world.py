@@ -1,48 +1,63 @@
 # NOTE:
 #   omni.kit.test - std python's unittest module with additional wrapping to add suport for async/await tests
 #   For most things refer to unittest docs: https://docs.python.org/3/library/unittest.html
+import sys
+import time
+
+import omni.kit.app
 import omni.kit.test
+import omni.usd
 
 # Extnsion for writing UI tests (simulate UI interaction)
 import omni.kit.ui_test as ui_test
 
-# Import extension python module we are testing with absolute import path, as if we are external user (other extension)
-import codetestdummy.omniverse.kit.remix_vci
+from ..extension import MENU_NAME, MENU_PATH
+from .test_startup import DEFERRED_MODULES
+
+_EXTENSION_NAME = "codetestdummy.omniverse.kit.remix_vci"
+
+# Seconds enabling the extension may take, with its modules imported anew
+STARTUP_BUDGET_SECONDS = 0.1
 
 
 # Having a test class dervived from omni.kit.test.AsyncTestCase declared on the root of module will make it auto-discoverable by omni.kit.test
 class Test(omni.kit.test.AsyncTestCase):
     # Before running each test
     async def setUp(self):
-        pass
+        await omni.usd.get_context().new_stage_async()
+        # The window is only built when opened from its menu entry
+        await ui_test.menu_click(f"{MENU_PATH}/{MENU_NAME}")
 
     # After running each test
     async def tearDown(self):
         pass
 
-    # Actual test, notice it is "async" function, so "await" can be used if needed
-    @omni.kit.test.omni_test_registry(guid="f898a949-bacc-41f5-be56-b4eb8923f54e")
-    async def test_hello_public_function(self):
-        result = codetestdummy.omniverse.kit.remix_vci.some_public_function(4)
-        self.assertEqual(result, 256)
-
-
     @omni.kit.test.omni_test_registry(guid="4626d574-659f-4a85-8958-9fa8588fbce3")
-    async def test_window_button(self):
-
-        # Find a label in our window
-        label = ui_test.find("My Window//Frame/**/Label[*]")
-
-        # Find buttons in our window
-        add_button = ui_test.find("My Window//Frame/**/Button[*].text=='Add'")
-        reset_button = ui_test.find("My Window//Frame/**/Button[*].text=='Reset'")
-
-        # Click reset button
-        await reset_button.click()
-        self.assertEqual(label.widget.text, "empty")
-
-        await add_button.click()
-        self.assertEqual(label.widget.text, "count: 1")
-
-        await add_button.click()
-        self.assertEqual(label.widget.text, "count: 2")
+    async def test_verify_button_reports_error(self):
+        # Find the Verify button in our window
+        verify_button = ui_test.find("VCI for Remix//Frame/**/Button[*].text=='Verify'")
+
+        # A new stage has no capture layer, Verify must report it instead of raising
+        await verify_button.click()
+        await ui_test.human_delay(10)
+        labels = [label.widget.text for label in ui_test.find_all("VCI for Remix//Frame/**/Label[*]")]
+        self.assertTrue(any(text.startswith("Error: ") for text in labels), labels)
+
+    @omni.kit.test.omni_test_registry(guid="0816c031-8243-48ab-ac23-37dfc741122e")
+    async def test_enable_within_startup_budget(self):
+        manager = omni.kit.app.get_app().get_extension_manager()
+        manager.set_extension_enabled_immediate(_EXTENSION_NAME, False)
+        # Kit itself has loaded pxr and omni.ui, only the modules of the extension (but these tests) start cold
+        for name in list(sys.modules):
+            if (name == _EXTENSION_NAME or name.startswith(f"{_EXTENSION_NAME}.")) \
+                    and not name.startswith(f"{_EXTENSION_NAME}.tests"):
+                del sys.modules[name]
+        start = time.perf_counter()
+        manager.set_extension_enabled_immediate(_EXTENSION_NAME, True)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS)
+        loaded = [name for name in DEFERRED_MODULES if name.startswith(_EXTENSION_NAME) and name in sys.modules]
+        self.assertEqual(loaded, [])
+        # Enabling does not build the window
+        self.assertIsNone(ui_test.find("VCI for Remix//Frame/**/Button[*].text=='Verify'"))
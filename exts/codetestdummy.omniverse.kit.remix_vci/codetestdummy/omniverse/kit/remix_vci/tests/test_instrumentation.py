@@ -0,0 +1,57 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..core import VciEngine, open_stage
+from ..instrumentation import (AUTHOR_SPECS, FAILED, INDEX_CAPTURE, INVERT_TRANSFORMS, OPEN_ASSETS, PROCESSED,
+                               SCAN_FOLDER, SKIPPED, VALIDATE_ASSETS, Instrumentation)
+from .test_core import create_remix_project
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_span_and_trace(self):
+        instrumentation = Instrumentation()
+        with instrumentation.span(SCAN_FOLDER, files=2):
+            pass
+        with instrumentation.span(SCAN_FOLDER):
+            pass
+        instrumentation.count(FAILED)
+
+        self.assertEqual(instrumentation.to_dict()["spans"][SCAN_FOLDER]["calls"], 2)
+        self.assertIn("1 failed", instrumentation.summary())
+
+        trace_path = os.path.join(self._tmp_dir, "trace.json")
+        instrumentation.write_trace(trace_path)
+        with open(trace_path) as f:
+            trace = json.load(f)
+        self.assertEqual([event["name"] for event in trace["traceEvents"]], [SCAN_FOLDER, SCAN_FOLDER])
+        self.assertEqual(trace["traceEvents"][0]["args"], {"files": 2})
+
+    def test_engine_records_phases(self):
+        capture_layer, edit_layer, meshes_folder = create_remix_project(self._tmp_dir, ["A", "B"], ["A", "B"])
+        engine = VciEngine(open_stage(capture_layer, edit_layer), capture_layer, edit_layer, meshes_folder)
+        engine.verify()
+        engine.add_overrides()
+        engine.apply_vci()
+
+        self.assertEqual(set(engine.instrumentation.span_seconds),
+                         {SCAN_FOLDER, VALIDATE_ASSETS, INDEX_CAPTURE, OPEN_ASSETS, INVERT_TRANSFORMS, AUTHOR_SPECS})
+        self.assertEqual(engine.instrumentation.counters, {PROCESSED: 4, SKIPPED: 0, FAILED: 0})
+
+        # A second run only skips
+        engine = VciEngine(open_stage(capture_layer, edit_layer), capture_layer, edit_layer, meshes_folder)
+        engine.verify()
+        engine.apply_vci()
+        self.assertEqual(engine.instrumentation.counters, {PROCESSED: 0, SKIPPED: 2, FAILED: 0})
+
+        # Re-verifying counts the re-planned prims only
+        engine.reverify(["mesh_A"])
+        self.assertEqual(engine.instrumentation.counters, {PROCESSED: 0, SKIPPED: 3, FAILED: 0})
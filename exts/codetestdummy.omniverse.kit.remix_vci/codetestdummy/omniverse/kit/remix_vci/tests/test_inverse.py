@@ -0,0 +1,52 @@
+import math
+import unittest
+
+import numpy as np
+
+from pxr import Gf
+
+from ..inverse import build_axis_correction, compute_inverse_transforms, find_degenerate, to_array, to_matrices
+
+
+def _make_transform(scale: float, angle: float, translation) -> Gf.Matrix4d:
+    return (Gf.Matrix4d(1.0).SetScale(scale) * Gf.Matrix4d(1.0).SetRotate(Gf.Rotation(Gf.Vec3d(0, 1, 0), angle))
+            * Gf.Matrix4d(1.0).SetTranslate(Gf.Vec3d(*translation)))
+
+
+class TestInverse(unittest.TestCase):
+    def test_inverses_match_gf(self):
+        matrices = [_make_transform(0.01, 30.0, (1, 2, 3)), _make_transform(2.0, -90.0, (0, 0, -5)), Gf.Matrix4d(1.0)]
+        inverses, degenerate = compute_inverse_transforms(to_array(matrices))
+
+        self.assertFalse(degenerate.any())
+        for matrix, inverse in zip(matrices, to_matrices(inverses)):
+            self.assertTrue(Gf.IsClose(inverse, matrix.GetInverse(), 1e-9))
+
+    def test_degenerate_matrices_are_flagged(self):
+        matrices = to_array([Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1, 0, 1)), Gf.Matrix4d(1.0), Gf.Matrix4d(1.0),
+                             Gf.Matrix4d(1.0)])
+        # Projective and not finite
+        matrices[1, 0, 3] = 1.0
+        matrices[2, 1, 1] = math.nan
+
+        self.assertEqual(find_degenerate(matrices).tolist(), [True, True, True, False])
+        inverses, _ = compute_inverse_transforms(matrices)
+        np.testing.assert_array_equal(inverses[0], np.identity(4))
+
+    def test_axis_correction(self):
+        self.assertIsNone(build_axis_correction())
+        with self.assertRaises(ValueError):
+            build_axis_correction("w")
+
+        # Mirror X, then turn +Y into +Z
+        correction = build_axis_correction("x", "y_to_z")
+        np.testing.assert_array_equal(np.array([1, 1, 0, 1]) @ correction, [-1, 0, 1, 1])
+
+        inverses, _ = compute_inverse_transforms(to_array([_make_transform(1.0, 0.0, (1, 2, 3))]), correction)
+        np.testing.assert_allclose(inverses[0],
+                                   correction @ np.linalg.inv(np.asarray(_make_transform(1.0, 0.0, (1, 2, 3)))))
+
+    def test_empty_batch(self):
+        inverses, degenerate = compute_inverse_transforms(to_array([]))
+        self.assertEqual(inverses.shape, (0, 4, 4))
+        self.assertEqual(to_matrices(inverses), [])
@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf, Gf
+
+from ..core import CUSTOM_PROP_NAME, VciEngine, build_axis_correction, open_stage
+from ..manifest import VciManifest, get_fingerprint, get_transform_digest
+from ..plan import ADD_REFERENCE, ADD_TRANSFORM, SKIP_EXISTING
+from .test_core import create_remix_project
+
+
+def touch(path: str):
+    """Move the modification time of ``path`` forward so its fingerprint changes even on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestVciManifest(unittest.TestCase):
+    def test_round_trip(self):
+        layer = Sdf.Layer.CreateAnonymous("mod.usda")
+        manifest = VciManifest(layer, CUSTOM_PROP_NAME)
+        manifest.record_reference("mesh_A", "replacements/E_mesh_A.usda", "12:34")
+        manifest.record_transform("mesh_A", "56:78", get_transform_digest(Gf.Matrix4d(1.0)))
+        manifest.record_reference("mesh_B", "replacements/E_mesh_B.usda", "90:12")
+        manifest.remove(["mesh_B"])
+        manifest.save()
+
+        manifest = VciManifest(layer, CUSTOM_PROP_NAME)
+        self.assertEqual(len(manifest), 1)
+        entry = manifest.get("mesh_A")
+        self.assertEqual(entry.asset_path, "replacements/E_mesh_A.usda")
+        self.assertEqual(entry.fingerprint, "12:34")
+        self.assertEqual(entry.capture_fingerprint, "56:78")
+        self.assertEqual(entry.digest, get_transform_digest(Gf.Matrix4d(1.0)))
+
+    def test_fingerprint_of_missing_file(self):
+        self.assertEqual(get_fingerprint(os.path.join(tempfile.gettempdir(), "missing_remix_vci_file.usda")), "")
+
+
+class TestEngineManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B"], ["A", "B"])
+        self.engine = self.create_engine()
+        self.engine.add_overrides()
+        self.engine.apply_vci()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def create_engine(self, **kwargs):
+        return VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                         self.meshes_folder, **kwargs)
+
+    def test_records_applied_prims(self):
+        manifest = VciManifest(self.edit_layer, CUSTOM_PROP_NAME)
+        entry = manifest.get("mesh_A")
+        self.assertEqual(entry.asset_path, "replacements/E_mesh_A.usda")
+        self.assertEqual(entry.fingerprint, get_fingerprint(os.path.join(self.meshes_folder, "E_mesh_A.usda")))
+        self.assertEqual(entry.capture_fingerprint,
+                         get_fingerprint(os.path.join(self._tmp_dir, "meshes", "mesh_A.usda")))
+        self.assertTrue(entry.digest)
+
+    def test_unchanged_prims_are_skipped(self):
+        engine = self.create_engine()
+        report = engine.verify()
+        self.assertNotIn("out of date", report)
+        self.assertEqual(engine.plan.counts()[SKIP_EXISTING], 2)
+
+    def test_changed_capture_is_applied_again(self):
+        mesh_path = os.path.join(self._tmp_dir, "meshes", "mesh_A.usda")
+        mesh_layer = Sdf.Layer.FindOrOpen(mesh_path)
+        op_spec = mesh_layer.GetPrimAtPath("/visual_correction").attributes["xformOp:transform"]
+        op_spec.default = Gf.Matrix4d(2.0, 0, 0, 0, 0, 2.0, 0, 0, 0, 0, 2.0, 0, 0, 0, 0, 1.0)
+        mesh_layer.Save()
+        touch(mesh_path)
+
+        engine = self.create_engine()
+        self.assertIn("1 overrides are out of date", engine.verify())
+        self.assertEqual(engine.plan.get_entries(ADD_TRANSFORM)[0].name, "mesh_A")
+        self.assertEqual(engine.apply_vci(), 1)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertEqual(prim_spec.attributes[engine.xformop_name].default,
+                         Gf.Matrix4d(0.5, 0, 0, 0, 0, 0.5, 0, 0, 0, 0, 0.5, 0, 0, 0, 0, 1.0))
+        # The op is replaced in place rather than appended a second time
+        self.assertEqual(list(prim_spec.attributes["xformOpOrder"].default),
+                         ["xformOp:transform", engine.xformop_name])
+        self.assertEqual(self.create_engine().verify().count("out of date"), 0)
+
+    def test_touched_capture_keeps_transform(self):
+        touch(os.path.join(self._tmp_dir, "meshes", "mesh_A.usda"))
+
+        engine = self.create_engine()
+        engine.verify()
+        # The new inverse has the recorded digest, so nothing is authored
+        self.assertEqual(engine.apply_vci(), 0)
+        self.assertEqual(engine.plan.counts()[ADD_TRANSFORM], 0)
+
+    def test_changed_replacement_is_referenced_again(self):
+        os.rename(os.path.join(self.meshes_folder, "E_mesh_B.usda"), os.path.join(self.meshes_folder, "E_mesh_B.usd"))
+
+        engine = self.create_engine()
+        engine.verify()
+        self.assertEqual([entry.name for entry in engine.plan.get_entries(ADD_REFERENCE)], ["mesh_B"])
+        self.assertEqual(engine.add_overrides(), 1)
+        self.assertEqual(engine.apply_vci(), 1)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_B")
+        self.assertEqual([reference.assetPath for reference in prim_spec.referenceList.prependedItems],
+                         ["replacements/E_mesh_B.usd"])
+        self.assertEqual(list(prim_spec.attributes["xformOpOrder"].default),
+                         ["xformOp:transform", engine.xformop_name])
+
+    def test_stale_override_keeps_its_place(self):
+        touch(os.path.join(self.meshes_folder, "E_mesh_A.usda"))
+
+        engine = self.create_engine()
+        self.assertIn("1 overrides are out of date", engine.verify())
+        self.assertEqual(engine.add_overrides(), 1)
+        engine.apply_vci()
+        self.assertEqual(list(self.edit_layer.GetPrimAtPath("/RootNode/meshes").nameChildren.keys()),
+                         ["mesh_A", "mesh_B"])
+
+    def test_changed_axis_correction_is_applied_again(self):
+        engine = self.create_engine(axis_correction=build_axis_correction("x"))
+        self.assertIn("2 overrides are out of date", engine.verify())
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..core import VciEngine, open_stage
+from ..plan import ADD_REFERENCE, ADD_TRANSFORM, MISSING_CAPTURE, SKIP_EXISTING, ExecutionPlan
+from .test_core import create_remix_project
+
+
+class TestExecutionPlan(unittest.TestCase):
+    def test_complete(self):
+        plan = ExecutionPlan()
+        plan.add("mesh_A", ADD_REFERENCE, asset_path="E_mesh_A.usda")
+        plan.add("mesh_A", ADD_TRANSFORM, capture_asset_path="/capture/meshes/mesh_A.usda")
+
+        plan.complete("mesh_A", ADD_REFERENCE)
+        self.assertEqual(plan.entries["mesh_A"].actions, [ADD_TRANSFORM])
+        plan.complete("mesh_A", ADD_TRANSFORM)
+        self.assertEqual(plan.entries["mesh_A"].actions, [SKIP_EXISTING])
+
+    def test_format_diff_limit(self):
+        plan = ExecutionPlan()
+        for name in ["mesh_A", "mesh_B", "mesh_C"]:
+            plan.add(name, MISSING_CAPTURE)
+        self.assertEqual(plan.format_diff(limit=2).splitlines()[-1], "... 1 more")
+
+
+class TestVerifyPlan(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        capture_layer, self.edit_layer, meshes_folder = create_remix_project(self._tmp_dir, ["A", "B"], ["A", "D"])
+        self.engine = VciEngine(open_stage(capture_layer, self.edit_layer), capture_layer, self.edit_layer,
+                                meshes_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_verify_builds_plan(self):
+        self.engine.verify()
+        counts = self.engine.plan.counts()
+        self.assertEqual(counts[ADD_REFERENCE], 1)
+        self.assertEqual(counts[ADD_TRANSFORM], 1)
+        self.assertEqual(counts[MISSING_CAPTURE], 1)
+        self.assertEqual(self.engine.plan.entries["mesh_A"].asset_path, "replacements/E_mesh_A.usda")
+
+    def test_apply_steps_execute_plan(self):
+        self.engine.verify()
+        self.assertEqual(self.engine.add_overrides(), 1)
+        self.assertEqual(self.engine.apply_vci(), 1)
+        self.assertEqual(self.engine.plan.counts()[SKIP_EXISTING], 1)
+
+        # A new verify sees the authored overrides as already processed
+        self.engine.verify()
+        self.assertEqual(self.engine.plan.entries["mesh_A"].actions, [SKIP_EXISTING])
+
+    def test_write_json(self):
+        self.engine.verify()
+        plan_path = os.path.join(self._tmp_dir, "plan.json")
+        self.engine.plan.write_json(plan_path)
+        with open(plan_path) as f:
+            data = json.load(f)
+        self.assertEqual(data["entries"]["mesh_D"]["actions"], [MISSING_CAPTURE])
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Usd, UsdGeom, Sdf
+
+from ..cache import TransformCache
+from ..core import Progress, VciEngine, open_stage
+from ..plan import ADD_REFERENCE, INVALID_ASSET
+from ..preflight import validate_replacement, validate_replacements
+from .test_core import create_remix_project
+
+
+class TestValidateReplacement(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _create_asset(self, name: str, extent=((-1, -1, -1), (1, 1, 1)), default_prim: bool = True):
+        path = os.path.join(self._tmp_dir, name)
+        stage = Usd.Stage.CreateNew(path)
+        root = UsdGeom.Xform.Define(stage, "/root")
+        mesh = UsdGeom.Mesh.Define(stage, "/root/mesh")
+        if extent is not None:
+            mesh.CreateExtentAttr(extent)
+        if default_prim:
+            stage.SetDefaultPrim(root.GetPrim())
+        stage.GetRootLayer().Save()
+        return path
+
+    def test_valid_asset(self):
+        self.assertIsNone(validate_replacement(self._create_asset("valid.usda")))
+
+    def test_invalid_assets(self):
+        broken_path = os.path.join(self._tmp_dir, "broken.usda")
+        with open(broken_path, "w") as f:
+            f.write("#usda 1.0\ndef Xform \"root\" {\n")
+
+        self.assertIn("Could not open", validate_replacement(broken_path))
+        self.assertIn("no default prim",
+                      validate_replacement(self._create_asset("no_default.usda", default_prim=False)))
+        self.assertIn("no non-empty extent", validate_replacement(self._create_asset("no_extent.usda", extent=None)))
+        self.assertIn("no non-empty extent",
+                      validate_replacement(self._create_asset("empty_extent.usda", extent=[(0, 0, 0), (0, 0, 0)])))
+
+    def test_referenced_geometry_is_composed(self):
+        geometry_path = self._create_asset("geometry.usda")
+        path = os.path.join(self._tmp_dir, "wrapper.usda")
+        layer = Sdf.Layer.CreateNew(path)
+        prim_spec = Sdf.CreatePrimInLayer(layer, "/wrapper")
+        prim_spec.specifier = Sdf.SpecifierDef
+        prim_spec.referenceList.prependedItems.append(Sdf.Reference(geometry_path))
+        layer.defaultPrim = "wrapper"
+        layer.Save()
+
+        self.assertIsNone(validate_replacement(path))
+
+    def test_results_are_cached(self):
+        path = self._create_asset("no_extent.usda", extent=None)
+        with TransformCache(":memory:") as cache:
+            errors = validate_replacements({"mesh_A": path, "mesh_B": path}, max_workers=2, cache=cache)
+            self.assertEqual(set(errors), {"mesh_A", "mesh_B"})
+            self.assertEqual(cache.get_validations([path]), {path: errors["mesh_A"]})
+
+            # Fixed since it was cached
+            os.remove(path)
+            self._create_asset("no_extent.usda")
+            self.assertEqual(validate_replacements({"mesh_A": path}, cache=cache), {})
+
+
+class TestVerifyPreflight(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(self._tmp_dir, ["A", "B"], ["A", "B"])
+        with open(os.path.join(self.meshes_folder, "E_mesh_B.usda"), "w") as f:
+            f.write("#usda 1.0\n")
+        self.engine = VciEngine(open_stage(capture_layer, self.edit_layer), capture_layer, self.edit_layer,
+                                self.meshes_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_invalid_assets_are_reported_and_not_referenced(self):
+        report = self.engine.verify()
+        self.assertIn("1 replacement assets are invalid", report)
+        self.assertIn("E_mesh_B.usda has no default prim", report)
+        self.assertEqual([entry.name for entry in self.engine.plan.get_entries(INVALID_ASSET)], ["mesh_B"])
+        self.assertEqual([entry.name for entry in self.engine.plan.get_entries(ADD_REFERENCE)], ["mesh_A"])
+        self.assertEqual(self.engine.add_overrides(), 1)
+
+    def test_verify_yields_between_chunks(self):
+        self.engine.chunk_size = 1
+        steps = self.engine.iter_verify()
+        progress = []
+        while True:
+            try:
+                progress.append(next(steps))
+            except StopIteration:
+                break
+
+        # After the first asset validated and the first mesh planned
+        self.assertEqual(progress.count(Progress("verify", 1, 2)), 2)
+        self.assertEqual(progress[-1], Progress("verify", 6, 6))
+        self.assertEqual([entry.name for entry in self.engine.plan.get_entries(INVALID_ASSET)], ["mesh_B"])
+        self.assertEqual([entry.name for entry in self.engine.plan.get_entries(ADD_REFERENCE)], ["mesh_A"])
+
+    def test_preflight_can_be_disabled(self):
+        self.engine.preflight = False
+        self.engine.verify()
+        self.assertEqual(self.engine.plan.counts()[INVALID_ASSET], 0)
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf
+
+from ..core import REFERENCE_DELETE_ORIGINAL, REFERENCE_REPLACE, VciEngine, VciError, open_stage
+from ..plan import ADD_REFERENCE, ADD_TRANSFORM
+from ..references import CaptureReferenceResolver, PathRelativizer
+from .test_core import create_remix_project
+
+
+class TestReferences(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "B"])
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _create_engine(self, reference_mode: str) -> VciEngine:
+        engine = VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                           self.meshes_folder, reference_mode=reference_mode)
+        engine.verify()
+        return engine
+
+    def test_relativizer_is_relative_to_layer_folder(self):
+        relativizer = PathRelativizer(self.edit_layer)
+        self.assertEqual(relativizer.relativize(os.path.join(self._tmp_dir, "mod_asset.usda")), "mod_asset.usda")
+        self.assertEqual(relativizer.relativize(os.path.join(self.meshes_folder, "E_mesh_A.usda")),
+                         "replacements/E_mesh_A.usda")
+        self.assertEqual(relativizer.relativize(os.path.join(self.meshes_folder, "E_mesh_B.usda")),
+                         "replacements/E_mesh_B.usda")
+
+    def test_resolver_rebases_captured_references_on_edit_layer(self):
+        os.makedirs(os.path.join(self._tmp_dir, "mods"))
+        edit_layer = Sdf.Layer.CreateNew(os.path.join(self._tmp_dir, "mods", "mod.usda"))
+        resolver = CaptureReferenceResolver(PathRelativizer(edit_layer))
+        prim_spec = self.capture_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertEqual(resolver.get_original_references(prim_spec), (("../meshes/mesh_A.usda", ""),))
+        self.assertEqual(resolver.resolve(self.capture_layer, "./meshes/mesh_B.usda"), "../meshes/mesh_B.usda")
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(VciError):
+            self._create_engine("append")
+
+    def test_replace_makes_reference_list_explicit(self):
+        engine = self._create_engine(REFERENCE_REPLACE)
+        # The captured visual correction goes with the captured reference
+        self.assertFalse(engine.plan.get_entries(ADD_TRANSFORM))
+        self.assertEqual(engine.add_overrides(), 2)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertTrue(prim_spec.referenceList.isExplicit)
+        self.assertEqual([reference.assetPath for reference in prim_spec.referenceList.explicitItems],
+                         ["replacements/E_mesh_A.usda"])
+        self.assertFalse(prim_spec.nameChildren.get("mesh"))
+        self.assertFalse(engine.stage.GetPrimAtPath("/RootNode/meshes/mesh_A").GetChild("mesh"))
+
+    def test_delete_original_deletes_captured_reference(self):
+        engine = self._create_engine(REFERENCE_DELETE_ORIGINAL)
+        self.assertEqual(engine.add_overrides(), 2)
+
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertEqual([reference.assetPath for reference in prim_spec.referenceList.prependedItems],
+                         ["replacements/E_mesh_A.usda"])
+        self.assertEqual(list(prim_spec.referenceList.deletedItems), [Sdf.Reference("meshes/mesh_A.usda")])
+        self.assertFalse(engine.stage.GetPrimAtPath("/RootNode/meshes/mesh_A").GetChild("mesh"))
+        self.assertTrue(engine.stage.GetPrimAtPath("/RootNode/meshes/mesh_C").GetChild("mesh"))
+        self.assertIn("resolve_references", engine.instrumentation.span_seconds)
+
+    def test_sharded_merge_keeps_replacement_and_deletion(self):
+        engine = self._create_engine(REFERENCE_DELETE_ORIGINAL)
+        self.assertEqual(engine.apply_sharded(2), (2, 0))
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertEqual([reference.assetPath for reference in prim_spec.referenceList.prependedItems],
+                         ["replacements/E_mesh_A.usda"])
+        self.assertEqual(list(prim_spec.referenceList.deletedItems), [Sdf.Reference("meshes/mesh_A.usda")])
+
+    def test_mode_change_rereferences_and_retract_restores_capture(self):
+        self._create_engine(REFERENCE_DELETE_ORIGINAL).add_overrides()
+        self.edit_layer.Save()
+
+        engine = self._create_engine(REFERENCE_REPLACE)
+        self.assertEqual(sorted(entry.name for entry in engine.plan.get_entries(ADD_REFERENCE)), ["mesh_A", "mesh_B"])
+        self.assertTrue(all(entry.stale for entry in engine.plan.get_entries(ADD_REFERENCE)))
+        engine.add_overrides()
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A")
+        self.assertTrue(prim_spec.referenceList.isExplicit)
+        self.assertFalse(prim_spec.referenceList.deletedItems)
+
+        os.remove(os.path.join(self.meshes_folder, "E_mesh_A.usda"))
+        engine.sync_assets(["E_mesh_A.usda"])
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A"))
+        self.assertTrue(engine.stage.GetPrimAtPath("/RootNode/meshes/mesh_A").GetChild("mesh"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf
+
+from ..core import CUSTOM_PROP_NAME, SHARD_SUBLAYERS, VciEngine, VciError, find_capture_layers, open_stage
+from ..layerstats import measure_output
+from ..plan import ADD_REFERENCE, ADD_TRANSFORM
+from ..shards import add_shard_sublayer, find_shard_layers, get_shard_index
+from .test_core import create_remix_project
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A1", "B2", "C3"], ["A1", "B2", "C3"])
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _create_engine(self, edit_layer=None) -> VciEngine:
+        edit_layer = edit_layer or self.edit_layer
+        engine = VciEngine(open_stage(self.capture_layer, edit_layer), self.capture_layer, edit_layer,
+                           self.meshes_folder, max_workers=2)
+        engine.verify()
+        return engine
+
+    def test_shard_index_uses_hash_prefix(self):
+        self.assertEqual(get_shard_index("mesh_0000000F12345678", 4), 3)
+        self.assertEqual(get_shard_index("mesh_A1", 2), 1)
+        # Names without a hex hash still land in a shard
+        self.assertIn(get_shard_index("mesh_XYZ", 4), range(4))
+
+    def test_shard_sublayers_sorted_after_other_sublayers(self):
+        self.edit_layer.subLayerPaths.append("base.usda")
+        for index in (2, 0):
+            add_shard_sublayer(self.edit_layer, os.path.join(self._tmp_dir, f"mod_vci_shard_00{index}.usdc"))
+        self.assertEqual(list(self.edit_layer.subLayerPaths),
+                         ["base.usda", "mod_vci_shard_000.usdc", "mod_vci_shard_002.usdc"])
+
+    def test_merge_matches_in_process_run(self):
+        engine = self._create_engine()
+        self.assertEqual(engine.apply_sharded(2), (3, 3))
+        self.assertFalse(engine.plan.get_entries(ADD_REFERENCE) or engine.plan.get_entries(ADD_TRANSFORM))
+        self.assertFalse(self.edit_layer.subLayerPaths)
+
+        expected_layer = Sdf.Layer.CreateNew(os.path.join(self._tmp_dir, "expected.usda"))
+        expected_engine = self._create_engine(expected_layer)
+        expected_engine.add_overrides()
+        expected_engine.apply_vci()
+        self.assertEqual(self.edit_layer.ExportToString(), expected_layer.ExportToString())
+
+    def test_sublayers_are_skipped_on_next_run(self):
+        engine = self._create_engine()
+        references, transforms = engine.apply_sharded(2, SHARD_SUBLAYERS)
+        self.assertEqual((references, transforms), (3, 3))
+        engine.save()
+        shard_layers = find_shard_layers(self.edit_layer)
+        self.assertEqual([os.path.basename(layer.realPath) for layer in shard_layers],
+                         ["mod_vci_shard_000.usdc", "mod_vci_shard_001.usdc"])
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A1"))
+        self.assertTrue(shard_layers[1].GetPrimAtPath("/RootNode/meshes/mesh_A1"))
+        self.assertEqual(len(engine.manifest), 3)
+        self.assertIn(CUSTOM_PROP_NAME, self.edit_layer.customLayerData)
+
+        engine = self._create_engine()
+        self.assertIn("Found 3 pre-existing overrides in edit layer.", engine.verify())
+        self.assertEqual(engine.apply_sharded(2, SHARD_SUBLAYERS), (0, 0))
+
+        # Removed assets are retracted from the shard holding them
+        os.remove(os.path.join(self.meshes_folder, "E_mesh_A1.usda"))
+        engine.sync_assets(["E_mesh_A1.usda"])
+        self.assertFalse(shard_layers[1].GetPrimAtPath("/RootNode/meshes/mesh_A1"))
+
+    def test_verify_after_sublayer_output(self):
+        engine = self._create_engine()
+        engine.apply_sharded(2, SHARD_SUBLAYERS)
+        engine.save()
+
+        # The shard layers hold overrides, they are not captures
+        stage = open_stage(self.capture_layer, self.edit_layer)
+        capture_layers = find_capture_layers(stage, self.edit_layer)
+        self.assertEqual(capture_layers, [self.capture_layer])
+        engine = VciEngine(stage, capture_layers, self.edit_layer, self.meshes_folder)
+        report = engine.verify()
+        self.assertNotIn("out of date", report)
+        self.assertFalse(engine.plan.get_entries(ADD_REFERENCE) or engine.plan.get_entries(ADD_TRANSFORM))
+
+    def test_requires_saved_edit_layer(self):
+        engine = self._create_engine()
+        engine.edit_layer = Sdf.Layer.CreateAnonymous()
+        with self.assertRaises(VciError):
+            engine.apply_sharded(2)
+
+
+class TestBinaryOutput(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A1", "B2", "C3"], ["A1", "B2", "C3"])
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_new_overrides_fill_bounded_sublayers(self):
+        # An override authored inline before stays in the edit layer
+        engine = VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                           self.meshes_folder)
+        engine.verify()
+        engine.add_overrides(["mesh_A1"])
+
+        engine = VciEngine(open_stage(self.capture_layer, self.edit_layer), self.capture_layer, self.edit_layer,
+                           self.meshes_folder, binary_output=True, max_layer_prims=1)
+        engine.verify()
+        self.assertEqual(engine.add_overrides(), 2)
+        self.assertEqual(engine.apply_vci(), 3)
+        engine.save()
+
+        shard_layers = find_shard_layers(self.edit_layer)
+        self.assertEqual([os.path.basename(layer.realPath) for layer in shard_layers],
+                         ["mod_vci_shard_000.usdc", "mod_vci_shard_001.usdc"])
+        self.assertTrue(self.edit_layer.GetAttributeAtPath(f"/RootNode/meshes/mesh_A1.{engine.xformop_name}"))
+        self.assertTrue(shard_layers[0].GetAttributeAtPath(f"/RootNode/meshes/mesh_B2.{engine.xformop_name}"))
+        self.assertTrue(shard_layers[1].GetAttributeAtPath(f"/RootNode/meshes/mesh_C3.{engine.xformop_name}"))
+
+        stats = measure_output(self.edit_layer.realPath)
+        self.assertEqual([os.path.basename(layer_stats.path) for layer_stats in stats],
+                         ["mod.usda", "mod_vci_shard_000.usdc", "mod_vci_shard_001.usdc"])
+        self.assertTrue(all(layer_stats.size > 0 for layer_stats in stats))
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import unittest
+
+_PACKAGE = "codetestdummy.omniverse.kit.remix_vci"
+_EXTENSION_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5))
+
+# Modules enabling the extension must not import, they wait until the window is opened or the engine is used
+DEFERRED_MODULES = ("pxr", "numpy", "omni.ui", f"{_PACKAGE}.window", f"{_PACKAGE}.core")
+
+_IMPORT_SCRIPT = f"""
+import sys
+
+import {_PACKAGE} as package
+print(",".join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))
+package.VciEngine
+print("pxr" in sys.modules)
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_defers_engine(self):
+        # A fresh interpreter, the test runner has already imported everything
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([_EXTENSION_ROOT, os.environ.get("PYTHONPATH", "")]))
+        output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], env=env, capture_output=True, text=True,
+                                check=True).stdout.splitlines()
+
+        self.assertEqual(output[0], "")
+        # The engine is still there on first use
+        self.assertEqual(output[1], "True")
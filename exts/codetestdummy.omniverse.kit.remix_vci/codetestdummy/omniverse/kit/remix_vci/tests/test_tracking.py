@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Sdf
+
+from ..core import VciEngine, open_stage
+from ..plan import ADD_REFERENCE
+from ..tracking import StageChangeTracker
+from .test_core import create_remix_project
+
+
+class TestIncrementalVerify(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "B"])
+        self.stage = open_stage(self.capture_layer, self.edit_layer)
+        self.tracker = StageChangeTracker(self.stage, "/RootNode/meshes")
+
+    def tearDown(self):
+        self.tracker.revoke()
+        shutil.rmtree(self._tmp_dir)
+
+    def get_full_plan(self, capture_layers=None) -> dict:
+        capture_layers = capture_layers or [self.capture_layer]
+        engine = VciEngine(open_stage(capture_layers, self.edit_layer), capture_layers, self.edit_layer,
+                           self.meshes_folder)
+        engine.verify()
+        return engine.plan.to_dict()["entries"]
+
+    def test_tracker_records_changed_names(self):
+        Sdf.CreatePrimInLayer(self.edit_layer, "/RootNode/meshes/mesh_A/mesh").active = False
+        names, full = self.tracker.pop_changes()
+        self.assertEqual(names, {"mesh_A"})
+        self.assertFalse(full)
+        self.assertFalse(self.tracker.has_changes())
+
+        with self.tracker.ignored():
+            Sdf.CreatePrimInLayer(self.edit_layer, "/RootNode/meshes/mesh_B")
+        self.assertFalse(self.tracker.has_changes())
+
+        del self.edit_layer.GetPrimAtPath("/RootNode").nameChildren["meshes"]
+        self.assertTrue(self.tracker.pop_changes()[1])
+
+    def test_reverify_matches_full_verify(self):
+        engine = VciEngine(self.stage, self.capture_layer, self.edit_layer, self.meshes_folder)
+        engine.verify()
+        with self.tracker.ignored():
+            engine.add_overrides()
+            engine.apply_vci()
+
+        # Edits made outside the engine: an override removed and a mesh removed from the capture
+        del self.edit_layer.GetPrimAtPath("/RootNode/meshes").nameChildren["mesh_A"]
+        self.capture_layer.GetPrimAtPath("/RootNode/meshes").nameChildren["mesh_B"].active = False
+        names, full = self.tracker.pop_changes()
+        self.assertEqual(names, {"mesh_A", "mesh_B"})
+
+        report = engine.reverify(names)
+        self.assertIn("Re-verified 2 changed meshes.", report)
+        self.assertEqual(engine.plan.to_dict()["entries"], self.get_full_plan())
+
+    def test_added_capture_layer_is_reverified_by_its_prims(self):
+        shutil.copy(f"{self.meshes_folder}/E_mesh_A.usda", f"{self.meshes_folder}/E_mesh_D.usda")
+        engine = VciEngine(self.stage, self.capture_layer, self.edit_layer, self.meshes_folder)
+        engine.verify()
+        self.assertNotIn("mesh_D", [entry.name for entry in engine.plan.get_entries(ADD_REFERENCE)])
+
+        second_layer = create_remix_project(os.path.join(self._tmp_dir, "second"), ["A", "D"], [])[0]
+        self.stage.GetRootLayer().subLayerPaths.append(second_layer.identifier)
+        names, full = self.tracker.pop_changes()
+        self.assertEqual(names, {"mesh_A", "mesh_D"})
+        self.assertFalse(full)
+
+        names |= engine.set_capture_layers([self.capture_layer, second_layer])
+        report = engine.reverify(names, rescan=False)
+        self.assertIn("Re-verified 2 changed meshes.", report)
+        self.assertEqual(engine.plan.to_dict()["entries"], self.get_full_plan([self.capture_layer, second_layer]))
+        self.assertIn("mesh_D", [entry.name for entry in engine.plan.get_entries(ADD_REFERENCE)])
+
+    def test_reverify_picks_up_new_assets(self):
+        engine = VciEngine(self.stage, self.capture_layer, self.edit_layer, self.meshes_folder)
+        engine.verify()
+        shutil.copy(f"{self.meshes_folder}/E_mesh_A.usda", f"{self.meshes_folder}/E_mesh_C.usda")
+
+        engine.reverify(set())
+        self.assertEqual(engine.plan.to_dict()["entries"], self.get_full_plan())
+        self.assertIn("mesh_C", engine.plan.entries)
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pxr import Usd, UsdGeom, Sdf, Gf
+
+from ..transforms import extract_transforms, read_visual_correction
+
+
+class TestTransforms(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _create_asset(self, name: str, translate=None):
+        path = os.path.join(self._tmp_dir, name)
+        stage = Usd.Stage.CreateNew(path)
+        correction = UsdGeom.Xform.Define(stage, "/visual_correction")
+        if translate is not None:
+            correction.AddTranslateOp(UsdGeom.XformOp.PrecisionFloat).Set(Gf.Vec3f(*translate))
+        else:
+            correction.AddTransformOp(opSuffix="capture").Set(Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1.0, -1.0, 1.0)))
+        stage.GetRootLayer().Save()
+        return path
+
+    def test_read_transform_op(self):
+        transform = read_visual_correction(self._create_asset("transform.usda"))
+        self.assertEqual(transform.op_type, "transform")
+        self.assertEqual(transform.precision, "double")
+        self.assertEqual(transform.suffix, "capture")
+        self.assertEqual(transform.matrix, Gf.Matrix4d(1.0).SetScale(Gf.Vec3d(1.0, -1.0, 1.0)))
+
+    def test_read_translate_op(self):
+        transform = read_visual_correction(self._create_asset("translate.usda", translate=(1, 2, 3)))
+        self.assertEqual(transform.op_type, "translate")
+        self.assertEqual(transform.precision, "float")
+        self.assertEqual(transform.matrix, Gf.Matrix4d(1.0).SetTranslate(Gf.Vec3d(1, 2, 3)))
+
+    def test_extract_transforms_reports_errors(self):
+        asset_path = self._create_asset("transform.usda")
+        empty_path = os.path.join(self._tmp_dir, "empty.usda")
+        Sdf.Layer.CreateNew(empty_path).Save()
+
+        transforms, errors = extract_transforms({
+            "mesh_A": asset_path,
+            "mesh_B": asset_path,
+            "mesh_C": empty_path,
+            "mesh_D": os.path.join(self._tmp_dir, "missing.usda"),
+        }, max_workers=2)
+
+        self.assertEqual(set(transforms), {"mesh_A", "mesh_B"})
+        self.assertEqual(set(errors), {"mesh_C", "mesh_D"})
@@ -0,0 +1,87 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from ..core import VciEngine, open_stage
+from ..watch import AssetWatcher, InotifyWatcher, PollingWatcher
+from .test_core import create_remix_project
+
+
+class TestFolderWatchers(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self._tmp_dir, "E_mesh_A.usda"), "w") as f:
+            f.write("#usda 1.0\n")
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def check_watcher(self, watcher):
+        try:
+            self.assertEqual(watcher.read_changes(), set())
+            with open(os.path.join(self._tmp_dir, "E_mesh_B.usda"), "w") as f:
+                f.write("#usda 1.0\n")
+            os.remove(os.path.join(self._tmp_dir, "E_mesh_A.usda"))
+            self.assertEqual(watcher.read_changes(), {"E_mesh_A.usda", "E_mesh_B.usda"})
+            self.assertEqual(watcher.read_changes(), set())
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher(self._tmp_dir))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_watcher(self):
+        self.check_watcher(InotifyWatcher(self._tmp_dir))
+
+
+class TestAssetWatcher(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        capture_layer, self.edit_layer, self.meshes_folder = create_remix_project(
+            self._tmp_dir, ["A", "B", "C"], ["A", "B"])
+        self.engine = VciEngine(open_stage(capture_layer, self.edit_layer), capture_layer, self.edit_layer,
+                                self.meshes_folder)
+        self.engine.verify()
+        self.engine.add_overrides()
+        self.engine.apply_vci()
+        self.watcher = AssetWatcher(self.engine, debounce=0.0, polling=True)
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self._tmp_dir)
+
+    def test_sync_added_and_removed_assets(self):
+        shutil.copy(os.path.join(self.meshes_folder, "E_mesh_B.usda"),
+                    os.path.join(self.meshes_folder, "E_mesh_C.usda"))
+        os.remove(os.path.join(self.meshes_folder, "E_mesh_A.usda"))
+
+        report = self.watcher.poll()
+        self.assertIn("created 1 overrides, applied 1 inverse transforms, retracted 1 overrides", report)
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_A"))
+        prim_spec = self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_C")
+        self.assertEqual(prim_spec.referenceList.prependedItems[0].assetPath, "replacements/E_mesh_C.usda")
+        self.assertTrue(prim_spec.attributes.get(self.engine.xformop_name))
+
+        # Nothing left to do
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.engine.plan.counts()["add_reference"], 0)
+
+    def test_sync_yields_between_steps(self):
+        shutil.copy(os.path.join(self.meshes_folder, "E_mesh_B.usda"),
+                    os.path.join(self.meshes_folder, "E_mesh_C.usda"))
+
+        steps = self.engine.iter_sync_assets(["E_mesh_C.usda"])
+        progress = next(steps)
+        self.assertEqual(progress.phase, "verify")
+        # Nothing is authored before the override step
+        self.assertFalse(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_C"))
+        self.assertEqual([progress.phase for progress in steps], ["verify", "overrides", "transforms"])
+        self.assertTrue(self.edit_layer.GetPrimAtPath("/RootNode/meshes/mesh_C"))
+
+    def test_unrelated_files_are_ignored(self):
+        with open(os.path.join(self.meshes_folder, "notes.txt"), "w") as f:
+            f.write("")
+        self.assertEqual(self.watcher.poll(), "")
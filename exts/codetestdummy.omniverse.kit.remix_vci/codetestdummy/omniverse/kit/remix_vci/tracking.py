@@ -0,0 +1,94 @@
+"""Collect the ``mesh_HASH`` prims changed on a stage between two verifications."""
+from contextlib import contextmanager
+
+from pxr import Tf, Usd, Sdf
+
+from .catalog import get_child_names
+
+
+class StageChangeTracker:
+    """Listens to ``Usd.Notice.ObjectsChanged`` of ``stage`` and records the names of the changed prims below ``path``.
+
+    :meth:`pop_changes` returns them for :meth:`VciEngine.reverify`. A sublayer added, removed, muted or unmuted
+    resyncs the common ancestors of its prims, so it is narrowed down to the prims below ``path`` in that layer. Only
+    another recomposition of ``path`` or one of its ancestors (e.g. the meshes parent being renamed) requires a full
+    verification.
+
+    :param on_layers_changed: Called without arguments when the layer stack of the stage changed.
+    """
+
+    def __init__(self, stage: Usd.Stage, path: str, on_layers_changed=None):
+        self.stage = stage
+        self.path = Sdf.Path(path)
+        self.on_layers_changed = on_layers_changed
+        self._changed_names = set()
+        self._full = False
+        self._ignore = False
+        self._layer_stack = stage.GetLayerStack()
+        self._listeners = [
+            Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage),
+            Tf.Notice.Register(Usd.Notice.LayerMutingChanged, self._on_layer_muting_changed, stage),
+        ]
+
+    def revoke(self):
+        for listener in self._listeners:
+            listener.Revoke()
+        self._listeners = []
+
+    def has_changes(self) -> bool:
+        return self._full or bool(self._changed_names)
+
+    def pop_changes(self):
+        """Return the changed names and whether a full verification is needed, and start recording anew."""
+        changes = (self._changed_names, self._full)
+        self._changed_names = set()
+        self._full = False
+        return changes
+
+    @contextmanager
+    def ignored(self):
+        """Do not record the changes made in the body of the ``with`` statement, e.g. the edits of the engine itself,
+        which keeps its plan up to date."""
+        self._ignore = True
+        try:
+            yield
+        finally:
+            self._ignore = False
+
+    def _on_objects_changed(self, notice, sender):
+        changed_layers = self._check_layer_stack()
+        if self._ignore:
+            return
+        for layer in changed_layers:
+            self._changed_names |= get_child_names(layer, self.path)
+        for path in notice.GetResyncedPaths():
+            # The ancestors resynced by a layer stack change only hold the prims of the changed layers
+            if changed_layers and self.path.HasPrefix(path):
+                continue
+            self._add_path(path, resynced=True)
+        for path in notice.GetChangedInfoOnlyPaths():
+            self._add_path(path, resynced=False)
+
+    def _on_layer_muting_changed(self, notice, sender):
+        self._check_layer_stack()
+
+    def _check_layer_stack(self) -> set:
+        """Return the layers added to or removed from the layer stack since the last call."""
+        layer_stack = self.stage.GetLayerStack()
+        if layer_stack == self._layer_stack:
+            return set()
+        changed_layers = set(layer_stack) ^ set(self._layer_stack)
+        self._layer_stack = layer_stack
+        if self.on_layers_changed:
+            self.on_layers_changed()
+        return changed_layers
+
+    def _add_path(self, path: Sdf.Path, resynced: bool):
+        prim_path = path.GetPrimPath()
+        if prim_path.HasPrefix(self.path):
+            if prim_path != self.path:
+                self._changed_names.add(prim_path.GetPrefixes()[self.path.pathElementCount].name)
+            elif resynced:
+                self._full = True
+        elif resynced and self.path.HasPrefix(prim_path):
+            self._full = True
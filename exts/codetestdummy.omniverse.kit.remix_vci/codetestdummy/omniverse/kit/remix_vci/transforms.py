@@ -0,0 +1,140 @@
+"""Batched extraction of the ``/visual_correction`` transforms of captured mesh assets.
+
+The captured assets are read as plain ``Sdf`` layers rather than composed stages and the reads are fanned out across
+a worker pool, so the authoring step can consume all transforms in one pass.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pxr import Usd, UsdGeom, Sdf, Gf
+
+
+VISUAL_CORRECTION_PATH = "/visual_correction"
+_INVERT_PREFIX = "!invert!"
+
+# op_type is the xform op type token (e.g. "transform"), precision one of "double", "float" or "half", suffix the
+# op name suffix and matrix the op's local transform as a Gf.Matrix4d. Plain values so results can cross processes.
+CapturedTransform = namedtuple("CapturedTransform", ["op_type", "precision", "suffix", "matrix"])
+
+_PRECISIONS = {
+    "double": UsdGeom.XformOp.PrecisionDouble,
+    "float": UsdGeom.XformOp.PrecisionFloat,
+    "half": UsdGeom.XformOp.PrecisionHalf,
+}
+
+
+def get_precision(precision: str):
+    """Return the ``UsdGeom.XformOp.Precision`` for a :class:`CapturedTransform` precision."""
+    return _PRECISIONS[precision]
+
+
+def _get_precision_name(type_name: Sdf.ValueTypeName) -> str:
+    scalar_type = str(type_name.scalarType)
+    if scalar_type.startswith("half") or scalar_type == "quath":
+        return "half"
+    if scalar_type.startswith("float") or scalar_type == "quatf":
+        return "float"
+    return "double"
+
+
+def _get_op_matrix(op_type: str, precision: str, value) -> Gf.Matrix4d:
+    if op_type == "transform":
+        return Gf.Matrix4d(value)
+
+    # Let UsdGeom evaluate the other op types rather than re-implementing their conventions
+    stage = Usd.Stage.CreateInMemory()
+    xformable = UsdGeom.Xform.Define(stage, "/op")
+    xform_op = xformable.AddXformOp(UsdGeom.XformOp.GetOpTypeEnum(op_type), get_precision(precision))
+    xform_op.Set(value)
+    return xform_op.GetOpTransform(Usd.TimeCode.Default())
+
+
+def read_visual_correction(asset_path: str) -> CapturedTransform:
+    """Read the first xform op of ``/visual_correction`` from the captured mesh asset at ``asset_path``.
+
+    :raises ValueError: If the asset cannot be opened or has no visual correction op.
+    """
+    layer = Sdf.Layer.FindOrOpen(asset_path)
+    if not layer:
+        raise ValueError(f"Could not open captured mesh {asset_path}")
+
+    prim_spec = layer.GetPrimAtPath(VISUAL_CORRECTION_PATH)
+    if not prim_spec:
+        raise ValueError(f"Could not get visual_correction prim in {asset_path}")
+
+    op_order_spec = prim_spec.attributes.get(UsdGeom.Tokens.xformOpOrder)
+    op_order = op_order_spec.default if op_order_spec else None
+    if not op_order:
+        raise ValueError(f"Could not get XformOp from visual_correction prim in {asset_path}")
+
+    # An inverted op reuses the attribute of the op it inverts
+    op_name = op_order[0]
+    is_inverse_op = op_name.startswith(_INVERT_PREFIX)
+    if is_inverse_op:
+        op_name = op_name[len(_INVERT_PREFIX):]
+    op_spec = prim_spec.attributes.get(op_name)
+    if not op_spec or op_spec.default is None:
+        raise ValueError(f"Could not get value of {op_name} in {asset_path}")
+
+    name_parts = op_name.split(":")
+    op_type = name_parts[1]
+    suffix = ":".join(name_parts[2:])
+    precision = _get_precision_name(op_spec.typeName)
+
+    matrix = _get_op_matrix(op_type, precision, op_spec.default)
+    if is_inverse_op:
+        matrix = matrix.GetInverse()
+    return CapturedTransform(op_type, precision, suffix, matrix)
+
+
+def _read_visual_correction_or_error(asset_path: str):
+    try:
+        return read_visual_correction(asset_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def get_capture_asset_path(capture_layer: Sdf.Layer, capture_primspec: Sdf.PrimSpec) -> str:
+    """Return the absolute path of the mesh asset referenced by a captured ``mesh_HASH`` prim spec, or None."""
+    references = capture_primspec.referenceList.prependedItems
+    if not references:
+        return None
+    return os.path.abspath(os.path.join(os.path.dirname(capture_layer.realPath), references[0].assetPath))
+
+
+def extract_transforms(asset_paths: dict, max_workers: int = None, use_processes: bool = False, cache=None):
+    """Read the visual correction of many captured assets in parallel.
+
+    :param asset_paths: Captured asset path per ``mesh_HASH`` name. Assets shared by several names are read once.
+    :param max_workers: Size of the worker pool, defaults to the executor's default.
+    :param use_processes: Use a process pool instead of threads. Avoid inside Kit.
+    :param cache: Optional :class:`.cache.TransformCache`, only assets missing from it are read.
+    :return: A ``(transforms, errors)`` tuple of dicts keyed by ``mesh_HASH`` name.
+    """
+    unique_paths = sorted(set(asset_paths.values()))
+    if not unique_paths:
+        return {}, {}
+
+    results = {}
+    if cache is not None:
+        results = {asset_path: (transform, None) for asset_path, transform in cache.get_many(unique_paths).items()}
+        unique_paths = [asset_path for asset_path in unique_paths if asset_path not in results]
+
+    if unique_paths:
+        executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor_type(max_workers=max_workers) as executor:
+            read_results = dict(zip(unique_paths, executor.map(_read_visual_correction_or_error, unique_paths)))
+        if cache is not None:
+            cache.put_many({asset_path: transform for asset_path, (transform, _) in read_results.items() if transform})
+        results.update(read_results)
+
+    transforms = {}
+    errors = {}
+    for name, asset_path in asset_paths.items():
+        transform, error = results[asset_path]
+        if error:
+            errors[name] = error
+        else:
+            transforms[name] = transform
+    return transforms, errors
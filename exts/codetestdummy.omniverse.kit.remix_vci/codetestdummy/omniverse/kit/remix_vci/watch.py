@@ -0,0 +1,169 @@
+"""Watch the replacement folder and keep the overrides of the edit layer in sync with it.
+
+New ``E_mesh_HASH`` files get their override and inverse transform authored, removed files get them retracted. Changes
+are reported by inotify on Linux and by comparing folder listings elsewhere, and collected until the folder has been
+quiet for a debounce delay, so a batch of files being copied is processed in one go.
+"""
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+
+from .instrumentation import logger
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MODIFY
+_EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_INTERVAL = 0.5
+
+
+class PollingWatcher:
+    """Reports the files of ``folder`` added, removed or modified between two :meth:`read_changes` calls by comparing
+    their size and modification time. Works everywhere but lists the whole folder on every call."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._snapshot = self._list()
+
+    def _list(self) -> dict:
+        files = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def read_changes(self) -> set:
+        """Return the names of the files changed since the last call."""
+        snapshot = self._list()
+        changed = snapshot.keys() ^ self._snapshot.keys()
+        changed.update(name for name, signature in snapshot.items()
+                       if name in self._snapshot and self._snapshot[name] != signature)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Reports the files of ``folder`` changed between two :meth:`read_changes` calls from inotify events, at no cost
+    when nothing changes. Linux only, see :func:`create_watcher`."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(folder), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+        # Set when the kernel queue overflowed and events were lost, the next read then reports every file
+        self.overflowed = False
+
+    def read_changes(self) -> set:
+        """Return the names of the files changed since the last call."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    self.overflowed = True
+                elif name:
+                    changed.add(os.fsdecode(name))
+        if self.overflowed:
+            self.overflowed = False
+            changed.update(os.listdir(self.folder))
+        return changed
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def create_watcher(folder: str, polling: bool = False):
+    """Return an :class:`InotifyWatcher` of ``folder`` on Linux, or a :class:`PollingWatcher` if inotify is not
+    available or ``polling`` is set (e.g. for network shares, which do not report changes made by other machines)."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError) as e:
+            logger.warning("Could not watch %s with inotify, polling it instead: %s", folder, e)
+    return PollingWatcher(folder)
+
+
+class AssetWatcher:
+    """Applies the changes of the replacement folder of a verified :class:`VciEngine` in debounced batches.
+
+    Call :meth:`poll` regularly (e.g. from the Kit update loop) or :meth:`run` to block until interrupted.
+
+    :param debounce: Seconds without new changes to wait before processing a batch.
+    :param polling: Use a :class:`PollingWatcher` even where inotify is available.
+    """
+
+    def __init__(self, engine, debounce: float = DEFAULT_DEBOUNCE, polling: bool = False):
+        self.engine = engine
+        self.debounce = debounce
+        self.watcher = create_watcher(engine.meshes_folder, polling)
+        self._pending = set()
+        self._last_change = 0.0
+
+    def close(self):
+        self.watcher.close()
+
+    def read_batch(self):
+        """Collect the folder changes and return the changed file names once the folder has been quiet for
+        :attr:`debounce` seconds, otherwise None."""
+        changed = self.watcher.read_changes()
+        now = time.monotonic()
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+        if not self._pending or now - self._last_change < self.debounce:
+            return None
+
+        file_names, self._pending = self._pending, set()
+        return file_names
+
+    def poll(self):
+        """Process the next batch of :meth:`read_batch`, if any.
+
+        :return: The report of :meth:`VciEngine.sync_assets` if a batch was processed, otherwise None.
+        """
+        file_names = self.read_batch()
+        if file_names is None:
+            return None
+        return self.engine.sync_assets(file_names)
+
+    def run(self, on_batch=None, interval: float = DEFAULT_INTERVAL):
+        """Poll every ``interval`` seconds until interrupted, calling ``on_batch(report)`` after each batch."""
+        while True:
+            report = self.poll()
+            if report is not None and on_batch:
+                on_batch(report)
+            time.sleep(interval)
@@ -0,0 +1,475 @@
+"""The VCI for Remix window, imported and built by the extension when it is first opened from its menu entry."""
+import asyncio
+import contextlib
+import os
+import time
+
+import carb.settings
+import omni.kit.app
+import omni.kit.commands
+import omni.ui as ui
+import omni.usd
+
+from . import commands
+
+from .instrumentation import logger
+from .core import (FILE_NAME_PREFIX, CUSTOM_PROP_NAME, MESHES_PATH, VCI_NAME, REFERENCE_PREPEND, AssetCatalog,
+                   EditRecorder, TransformCache, VciEngine, VciError, build_axis_correction, find_capture_layers,
+                   get_default_cache_path, open_transform_cache)
+from .tracking import StageChangeTracker
+from .watch import DEFAULT_INTERVAL, AssetWatcher
+
+_TRACE_PATH_SETTING = "/exts/codetestdummy.omniverse.kit.remix_vci/trace_path"
+_FLIP_AXES_SETTING = "/exts/codetestdummy.omniverse.kit.remix_vci/flip_axes"
+_UP_AXIS_ROTATION_SETTING = "/exts/codetestdummy.omniverse.kit.remix_vci/up_axis_rotation"
+_REFERENCE_MODE_SETTING = "/exts/codetestdummy.omniverse.kit.remix_vci/reference_mode"
+
+WINDOW_TITLE = "VCI for Remix"
+
+
+class VciWindow:
+    """Window driving a :class:`VciEngine` on the layers of the context's stage.
+
+    The window lists the layers and follows the stage from its creation until :meth:`destroy`, closing it only hides
+    it.
+    """
+
+    _FILE_NAME_PREFIX = FILE_NAME_PREFIX
+    _CUSTOM_PROP_NAME = CUSTOM_PROP_NAME
+
+    _flg_verify_ok: bool = False
+    _flg_processing: bool = False
+    _flg_cancel: bool = False
+    _task: asyncio.Future = None
+    _engine: VciEngine = None
+    # Selection the engine's plan was last verified for, a Verify with the same selection only re-verifies the changes
+    _verified_key: tuple = None
+    _tracker: StageChangeTracker = None
+    _watch_task: asyncio.Future = None
+
+    _string_model_search = ui.SimpleStringModel()
+    _status_lbl: str = "Please verify before applying."
+    _upgd_meshfile_pfx: str = FILE_NAME_PREFIX
+    _stage_path = MESHES_PATH
+    _capture_layer_path = MESHES_PATH
+    _edit_layer_path = MESHES_PATH
+    _vci_name = VCI_NAME
+    _catalog: AssetCatalog = None
+    _transform_cache: TransformCache = None
+
+    def __init__(self):
+        omni.kit.commands.register_all_commands_in_module(commands)
+        self.__layers = []
+        self.__layer_options = []
+        self.__combo_box_capture = None
+        self.__combo_box_edit = None
+        self.__selected_capture_layer = None
+        self.__selected_edit_layer = None
+
+        self._window = ui.Window(WINDOW_TITLE, width=310, height=400)
+        with self._window.frame:
+            with ui.VStack():
+
+                # The layer combo boxes are rebuilt when the layer stack changes, see refresh_layer_options
+                ui.Label("Please select capture layer:", height=25)
+                self._capture_combo_frame = ui.Frame(height=30, build_fn=self._build_capture_combo)
+                with ui.HStack(height=25):
+                    self._all_captures_model = ui.SimpleBoolModel(False)
+                    ui.CheckBox(model=self._all_captures_model, width=20)
+                    ui.Label("Process all capture layers of the layer stack")
+                self._all_captures_model.add_value_changed_fn(lambda model: self.on_select_layer(model, None))
+                with ui.HStack(height=25):
+                    self._deduplicate_model = ui.SimpleBoolModel(False)
+                    ui.CheckBox(model=self._deduplicate_model, width=20)
+                    ui.Label("Share identical replacements as instances")
+                self._deduplicate_model.add_value_changed_fn(lambda model: self.on_select_layer(model, None))
+
+                ui.Label("Please select edit target layer:", height=25)
+                self._edit_combo_frame = ui.Frame(height=30, build_fn=self._build_edit_combo)
+
+                ui.Label("Please select replacement meshes folder:", height=25)
+                with ui.HStack(height=40):
+                    ui.StringField(model=self._string_model_search, enabled=False, height=25)
+                    #self._string_model_search.as_string = ""
+                    self.val_changed_id = self._string_model_search.subscribe_end_edit_fn(self.on_end_edit_path)
+                    ui.Button("Browse", clicked_fn=self.on_browse_path, width=50, height=30)
+
+
+                def on_verify():
+                    self.verify_options()
+
+                def on_apply_overrides():
+                    self.add_overrides()
+
+                def on_apply_transforms():
+                    self.apply_vci()
+
+                ui.Button("Verify", clicked_fn=on_verify, height=25)
+                with ui.HStack(height=25):
+                    ui.Button("Dry Run", clicked_fn=self.show_plan, height=25)
+                    ui.Button("Export Plan", clicked_fn=self.export_plan, height=25)
+
+                label = ui.Label("Status:",height=25)
+                self._status_lbl = ui.Label("", word_wrap=True)
+
+                with ui.HStack(height=25):
+                    self._progress_model = ui.SimpleFloatModel(0.0)
+                    ui.ProgressBar(model=self._progress_model, height=20)
+                    ui.Button("Cancel", clicked_fn=self.on_cancel, width=50, height=20)
+                self._progress_lbl = ui.Label("", height=20)
+
+                with ui.HStack(height=25):
+                    ui.Button("Override References", clicked_fn=on_apply_overrides, height=25)
+                    ui.Button("Add Transforms", clicked_fn=on_apply_transforms, height=25)
+
+                with ui.HStack(height=25):
+                    self._watch_model = ui.SimpleBoolModel(False)
+                    ui.CheckBox(model=self._watch_model, width=20)
+                    ui.Label("Watch the folder and sync new or removed replacements")
+                self._watch_model.add_value_changed_fn(self.on_toggle_watch)
+
+        self._stage_event_sub = omni.usd.get_context().get_stage_event_stream().create_subscription_to_pop(
+            self.on_stage_event, name="remix_vci stage events")
+        self.attach_stage()
+
+    def show(self):
+        self._window.visible = True
+        self._window.focus()
+
+    def _build_layer_combo(self, selected_layer, name: str) -> ui.ComboBox:
+        index = self.__layers.index(selected_layer) if selected_layer in self.__layers else 0
+        combo_box = ui.ComboBox(index, *self.__layer_options, name=name, height=30)
+        combo_box.model.add_item_changed_fn(self.on_select_layer)
+        return combo_box
+
+    def _build_capture_combo(self):
+        self.__combo_box_capture = self._build_layer_combo(self.__selected_capture_layer, "dropdown_menu_capture")
+
+    def _build_edit_combo(self):
+        self.__combo_box_edit = self._build_layer_combo(self.__selected_edit_layer, "dropdown_menu_edit")
+
+    def refresh_layer_options(self):
+        """Rebuild the layer combo boxes from the current layer stack, keeping the selected layers if still there."""
+        self.__selected_capture_layer = self.get_selected_capture_layer()
+        self.__selected_edit_layer = self.get_selected_edit_layer()
+        stage = omni.usd.get_context().get_stage()
+        self.__layers = stage.GetLayerStack() if stage else []
+        self.__layer_options = [layer.GetDisplayName() for layer in self.__layers]
+        self._capture_combo_frame.rebuild()
+        self._edit_combo_frame.rebuild()
+
+    def on_stage_event(self, event):
+        if event.type == int(omni.usd.StageEventType.OPENED):
+            self.attach_stage()
+        elif event.type == int(omni.usd.StageEventType.CLOSING):
+            self.detach_stage()
+
+    def attach_stage(self):
+        """Track the changes of the context's stage and list its layers."""
+        self.detach_stage()
+        stage = omni.usd.get_context().get_stage()
+        if stage:
+            self._tracker = StageChangeTracker(stage, self._stage_path, on_layers_changed=self.refresh_layer_options)
+        self.refresh_layer_options()
+
+    def detach_stage(self):
+        self._watch_model.set_value(False)
+        self.cancel_task()
+        if self._tracker:
+            self._tracker.revoke()
+            self._tracker = None
+        self._engine = None
+        self._verified_key = None
+        self._flg_verify_ok = False
+
+    def on_select_layer(self, arg1, arg2):
+        self._flg_verify_ok = False
+        logger.debug("Layer selection changed: %s %s", type(arg1), type(arg2))
+
+    def on_browse_path(self):
+        # https://docs.omniverse.nvidia.com/kit/docs/kit-sdk/latest/source/extensions/omni.kit.window.filepicker/docs/index.html
+        self.__filepicker = omni.kit.window.filepicker.FilePickerDialog(
+            "my-filepicker", apply_button_label="Select", click_apply_handler=self.on_click_select)
+        self.__filepicker.show()
+
+    def on_click_select(self, file_name, dir_path):
+        self._string_model_search.as_string = dir_path
+        self.__filepicker.hide()
+
+    def on_end_edit_path(self, item_model):
+        self._flg_verify_ok = False
+        self._meshes_folder = self._string_model_search.as_string
+        self._catalog = None
+
+    def set_status_message(self, status_string: str):
+        self._status_lbl.text = status_string
+
+    def get_engine_key(self) -> tuple:
+        # The capture layers are not part of it, the engine switches to new ones by re-verifying their prims only
+        edit_layer = self.get_selected_edit_layer()
+        return (edit_layer.identifier if edit_layer else None, self._string_model_search.get_value_as_string(),
+                self._deduplicate_model.get_value_as_bool(),
+                carb.settings.get_settings().get(_REFERENCE_MODE_SETTING) or REFERENCE_PREPEND)
+
+    def get_engine(self) -> VciEngine:
+        self._meshes_path = self._string_model_search.get_value_as_string()
+
+        # Keep the replacement catalog between button presses, it is rescanned by Verify
+        if self._catalog is None or self._catalog.meshes_folder != self._meshes_path:
+            self._catalog = AssetCatalog(self._meshes_path, self._upgd_meshfile_pfx)
+
+        # Captured transforms are cached next to the (first) capture layer
+        capture_layers = self.get_selected_capture_layers()
+        cache_path = get_default_cache_path(capture_layers[0]) if capture_layers else None
+        if self._transform_cache is None or self._transform_cache.path != cache_path:
+            self.close_transform_cache()
+            self._transform_cache = open_transform_cache(cache_path) if cache_path else None
+
+        settings = carb.settings.get_settings()
+        try:
+            axis_correction = build_axis_correction(settings.get(_FLIP_AXES_SETTING) or "",
+                                                    settings.get(_UP_AXIS_ROTATION_SETTING) or None)
+        except ValueError as e:
+            raise VciError(f"Invalid axis correction settings: {e}")
+
+        return VciEngine(omni.usd.get_context().get_stage(), capture_layers,
+                         self.get_selected_edit_layer(), self._meshes_path, stage_path=self._stage_path,
+                         capture_layer_path=self._capture_layer_path, edit_layer_path=self._edit_layer_path,
+                         prefix=self._upgd_meshfile_pfx, vci_name=self._vci_name, catalog=self._catalog,
+                         transform_cache=self._transform_cache, axis_correction=axis_correction,
+                         deduplicate=self._deduplicate_model.get_value_as_bool(),
+                         reference_mode=settings.get(_REFERENCE_MODE_SETTING) or REFERENCE_PREPEND)
+
+    def close_transform_cache(self):
+        if self._transform_cache:
+            self._transform_cache.close()
+            self._transform_cache = None
+
+    def verify_options(self):
+        self._flg_verify_ok = False
+
+        engine_key = self.get_engine_key()
+        verified_key, self._verified_key = self._verified_key, None
+
+        def on_done(report):
+            self.set_status_message(report)
+            self._flg_verify_ok = True
+            self._verified_key = engine_key
+
+        # The engine is kept until the next Verify, its plan is what Override References and Add Transforms execute.
+        # With the same selection, only the prims changed on the stage since the last Verify are verified again.
+        def start_steps():
+            changed_names, full = self._tracker.pop_changes() if self._tracker else (set(), True)
+            if verified_key == engine_key and not full:
+                changed_names |= self._engine.set_capture_layers(self.get_selected_capture_layers())
+                return self._engine.iter_reverify(changed_names)
+            self._engine = self.get_engine()
+            return self._engine.iter_verify()
+
+        self.run_task(start_steps, on_done)
+
+    def run_task(self, start_steps, on_done, record_edits: bool = False):
+        """Drive the engine generator returned by ``start_steps`` as an asyncio task, yielding to the frame loop
+        between chunks. With ``record_edits`` the edits of the whole run are grouped into one undoable command."""
+        if self._flg_processing:
+            self.set_status_message("Busy. Please wait for the running operation or cancel it.")
+            return
+
+        try:
+            steps = start_steps()
+        except VciError as e:
+            self.set_status_message(f"Error: {e}")
+            return
+        except Exception as e:
+            logger.exception("VCI task failed to start")
+            self.set_status_message(f"Error: {type(e).__name__}: {e}")
+            return
+        self._engine.instrumentation.reset()
+        recorder = None
+        if record_edits:
+            recorder = EditRecorder(self._edit_layer_path, [self._engine.edit_layer])
+
+        self._flg_processing = True
+        self._flg_cancel = False
+        self._task = asyncio.ensure_future(self.run_steps_async(steps, on_done, recorder))
+
+    def is_verified(self) -> bool:
+        """Whether the engine's plan was verified and nothing changed on the stage since."""
+        return self._flg_verify_ok and not (self._tracker and self._tracker.has_changes())
+
+    def cancel_task(self):
+        """Cancel the running task. Stage events are delivered synchronously, so the task ends on the next frame: its
+        generator is closed then, from the engine it started with, and the busy flag is cleared."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def run_steps_async(self, steps, on_done, recorder: EditRecorder = None):
+        # The stage may be detached during the run, which drops self._engine
+        engine = self._engine
+        start_time = time.perf_counter()
+        self._progress_model.set_value(0.0)
+        self._progress_lbl.text = ""
+        # The engine updates its plan with its own edits, only the other changes are left for the next Verify
+        ignore_changes = self._tracker.ignored if recorder and self._tracker else contextlib.nullcontext
+        engine.edit_recorder = recorder
+        try:
+            while True:
+                if self._flg_cancel:
+                    self.set_status_message("Cancelled. Run again to process the remaining prims.")
+                    return
+
+                try:
+                    with ignore_changes():
+                        progress = next(steps)
+                except StopIteration as stop:
+                    on_done(stop.value)
+                    self.report_instrumentation(engine.instrumentation)
+                    return
+
+                self.show_progress(progress, time.perf_counter() - start_time)
+                await omni.kit.app.get_app().next_update_async()
+        except VciError as e:
+            self.set_status_message(f"Error: {e}")
+        except Exception as e:
+            # Anything else is a bug, it must not end the task without telling the user
+            logger.exception("VCI task failed")
+            self._progress_lbl.text = ""
+            self.set_status_message(f"Error: {type(e).__name__}: {e}")
+        finally:
+            # Engine generators only yield between fully authored prims, closing them keeps the edit layer consistent
+            steps.close()
+            engine.edit_recorder = None
+            # The edits of a run cancelled by closing its stage go with the stage, not to the next stage's undo stack
+            if recorder and recorder.has_edits() and engine is self._engine:
+                omni.kit.commands.execute("RecordVciEdits", recorder=recorder)
+            self._flg_processing = False
+
+    def report_instrumentation(self, instrumentation):
+        """Append the timings and counters of the finished run to the status, and write them as a trace file if the
+        ``trace_path`` setting of the extension is set."""
+        self.set_status_message(f"{self._status_lbl.text.rstrip()}\n{instrumentation.summary()}")
+        trace_path = carb.settings.get_settings().get(_TRACE_PATH_SETTING)
+        if trace_path:
+            instrumentation.write_trace(trace_path)
+            logger.info("Wrote trace to %s", trace_path)
+
+    def show_progress(self, progress, elapsed: float):
+        self._progress_model.set_value(progress.done / progress.total if progress.total else 1.0)
+        rate = progress.done / elapsed if elapsed > 0 else 0.0
+        eta = f", ETA {(progress.total - progress.done) / rate:.0f}s" if rate else ""
+        self._progress_lbl.text = f"{progress.phase}: {progress.done}/{progress.total} ({rate:.0f}/s{eta})"
+
+    def on_toggle_watch(self, model):
+        if not model.get_value_as_bool():
+            if self._watch_task:
+                self._watch_task.cancel()
+                self._watch_task = None
+        elif not self.is_verified():
+            self.set_status_message("Please verify before watching the folder.")
+            model.set_value(False)
+        elif not self._watch_task:
+            self._watch_task = asyncio.ensure_future(self.watch_async())
+
+    async def watch_async(self):
+        """Sync the edit layer with the replacement folder of the verified engine, one undoable step per batch.
+
+        Batches run like the buttons' tasks, chunk by chunk with progress and cancel, see :meth:`run_steps_async`.
+        """
+        watcher = None
+        try:
+            while True:
+                await asyncio.sleep(DEFAULT_INTERVAL)
+                if self._flg_processing or not self._engine:
+                    continue
+                # A new Verify may have switched to another folder or edit layer
+                if watcher is None or watcher.engine is not self._engine:
+                    if watcher:
+                        watcher.close()
+                    watcher = AssetWatcher(self._engine)
+
+                file_names = watcher.read_batch()
+                if not file_names:
+                    continue
+
+                def on_done(report):
+                    self.set_status_message(report or "No replacement assets changed.")
+
+                self._engine.instrumentation.reset()
+                recorder = EditRecorder(self._edit_layer_path, [self._engine.edit_layer])
+                self._flg_processing = True
+                self._flg_cancel = False
+                await self.run_steps_async(self._engine.iter_sync_assets(file_names), on_done, recorder)
+        finally:
+            if watcher:
+                watcher.close()
+
+    def on_cancel(self):
+        if self._flg_processing:
+            self._flg_cancel = True
+
+    def get_selected_capture_layer(self):
+        if not self.__combo_box_capture or not self.__layers:
+            return None
+        return self.__layers[self.__combo_box_capture.model.get_item_value_model().get_value_as_int()]
+
+    def get_selected_capture_layers(self):
+        # All captures are processed strongest first, so meshes captured several times are taken as composed
+        if self._all_captures_model.get_value_as_bool():
+            return find_capture_layers(omni.usd.get_context().get_stage(), self.get_selected_edit_layer(),
+                                       self._capture_layer_path)
+        capture_layer = self.get_selected_capture_layer()
+        return [capture_layer] if capture_layer else []
+
+    def get_selected_edit_layer(self):
+        if not self.__combo_box_edit or not self.__layers:
+            return None
+        return self.__layers[self.__combo_box_edit.model.get_item_value_model().get_value_as_int()]
+
+    # For all prims on stage, if there is a similarly named asset file, and not a similary named override
+    # override the asset location (in the edit target layer)
+    def add_overrides(self):
+        if not self.is_verified():
+            self.set_status_message("Please verify before overriding.")
+        else:
+            def on_done(count):
+                self.set_status_message(f"Done.\nCreated {count} overrides in {self._stage_path}")
+
+            self.run_task(lambda: self._engine.iter_add_overrides(), on_done, record_edits=True)
+
+    def apply_vci(self):
+        if not self.is_verified():
+            self.set_status_message("Please verify before applying.")
+        else:
+            def on_done(count):
+                self.set_status_message(f"Done. Applied {count} inverse transforms.")
+
+            self.run_task(lambda: self._engine.iter_apply_vci(), on_done, record_edits=True)
+
+    def show_plan(self):
+        if not self._flg_verify_ok:
+            self.set_status_message("Please verify before showing the plan.")
+        else:
+            self.set_status_message(self._engine.plan.format_diff(limit=50) or "Nothing to do.")
+
+    def export_plan(self):
+        if not self._flg_verify_ok:
+            self.set_status_message("Please verify before exporting the plan.")
+            return
+
+        edit_layer = self._engine.edit_layer
+        if not edit_layer.realPath:
+            self.set_status_message("Error: The edit target layer must be saved to export the plan next to it.")
+            return
+
+        plan_path = os.path.join(os.path.dirname(edit_layer.realPath), "remix_vci_plan.json")
+        self._engine.plan.write_json(plan_path)
+        self.set_status_message(f"Plan exported to {plan_path}")
+
+    def destroy(self):
+        self._stage_event_sub = None
+        self.detach_stage()
+        self.close_transform_cache()
+        omni.kit.commands.unregister_module_commands(commands)
+        self._window.destroy()
+        self._window = None